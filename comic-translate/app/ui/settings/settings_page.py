@@ -74,6 +74,9 @@ class SettingsPage(QtWidgets.QWidget):
     def is_gpu_enabled(self):
         return self.ui.use_gpu_checkbox.isChecked()
 
+    def is_result_cache_enabled(self):
+        return self.ui.result_cache_checkbox.isChecked()
+
     def get_llm_settings(self):
         return {
             'extra_context': self.ui.extra_context.toPlainText(),
@@ -148,6 +151,7 @@ class SettingsPage(QtWidgets.QWidget):
                 'detector': self.get_tool_selection('detector'),
                 'inpainter': self.get_tool_selection('inpainter'),
                 'use_gpu': self.is_gpu_enabled(),
+                'result_cache': self.is_result_cache_enabled(),
                 'hd_strategy': self.get_hd_strategy_settings()
             },
             'llm': self.get_llm_settings(),
@@ -282,6 +286,7 @@ class SettingsPage(QtWidgets.QWidget):
         self.ui.detector_combo.setCurrentText(translated_detector)
 
         self.ui.use_gpu_checkbox.setChecked(settings.value('use_gpu', False, type=bool))
+        self.ui.result_cache_checkbox.setChecked(settings.value('result_cache', False, type=bool))
 
         # Load HD strategy settings
         settings.beginGroup('hd_strategy')
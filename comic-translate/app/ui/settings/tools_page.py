@@ -100,6 +100,7 @@ class ToolsPage(QtWidgets.QWidget):
         self.inpaint_strategy_combo.currentIndexChanged.connect(self._update_hd_strategy_widgets)
 
         self.use_gpu_checkbox = MCheckBox(self.tr("Use GPU"))
+        self.result_cache_checkbox = MCheckBox(self.tr("Cache results on disk"))
 
         layout.addWidget(translator_widget)
         layout.addSpacing(10)
@@ -113,6 +114,7 @@ class ToolsPage(QtWidgets.QWidget):
         layout.addWidget(self.hd_strategy_widgets)
         layout.addSpacing(10)
         layout.addWidget(self.use_gpu_checkbox)
+        layout.addWidget(self.result_cache_checkbox)
         layout.addStretch(1)
 
         self._update_hd_strategy_widgets(self.inpaint_strategy_combo.currentIndex())
@@ -33,9 +33,56 @@ class Settings(BaseSettings):
     default_translator: str = "Google Translate"
     default_inpainter: str = "LaMa"
     
+    # Cloud OCR: per-bubble requests in flight at once (GPT, Gemini)
+    ocr_max_concurrent_requests: int = 8
+    # Pack a page's bubbles into numbered atlas images, one request each (GPT, Gemini)
+    llm_ocr_atlas: bool = False
+    
     # GPU settings
     enable_gpu: bool = False
     
+    # Startup preloading of the default models (empty languages = default_source_lang)
+    preload_models: bool = True
+    preload_warm_up: bool = True
+    preload_source_langs: list = []
+    
+    # Re-hash verified model files in the background every N seconds (0 = disabled)
+    model_reverify_interval: int = 0
+    
+    # Inference executor settings
+    inference_workers: int = 2
+    inference_queue_size: int = 16
+    
+    # Model worker pool (0 = run models in the API process)
+    worker_processes: int = 0
+    
+    # ONNX Runtime sessions: profile (latency, throughput, low-memory),
+    # threads per session run (0 = split cores between concurrent sessions)
+    # and on-disk cache of optimized graphs
+    onnx_session_profile: str = "throughput"
+    onnx_intra_op_threads: int = 0
+    onnx_optimized_model_cache: bool = True
+    
+    # Load INT8 variants of the detector, OCR recognizers and LaMa on CPU
+    # (quantized locally from the FP32 models on first use)
+    use_int8_models: bool = False
+    
+    # Batch pipelining (overlap pages across stages; in-process mode only)
+    pipeline_batches: bool = True
+    pipeline_stage_limits: dict = {}
+    
+    # Detector micro-batching across concurrent requests (1 = disabled)
+    detector_max_batch_size: int = 4
+    detector_max_wait_ms: float = 5.0
+    detector_io_binding: bool = False
+    
+    # Batch admission control (memory budget, concurrent batches, uploads parked on disk)
+    batch_memory_limit_mb: int = 4096
+    batch_max_concurrent: int = 2
+    batch_page_working_set_mb: int = 512
+    batch_disk_queue_size: int = 200
+    batch_result_ttl: int = 3600  # Seconds finished batch results are kept; 0 = until shutdown
+    
     # Language settings
     default_source_lang: str = "Japanese"
     default_target_lang: str = "English"
@@ -43,9 +90,11 @@ class Settings(BaseSettings):
     # Upload settings
     max_upload_size: int = 10 * 1024 * 1024  # 10MB
     
-    # Cache settings
+    # Cache settings (stage results, keyed on page content + models/languages)
     enable_caching: bool = True
-    cache_ttl: int = 3600  # 1 hour
+    cache_ttl: int = 3600  # 1 hour, 0 = keep until evicted
+    result_cache_dir: Optional[str] = None  # None = <project>/cache/results
+    result_cache_max_mb: int = 2048
     
     # API Keys
     google_gemini_api_key: Optional[str] = None
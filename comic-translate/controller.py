@@ -189,6 +189,9 @@ class ComicTranslate(ComicTranslateUI):
         self.outline_width_dropdown.currentTextChanged.connect(self.text_ctrl.on_outline_width_change)
         self.outline_checkbox.stateChanged.connect(self.text_ctrl.toggle_outline_settings)
 
+        # Settings
+        self.settings_page.ui.result_cache_checkbox.toggled.connect(self.pipeline.set_result_cache_enabled)
+
         # Page List
         self.page_list.currentItemChanged.connect(self.image_ctrl.on_card_selected)
         self.page_list.selection_changed.connect(self.image_ctrl.on_selection_changed)
@@ -2,8 +2,11 @@
 API routes for manga translation operations.
 """
 
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Request
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Request, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional, List
 import numpy as np
 from PIL import Image
@@ -18,6 +21,8 @@ from app.models.schemas import (
     FullPipelineResponse,
 )
 from app.services.manga_service import MangaTranslationService
+from app.services.inference_executor import InferenceQueueFullError
+from app.services.batch_processor import AdmissionRejectedError
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +33,45 @@ router = APIRouter()
 manga_service = MangaTranslationService()
 
 
+def _decode_image(contents: bytes) -> np.ndarray:
+    """Decode image bytes to an RGB array."""
+    image = Image.open(io.BytesIO(contents))
+    return np.array(image.convert('RGB'))
+
+
 async def load_image_from_upload(file: UploadFile) -> np.ndarray:
     """Load image from uploaded file."""
     try:
         contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
-        return np.array(image.convert('RGB'))
+        # Decoding large pages is CPU-bound, keep it off the event loop
+        return await asyncio.to_thread(_decode_image, contents)
     except Exception as e:
         logger.error(f"Error loading image: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
 
 
+def get_manga_service(request: Request):
+    """Return the app's service (possibly backed by worker processes) or the local one."""
+    return getattr(request.app.state, 'manga_service', None) or manga_service
+
+
+async def run_inference(request: Request, stage: str, func, *args, **kwargs):
+    """
+    Run a blocking service call on the shared inference executor.
+    
+    Falls back to a plain worker thread when the executor is not configured.
+    """
+    executor = getattr(request.app.state, 'inference_executor', None)
+    if executor is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    try:
+        return await executor.run(stage, func, *args, **kwargs)
+    except InferenceQueueFullError as e:
+        logger.warning(f"Rejecting {stage} request: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+
 @router.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -56,25 +89,58 @@ async def root():
             "batch_submit_multi": "/api/v1/translate/batch/multi",
             "batch_status": "/api/v1/translate/batch/status/{request_id}",
             "batch_info": "/api/v1/translate/batch/{batch_id}",
+            "batch_events": "/api/v1/translate/batch/events?request_ids={id1},{id2}",
             "models": "/api/v1/models",
             "download_models": "/api/v1/models/download"
         },
         "features": {
             "batch_processing": "Submit up to 6 pages at once for efficient translation",
             "auto_batching": "Pages are automatically grouped and processed together",
-            "concurrent": "Multiple batches processed in parallel"
+            "concurrent": "Multiple batches processed in parallel",
+            "streaming": "Server-sent events push stage progress and finished pages"
         }
     }
 
 
 @router.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "service": "manga-translation-api"}
+async def health_check(request: Request):
+    """Health check endpoint. Returns 503 while startup model preloading is running."""
+    response = {"status": "healthy", "service": "manga-translation-api"}
+    
+    pool = getattr(request.app.state, 'worker_pool', None)
+    if pool is not None:
+        # Each worker reports its own preload when it becomes ready
+        preload = pool.preload_report()
+    else:
+        preload = getattr(request.app.state, 'preload', None)
+    if preload is not None:
+        response["ready"] = preload["ready"]
+        response["preload"] = preload
+    
+    executor = getattr(request.app.state, 'inference_executor', None)
+    if executor is not None:
+        response["inference"] = executor.stats()
+    
+    if pool is not None:
+        response["workers"] = pool.stats()
+    
+    batch_processor = getattr(request.app.state, 'batch_processor', None)
+    if batch_processor is not None:
+        response["batch_admission"] = batch_processor.admission_stats()
+    
+    result_cache = getattr(get_manga_service(request), 'result_cache', None)
+    if result_cache is not None:
+        response["result_cache"] = result_cache.stats()
+    
+    if preload is not None and preload["status"] == "loading":
+        response["status"] = "starting"
+        return JSONResponse(status_code=503, content=response)
+    return response
 
 
 @router.post("/api/v1/detection", response_model=DetectionResponse)
 async def detect_text_blocks(
+    request: Request,
     file: UploadFile = File(..., description="Manga page image"),
     detector: Optional[str] = Form("RT-DETR-V2", description="Detection model to use"),
     gpu: Optional[bool] = Form(False, description="Use GPU acceleration")
@@ -88,7 +154,10 @@ async def detect_text_blocks(
         logger.info(f"Detection request received - detector: {detector}, gpu: {gpu}")
         image = await load_image_from_upload(file)
         
-        result = manga_service.detect_text_blocks(
+        result = await run_inference(
+            request,
+            "detection",
+            get_manga_service(request).detect_text_blocks,
             image=image,
             detector=detector,
             use_gpu=gpu
@@ -97,6 +166,8 @@ async def detect_text_blocks(
         logger.info(f"Detection completed - found {len(result['blocks'])} text blocks")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Detection error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -104,6 +175,7 @@ async def detect_text_blocks(
 
 @router.post("/api/v1/ocr", response_model=OCRResponse)
 async def perform_ocr(
+    request: Request,
     file: UploadFile = File(..., description="Manga page image"),
     source_lang: str = Form("Japanese", description="Source language"),
     ocr_model: Optional[str] = Form("Default", description="OCR model to use"),
@@ -119,7 +191,10 @@ async def perform_ocr(
         logger.info(f"OCR request received - source_lang: {source_lang}, ocr_model: {ocr_model}")
         image = await load_image_from_upload(file)
         
-        result = manga_service.perform_ocr(
+        result = await run_inference(
+            request,
+            "ocr",
+            get_manga_service(request).perform_ocr,
             image=image,
             source_lang=source_lang,
             ocr_model=ocr_model,
@@ -130,6 +205,8 @@ async def perform_ocr(
         logger.info(f"OCR completed - processed {len(result['blocks'])} text blocks")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"OCR error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -137,6 +214,7 @@ async def perform_ocr(
 
 @router.post("/api/v1/translation", response_model=TranslationResponse)
 async def translate_text(
+    request: Request,
     file: UploadFile = File(..., description="Manga page image"),
     source_lang: str = Form("Japanese", description="Source language"),
     target_lang: str = Form("English", description="Target language"),
@@ -154,7 +232,10 @@ async def translate_text(
         logger.info(f"Translation request - {source_lang} to {target_lang}, translator: {translator}")
         image = await load_image_from_upload(file)
         
-        result = manga_service.perform_translation(
+        result = await run_inference(
+            request,
+            "translation",
+            get_manga_service(request).perform_translation,
             image=image,
             source_lang=source_lang,
             target_lang=target_lang,
@@ -167,6 +248,8 @@ async def translate_text(
         logger.info(f"Translation completed - translated {len(result['blocks'])} text blocks")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Translation error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -174,6 +257,7 @@ async def translate_text(
 
 @router.post("/api/v1/inpainting", response_model=InpaintingResponse)
 async def inpaint_image(
+    request: Request,
     file: UploadFile = File(..., description="Manga page image"),
     inpainter: Optional[str] = Form("LaMa", description="Inpainting model (LaMa, MI-GAN, AOT)"),
     gpu: Optional[bool] = Form(False, description="Use GPU acceleration"),
@@ -188,7 +272,10 @@ async def inpaint_image(
         logger.info(f"Inpainting request - inpainter: {inpainter}, gpu: {gpu}")
         image = await load_image_from_upload(file)
         
-        result = manga_service.perform_inpainting(
+        result = await run_inference(
+            request,
+            "inpainting",
+            get_manga_service(request).perform_inpainting,
             image=image,
             inpainter=inpainter,
             use_gpu=gpu,
@@ -198,6 +285,8 @@ async def inpaint_image(
         logger.info(f"Inpainting completed")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Inpainting error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -205,6 +294,7 @@ async def inpaint_image(
 
 @router.post("/api/v1/render", response_model=RenderResponse)
 async def render_text_on_image(
+    request: Request,
     file: UploadFile = File(..., description="Image (usually inpainted)"),
     blocks: str = Form(..., description="JSON string of text blocks with translations"),
     font_path: Optional[str] = Form(None, description="Path to custom font file. If not provided, uses auto-detected system font (Arial, Segoe UI, etc.). For Vietnamese, ensure Unicode-compatible font."),
@@ -230,7 +320,10 @@ async def render_text_on_image(
         logger.info("Rendering text request received")
         image = await load_image_from_upload(file)
         
-        result = manga_service.render_translated_text(
+        result = await run_inference(
+            request,
+            "rendering",
+            get_manga_service(request).render_translated_text,
             image=image,
             blocks_json=blocks,
             font_path=font_path,
@@ -244,6 +337,8 @@ async def render_text_on_image(
         logger.info("Rendering completed")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Rendering error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -251,6 +346,7 @@ async def render_text_on_image(
 
 @router.post("/api/v1/translate", response_model=FullPipelineResponse)
 async def full_translation_pipeline(
+    request: Request,
     file: UploadFile = File(..., description="Manga page image"),
     source_lang: str = Form("Japanese", description="Source language"),
     target_lang: str = Form("English", description="Target language"),
@@ -282,7 +378,10 @@ async def full_translation_pipeline(
         logger.info(f"Full pipeline request - {source_lang} to {target_lang}")
         image = await load_image_from_upload(file)
         
-        result = manga_service.full_translation_pipeline(
+        result = await run_inference(
+            request,
+            "full_pipeline",
+            get_manga_service(request).full_translation_pipeline,
             image=image,
             source_lang=source_lang,
             target_lang=target_lang,
@@ -308,6 +407,8 @@ async def full_translation_pipeline(
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Full pipeline error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -535,9 +636,13 @@ async def submit_batch_translation(
         return {
             "status": "queued",
             "request_id": request_id,
+            "events_url": f"/api/v1/translate/batch/events?request_ids={request_id}",
             "message": "Request added to batch queue. Check status with /api/v1/translate/batch/status/{request_id}"
         }
         
+    except AdmissionRejectedError as e:
+        logger.warning(f"Batch submission rejected: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
     except Exception as e:
         logger.error(f"Batch submission error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -570,6 +675,48 @@ async def get_batch_request_status(request: Request, request_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/api/v1/translate/batch/events")
+async def stream_batch_events(
+    request: Request,
+    request_ids: str = Query(..., description="Comma-separated request IDs to follow")
+):
+    """
+    Stream progress of batch requests as server-sent events.
+    
+    Each event is a JSON object with request_id and event:
+    - queued / processing: request accepted or picked up by a batch
+    - stage: the page entered a pipeline stage (detection, ocr, translation, ...)
+    - completed: the page finished; includes the full result
+    - failed: the page failed; includes the error
+    
+    The current state of every request is sent first. The stream closes once
+    all requested pages have completed or failed.
+    """
+    batch_processor = request.app.state.batch_processor
+    ids = [request_id.strip() for request_id in request_ids.split(",") if request_id.strip()]
+    if not ids:
+        raise HTTPException(status_code=400, detail="No request IDs given")
+    
+    unknown = [request_id for request_id in ids if request_id not in batch_processor.requests]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Requests not found: {', '.join(unknown)}")
+    
+    async def event_source():
+        async for event in batch_processor.stream_events(ids):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/api/v1/translate/batch/{batch_id}")
 async def get_batch_status(request: Request, batch_id: str):
     """
@@ -629,19 +776,28 @@ async def submit_multiple_pages_batch(
         for file in files:
             image_data = await file.read()
             
-            request_id = await batch_processor.submit_request(
-                image_data=image_data,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                detector=detector,
-                ocr_model=ocr_model,
-                translator=translator,
-                inpainter=inpainter,
-                font_path=font_path,
-                init_font_size=init_font_size,
-                min_font_size=min_font_size,
-                bbox_expand_ratio=bbox_expand_ratio
-            )
+            try:
+                request_id = await batch_processor.submit_request(
+                    image_data=image_data,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    detector=detector,
+                    ocr_model=ocr_model,
+                    translator=translator,
+                    inpainter=inpainter,
+                    font_path=font_path,
+                    init_font_size=init_font_size,
+                    min_font_size=min_font_size,
+                    bbox_expand_ratio=bbox_expand_ratio
+                )
+            except AdmissionRejectedError as e:
+                # Pages accepted so far stay queued; the client resubmits the rest
+                logger.warning(f"Multi-page submission rejected after {len(request_ids)} pages: {e}")
+                raise HTTPException(
+                    status_code=429,
+                    detail={"error": str(e), "accepted_request_ids": request_ids},
+                    headers={"Retry-After": "30"}
+                )
             
             request_ids.append(request_id)
         
@@ -651,9 +807,12 @@ async def submit_multiple_pages_batch(
             "status": "queued",
             "total_pages": len(request_ids),
             "request_ids": request_ids,
+            "events_url": f"/api/v1/translate/batch/events?request_ids={','.join(request_ids)}",
             "message": f"Successfully queued {len(request_ids)} pages for batch translation"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Multi-page batch submission error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
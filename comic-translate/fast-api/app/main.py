@@ -2,6 +2,7 @@
 FastAPI application initialization and configuration.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
@@ -11,7 +12,11 @@ from fastapi.responses import JSONResponse
 from app.api import routes
 from app.services.batch_processor import BatchProcessor
 from app.services.manga_service import MangaTranslationService
+from app.services.inference_executor import InferenceExecutor
+from app.services.worker_pool import ModelWorkerPool, PooledMangaTranslationService
 from app.middleware.rate_limit import RateLimitMiddleware
+from config.settings import settings
+from modules.utils.download import start_background_reverify
 
 # Configure logging
 logging.basicConfig(
@@ -23,23 +28,92 @@ logger = logging.getLogger(__name__)
 # Global batch processor instance
 batch_processor: BatchProcessor = None
 
+# Global inference executor instance
+inference_executor: InferenceExecutor = None
+
+# Global model worker pool (only in worker-pool mode)
+worker_pool: ModelWorkerPool = None
+
+
+def _preload_kwargs() -> dict:
+    """Models built at startup: the configured defaults."""
+    return {
+        "detector": settings.default_detector,
+        "ocr_model": settings.default_ocr,
+        "source_langs": settings.preload_source_langs or [settings.default_source_lang],
+        "inpainter": settings.default_inpainter,
+        "use_gpu": settings.enable_gpu,
+        "warm_up": settings.preload_warm_up,
+    }
+
+
+async def _preload_models(app: FastAPI, manga_service: MangaTranslationService):
+    """Build model sessions off the event loop and record readiness for /health."""
+    try:
+        report = await asyncio.to_thread(manga_service.preload, **_preload_kwargs())
+        report["status"] = "ready" if report["ready"] else "degraded"
+    except Exception as e:
+        logger.error(f"Model preload failed: {e}", exc_info=True)
+        report = {"status": "degraded", "ready": False, "error": str(e)}
+    app.state.preload = report
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager - startup and shutdown events."""
-    global batch_processor
+    global batch_processor, inference_executor, worker_pool
+    preload_task = None
+    reverify_stop = None
     
     # Startup
     logger.info("Starting Manga Translation API...")
     
+    # Initialize inference executor (model calls run here, off the event loop).
+    # In worker-pool mode each executor thread drives one worker process.
+    inference_executor = InferenceExecutor(
+        max_workers=max(settings.inference_workers, settings.worker_processes),
+        max_queue_size=settings.inference_queue_size
+    )
+    app.state.inference_executor = inference_executor
+    logger.info("Inference executor started")
+    
+    # Initialize model service (in-process, or proxied to worker processes)
+    if settings.worker_processes > 0:
+        # Workers preload their own models before reporting ready
+        worker_pool = ModelWorkerPool(
+            num_workers=settings.worker_processes,
+            preload_kwargs=_preload_kwargs() if settings.preload_models else None
+        )
+        await asyncio.to_thread(worker_pool.start)
+        manga_service = PooledMangaTranslationService(worker_pool)
+        app.state.worker_pool = worker_pool
+        logger.info(f"Model worker pool started with {settings.worker_processes} processes")
+    else:
+        manga_service = MangaTranslationService()
+        if settings.preload_models:
+            # Serve /health (as not ready) while sessions are built in parallel
+            app.state.preload = {"status": "loading", "ready": False}
+            preload_task = asyncio.create_task(_preload_models(app, manga_service))
+            logger.info("Model preload started")
+    app.state.manga_service = manga_service
+    
+    if settings.model_reverify_interval > 0:
+        reverify_stop = start_background_reverify(settings.model_reverify_interval)
+        logger.info(f"Model checksums re-verified every {settings.model_reverify_interval}s")
+    
     # Initialize batch processor
-    manga_service = MangaTranslationService()
     batch_processor = BatchProcessor(
         manga_service=manga_service,
+        inference_executor=inference_executor,
         max_batch_size=6,
         batch_timeout=2.0,
-        max_concurrent_batches=2,
-        memory_limit_mb=4096
+        max_concurrent_batches=settings.batch_max_concurrent,
+        memory_limit_mb=settings.batch_memory_limit_mb,
+        pipelined=settings.pipeline_batches and worker_pool is None,
+        stage_limits=settings.pipeline_stage_limits,
+        page_working_set_mb=settings.batch_page_working_set_mb,
+        max_disk_queue=settings.batch_disk_queue_size,
+        result_ttl=settings.batch_result_ttl
     )
     await batch_processor.start()
     logger.info("Batch processor started")
@@ -51,10 +125,21 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Manga Translation API...")
+    if preload_task is not None and not preload_task.done():
+        preload_task.cancel()
+    if reverify_stop is not None:
+        reverify_stop.set()
+    
     if batch_processor:
         await batch_processor.stop()
         logger.info("Batch processor stopped")
     
+    if inference_executor:
+        inference_executor.shutdown()
+    
+    if worker_pool:
+        worker_pool.stop()
+    
     # Cleanup all shared model caches
     MangaTranslationService.cleanup_all_caches()
     logger.info("Model caches cleaned")
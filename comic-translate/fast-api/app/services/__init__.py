@@ -1,4 +1,16 @@
 """API services."""
 from .manga_service import MangaTranslationService
+from .inference_executor import InferenceExecutor, InferenceQueueFullError
+from .worker_pool import ModelWorkerPool, PooledMangaTranslationService
+from .chapter_pipeline import ChapterPipeline
+from .progress import ProgressBroker
 
-__all__ = ["MangaTranslationService"]
+__all__ = [
+    "MangaTranslationService",
+    "InferenceExecutor",
+    "InferenceQueueFullError",
+    "ModelWorkerPool",
+    "PooledMangaTranslationService",
+    "ChapterPipeline",
+    "ProgressBroker",
+]
@@ -4,15 +4,92 @@ Automatically groups incoming requests and processes them in batches.
 """
 
 import asyncio
+import io
+import json
+import os
+import shutil
+import tempfile
 import uuid
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import AsyncIterator, Dict, Any, List, Optional
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 
+from app.services.inference_executor import InferenceQueueFullError
+from app.services.chapter_pipeline import ChapterPipeline
+from app.services.progress import ProgressBroker, TERMINAL_EVENTS
+
 logger = logging.getLogger(__name__)
 
+# Copies of a decoded page alive at once (input, inpainted, rendered, encoding buffers)
+PAGE_COPIES = 4
+
+
+class AdmissionRejectedError(RuntimeError):
+    """Raised when a request exceeds the memory budget and the disk queue is full."""
+
+
+def _proc_rss_mb(pid: str) -> float:
+    with open(f"/proc/{pid}/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _proc_child_pids() -> List[str]:
+    """Direct children of this process, read from /proc."""
+    parent = str(os.getpid())
+    children = []
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # Fields after the parenthesized command name: state, ppid, ...
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if fields[1] == parent:
+            children.append(pid)
+    return children
+
+
+def current_rss_mb(include_children: bool = False) -> float:
+    """
+    Resident memory of this process in MB (0 if it cannot be determined).
+    
+    With ``include_children`` the memory of child processes (model workers)
+    is added. Without psutil only direct children are found, on Linux.
+    """
+    try:
+        import psutil
+        process = psutil.Process()
+        processes = [process] + (process.children(recursive=True) if include_children else [])
+        total = 0
+        for proc in processes:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass  # Exited while we were looking
+        return total / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        total_mb = _proc_rss_mb("self")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+    if include_children:
+        try:
+            child_pids = _proc_child_pids()
+        except OSError:
+            child_pids = []
+        for pid in child_pids:
+            try:
+                total_mb += _proc_rss_mb(pid)
+            except (OSError, ValueError, IndexError):
+                pass
+    return total_mb
+
 
 class BatchStatus(str, Enum):
     """Status of a batch processing job."""
@@ -41,10 +118,20 @@ class TranslationRequest:
     min_font_size: int = 16
     bbox_expand_ratio: float = 1.15
     
+    # Admission control
+    estimated_mb: float = 0.0
+    upload_mb: float = 0.0
+    upload_path: Optional[str] = None  # Set when the upload waits on disk
+    
     # Metadata
     submitted_at: datetime = field(default_factory=datetime.now)
     result: Optional[Dict[str, Any]] = None
+    result_path: Optional[str] = None  # Set once the result is spilled to disk
     error: Optional[str] = None
+    
+    @property
+    def is_completed(self) -> bool:
+        return self.result is not None or self.result_path is not None
 
 
 @dataclass
@@ -67,38 +154,92 @@ class BatchProcessor:
     
     Features:
     - Automatic batching: Groups requests when reaching max_batch_size or timeout
-    - Memory-aware: Tracks memory usage to prevent overload
+    - Memory-aware: Estimates per-page memory, starts batches only within the budget,
+      parks uploads on disk when over budget and rejects requests once that queue is full
     - Concurrent processing: Handles multiple batches in parallel
+    - Stage pipelining: Optionally overlaps pages across detection/OCR/translation/inpainting
     - Status tracking: Provides real-time progress updates
+    - Progress streaming: Publishes stage events and results as pages finish
+    - Result spilling: Finished results are written to disk instead of held in memory
     """
     
     def __init__(
         self,
         manga_service,
+        inference_executor=None,
         max_batch_size: int = 6,
         batch_timeout: float = 2.0,
         max_concurrent_batches: int = 2,
-        memory_limit_mb: int = 4096
+        memory_limit_mb: int = 4096,
+        pipelined: bool = False,
+        stage_limits: Optional[Dict[str, int]] = None,
+        spill_dir: Optional[str] = None,
+        page_working_set_mb: int = 512,
+        max_disk_queue: int = 200,
+        result_ttl: float = 3600
     ):
         """
         Initialize batch processor.
         
         Args:
             manga_service: MangaTranslationService instance
+            inference_executor: Optional InferenceExecutor shared with the API routes
             max_batch_size: Maximum requests per batch (default: 6)
             batch_timeout: Seconds to wait before processing partial batch (default: 2.0)
             max_concurrent_batches: Maximum batches to process simultaneously (default: 2)
-            memory_limit_mb: Memory limit in MB (default: 4096)
+            memory_limit_mb: Process memory budget in MB (default: 4096)
+            pipelined: Overlap pages across pipeline stages (requires an in-process service)
+            stage_limits: Per-stage concurrency overrides for pipelined mode
+            spill_dir: Directory for finished results (default: a temporary directory)
+            page_working_set_mb: Model working memory per page on top of image buffers (default: 512)
+            max_disk_queue: Uploads that may wait on disk before requests are rejected (default: 200)
+            result_ttl: Seconds finished batches and their results are kept; 0 keeps them (default: 3600)
         """
         self.manga_service = manga_service
+        self.inference_executor = inference_executor
         self.max_batch_size = max_batch_size
         self.batch_timeout = batch_timeout
         self.max_concurrent_batches = max_concurrent_batches
         self.memory_limit_mb = memory_limit_mb
+        self.page_working_set_mb = page_working_set_mb
+        self.max_disk_queue = max_disk_queue
+        self.result_ttl = result_ttl
+        
+        # Stage-pipelined mode shares one set of stage limits across all batches
+        self.chapter_pipeline: Optional[ChapterPipeline] = None
+        if pipelined:
+            self.chapter_pipeline = ChapterPipeline(
+                manga_service,
+                stage_limits=stage_limits,
+                run_blocking=self._run_inference
+            )
+        
+        # Finished results live on disk until fetched
+        self._owns_spill_dir = spill_dir is None
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="manga-batch-")
+        os.makedirs(self.spill_dir, exist_ok=True)
+        
+        self.upload_dir = os.path.join(self.spill_dir, "uploads")
+        os.makedirs(self.upload_dir, exist_ok=True)
+        
+        # Admission control: memory reserved by queued and running pages, on
+        # top of the baseline (models and runtime) measured while no batch runs
+        self.baseline_mb: float = 0.0
+        self.queued_mb: float = 0.0
+        self.inflight_mb: float = 0.0
+        self.disk_queued: int = 0
+        self.rejected_requests: int = 0
+        self._batch_slots = asyncio.Semaphore(max(1, max_concurrent_batches))
+        self._memory_released = asyncio.Event()
+        
+        # Progress events for streaming clients
+        self.events = ProgressBroker()
         
         # State
         self.pending_requests: List[TranslationRequest] = []
         self.batches: Dict[str, BatchJob] = {}
+        self.requests: Dict[str, TranslationRequest] = {}
+        self._request_batches: Dict[str, str] = {}
         self.processing_batches: int = 0
         self.is_running: bool = False
         
@@ -115,6 +256,7 @@ class BatchProcessor:
             return
         
         self.is_running = True
+        self._measure_baseline()
         self._batch_task = asyncio.create_task(self._batch_worker())
         logger.info("BatchProcessor started")
     
@@ -137,6 +279,9 @@ class BatchProcessor:
             logger.info(f"Processing {len(self.pending_requests)} remaining requests before shutdown")
             await self._process_pending_batch()
         
+        if self._owns_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        
         logger.info("BatchProcessor stopped")
     
     async def submit_request(
@@ -157,8 +302,18 @@ class BatchProcessor:
             
         Returns:
             request_id: Unique identifier to track this request
+            
+        Raises:
+            AdmissionRejectedError: If the page does not fit the memory budget
+                and the disk queue is full
         """
         request_id = str(uuid.uuid4())
+        estimated_mb = self.estimate_page_mb(image_data)
+        if estimated_mb > self.memory_limit_mb:
+            self.rejected_requests += 1
+            raise AdmissionRejectedError(
+                f"Page needs ~{estimated_mb:.0f}MB, more than the {self.memory_limit_mb}MB budget"
+            )
         
         request = TranslationRequest(
             request_id=request_id,
@@ -172,11 +327,21 @@ class BatchProcessor:
             font_path=kwargs.get('font_path'),
             init_font_size=kwargs.get('init_font_size', 60),
             min_font_size=kwargs.get('min_font_size', 16),
-            bbox_expand_ratio=kwargs.get('bbox_expand_ratio', 1.15)
+            bbox_expand_ratio=kwargs.get('bbox_expand_ratio', 1.15),
+            estimated_mb=estimated_mb,
+            upload_mb=len(image_data) / (1024 * 1024)
         )
         
+        async with self._lock:
+            park = self._admit(request)
+        if park:
+            # Write outside the lock so other submits and batch creation are not held up
+            await self._park_upload(request)
+        
         async with self._lock:
             self.pending_requests.append(request)
+            self.requests[request_id] = request
+            self.events.publish(request_id, "queued")
             logger.info(f"Request {request_id} queued ({len(self.pending_requests)}/{self.max_batch_size})")
             
             # Create batch immediately if we reached max size
@@ -196,7 +361,7 @@ class BatchProcessor:
                     status=BatchStatus.QUEUED
                 )
                 
-                self.batches[batch_id] = batch
+                self._register_batch(batch)
                 logger.info(f"Created batch {batch_id} with {len(batch_requests)} requests (immediate)")
                 
                 # Start processing asynchronously (don't await to avoid blocking)
@@ -204,6 +369,137 @@ class BatchProcessor:
         
         return request_id
     
+    def estimate_page_mb(self, image_data: bytes) -> float:
+        """
+        Estimate peak memory for translating one page.
+        
+        Reads only the image header to get the decoded size, then adds the
+        page copies made along the pipeline and the model working set.
+        """
+        try:
+            from PIL import Image
+            with Image.open(io.BytesIO(image_data)) as image:
+                width, height = image.size
+            decoded_bytes = width * height * 3
+        except Exception:
+            # Unknown format: assume a typical compression ratio
+            decoded_bytes = len(image_data) * 10
+        return decoded_bytes * PAGE_COPIES / (1024 * 1024) + self.page_working_set_mb
+    
+    def _measure_baseline(self):
+        """
+        Re-measure the baseline while no batch runs.
+        
+        The baseline is the RSS of this process and its model workers minus
+        the uploads waiting in memory, i.e. models, runtime and allocator
+        slack. It is only taken while idle, because a running batch's pages
+        are already charged through ``inflight_mb``; re-measuring then would
+        count them twice.
+        """
+        if self.inflight_mb == 0:
+            self.baseline_mb = max(0.0, current_rss_mb(include_children=True) - self.queued_mb)
+    
+    def _admit(self, request: TranslationRequest) -> bool:
+        """
+        Decide where a queued upload waits; must be called with the lock held.
+        
+        Queued uploads are charged only their compressed size; the decoded
+        page and working set are reserved when the batch starts. Everything
+        is charged against the baseline, not live RSS, which already holds
+        the pages of running batches.
+        
+        Returns:
+            True if the upload must be parked on disk (its disk slot is
+            already taken), False if it stays in memory
+        
+        Raises:
+            AdmissionRejectedError: If memory and the disk queue are both full
+        """
+        self._measure_baseline()
+        projected_mb = self.baseline_mb + self.inflight_mb + self.queued_mb + request.upload_mb
+        if projected_mb <= self.memory_limit_mb:
+            self.queued_mb += request.upload_mb
+            return False
+        
+        if self.disk_queued >= self.max_disk_queue:
+            self.rejected_requests += 1
+            raise AdmissionRejectedError(
+                f"Memory budget exhausted ({projected_mb:.0f}/{self.memory_limit_mb}MB) "
+                f"and {self.disk_queued} uploads already queued on disk"
+            )
+        self.disk_queued += 1
+        return True
+    
+    async def _park_upload(self, request: TranslationRequest):
+        """Move the upload to disk, giving back its disk slot if the write fails."""
+        path = os.path.join(self.upload_dir, f"{request.request_id}.bin")
+        try:
+            await asyncio.to_thread(self._write_bytes, path, request.image_data)
+        except BaseException:
+            self.disk_queued -= 1
+            raise
+        request.upload_path = path
+        request.image_data = b""
+        logger.info(f"Request {request.request_id} over memory budget, upload queued on disk")
+    
+    @staticmethod
+    def _write_bytes(path: str, data: bytes):
+        with open(path, "wb") as f:
+            f.write(data)
+    
+    @staticmethod
+    def _read_bytes(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+    
+    async def _load_upload(self, request: TranslationRequest) -> bytes:
+        """Return the upload bytes, reading (and removing) the on-disk copy if parked."""
+        if request.upload_path is None:
+            return request.image_data
+        data = await asyncio.to_thread(self._read_bytes, request.upload_path)
+        os.remove(request.upload_path)
+        request.upload_path = None
+        self.disk_queued -= 1
+        return data
+    
+    async def _reserve_memory(self, batch: BatchJob) -> float:
+        """Wait until the batch's decoded pages and working set fit the budget, then reserve them."""
+        needed_mb = sum(req.estimated_mb for req in batch.requests)
+        in_memory_mb = sum(req.upload_mb for req in batch.requests if req.upload_path is None)
+        while True:
+            self._measure_baseline()
+            # This batch's queued uploads are part of needed_mb once it starts
+            projected_mb = self.baseline_mb + self.inflight_mb + self.queued_mb - in_memory_mb + needed_mb
+            # A lone batch always runs, otherwise an oversized batch would wait forever
+            if self.inflight_mb == 0 or projected_mb <= self.memory_limit_mb:
+                break
+            self._memory_released.clear()
+            try:
+                await asyncio.wait_for(self._memory_released.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+        self.queued_mb -= in_memory_mb
+        self.inflight_mb += needed_mb
+        return needed_mb
+    
+    def _release_memory(self, reserved_mb: float):
+        self.inflight_mb -= reserved_mb
+        self._memory_released.set()
+    
+    def admission_stats(self) -> Dict[str, Any]:
+        """Current memory reservations and admission counters."""
+        return {
+            "memory_limit_mb": self.memory_limit_mb,
+            "rss_mb": round(current_rss_mb(include_children=True), 1),
+            "baseline_mb": round(self.baseline_mb, 1),
+            "queued_mb": round(self.queued_mb, 1),
+            "inflight_mb": round(self.inflight_mb, 1),
+            "disk_queued": self.disk_queued,
+            "rejected_requests": self.rejected_requests,
+            "processing_batches": self.processing_batches,
+            "max_concurrent_batches": self.max_concurrent_batches,
+        }
+    
     async def get_request_status(self, request_id: str) -> Optional[Dict[str, Any]]:
         """
         Get status of a specific request.
@@ -214,30 +510,111 @@ class BatchProcessor:
         Returns:
             Status dictionary or None if not found
         """
-        # Check pending queue
-        async with self._lock:
-            for req in self.pending_requests:
-                if req.request_id == request_id:
-                    return {
-                        "request_id": request_id,
-                        "status": "pending",
-                        "submitted_at": req.submitted_at.isoformat()
-                    }
-        
-        # Check batches
-        for batch in self.batches.values():
-            for req in batch.requests:
-                if req.request_id == request_id:
-                    return {
-                        "request_id": request_id,
-                        "batch_id": batch.batch_id,
-                        "status": batch.status.value,
-                        "submitted_at": req.submitted_at.isoformat(),
-                        "result": req.result,
-                        "error": req.error
-                    }
-        
-        return None
+        req = self.requests.get(request_id)
+        if req is None:
+            return None
+        
+        batch_id = self._request_batches.get(request_id)
+        if batch_id is None:
+            return {
+                "request_id": request_id,
+                "status": "pending",
+                "submitted_at": req.submitted_at.isoformat()
+            }
+        
+        status = {
+            "request_id": request_id,
+            "batch_id": batch_id,
+            "status": self.batches[batch_id].status.value,
+            "submitted_at": req.submitted_at.isoformat(),
+            "result": await self.load_result(req),
+            "error": req.error
+        }
+        if req.is_completed or req.error:
+            # Outcome collected; late streams rebuild it from the request
+            self.events.forget([request_id])
+        return status
+    
+    async def load_result(self, request: TranslationRequest) -> Optional[Dict[str, Any]]:
+        """Return a request's result, reading it back from disk if it was spilled."""
+        if request.result is not None or request.result_path is None:
+            return request.result
+        return await asyncio.to_thread(self._read_result, request.result_path)
+    
+    @staticmethod
+    def _read_result(path: str) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _spill_result(self, request: TranslationRequest, result: Dict[str, Any]) -> str:
+        path = os.path.join(self.spill_dir, f"{request.request_id}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, default=str)
+        os.replace(tmp_path, path)
+        return path
+    
+    async def stream_events(
+        self,
+        request_ids: List[str],
+        keepalive: float = 15.0
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield progress events for the given requests until all of them finish.
+        
+        The current state of each request is sent first; finished requests
+        include their result. ``None`` is yielded after ``keepalive`` seconds
+        without events so callers can keep the connection open.
+        
+        Args:
+            request_ids: Requests to follow
+            keepalive: Seconds between keep-alive ticks
+        """
+        queue = self.events.subscribe(request_ids)
+        try:
+            remaining = set(request_ids)
+            for request_id in request_ids:
+                latest = self.events.latest(request_id) or self._final_event(request_id)
+                if latest is None:
+                    continue
+                if latest["event"] in TERMINAL_EVENTS:
+                    remaining.discard(request_id)
+                yield await self._deliver(latest)
+            
+            while remaining:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event["request_id"] not in remaining:
+                    continue  # Already reported as finished during replay
+                if event["event"] in TERMINAL_EVENTS:
+                    remaining.discard(event["request_id"])
+                yield await self._deliver(event)
+        finally:
+            self.events.unsubscribe(queue, request_ids)
+    
+    def _final_event(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Terminal event rebuilt from a finished request whose events were forgotten."""
+        req = self.requests.get(request_id)
+        if req is None or not (req.is_completed or req.error):
+            return None
+        event = {"request_id": request_id, "batch_id": self._request_batches.get(request_id)}
+        if req.is_completed:
+            return {**event, "event": "completed"}
+        return {**event, "event": "failed", "error": req.error}
+    
+    async def _deliver(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach the result to a completed event; terminal events count as collected."""
+        if event["event"] not in TERMINAL_EVENTS:
+            return event
+        event = dict(event)
+        if event["event"] == "completed":
+            req = self.requests.get(event["request_id"])
+            event["result"] = await self.load_result(req) if req is not None else None
+        self.events.forget([event["request_id"]])
+        return event
     
     async def get_batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -265,7 +642,7 @@ class BatchProcessor:
             "requests": [
                 {
                     "request_id": req.request_id,
-                    "status": "completed" if req.result else ("failed" if req.error else "processing"),
+                    "status": "completed" if req.is_completed else ("failed" if req.error else "processing"),
                     "error": req.error
                 }
                 for req in batch.requests
@@ -277,6 +654,7 @@ class BatchProcessor:
         while self.is_running:
             try:
                 await asyncio.sleep(self.batch_timeout)
+                self._expire_results()
                 
                 async with self._lock:
                     # Only create batch if we have pending requests and capacity
@@ -297,7 +675,7 @@ class BatchProcessor:
                             status=BatchStatus.QUEUED
                         )
                         
-                        self.batches[batch_id] = batch
+                        self._register_batch(batch)
                         logger.info(f"Created batch {batch_id} with {len(batch_requests)} requests (timeout)")
                         
                         # Start processing asynchronously
@@ -327,74 +705,172 @@ class BatchProcessor:
                     status=BatchStatus.QUEUED
                 )
                 
-                self.batches[batch_id] = batch
+                self._register_batch(batch)
                 logger.info(f"Created final batch {batch_id} with {len(batch_requests)} requests (shutdown)")
                 
                 # Process synchronously during shutdown
                 await self._process_batch(batch)
     
+    def _expire_results(self):
+        """Drop finished batches older than ``result_ttl`` with their results and events."""
+        if not self.result_ttl:
+            return
+        cutoff = datetime.now() - timedelta(seconds=self.result_ttl)
+        expired = [
+            batch for batch in self.batches.values()
+            if batch.completed_at is not None and batch.completed_at < cutoff
+        ]
+        for batch in expired:
+            del self.batches[batch.batch_id]
+            request_ids = [request.request_id for request in batch.requests]
+            for request in batch.requests:
+                self.requests.pop(request.request_id, None)
+                self._request_batches.pop(request.request_id, None)
+                if request.result_path is not None:
+                    try:
+                        os.remove(request.result_path)
+                    except FileNotFoundError:
+                        pass
+            self.events.forget(request_ids)
+        if expired:
+            logger.info(f"Expired {len(expired)} finished batches")
+    
+    def _register_batch(self, batch: BatchJob):
+        self.batches[batch.batch_id] = batch
+        for request in batch.requests:
+            self._request_batches[request.request_id] = batch.batch_id
+    
+    async def _run_inference(self, stage: str, func, *args, **kwargs):
+        """Run a blocking pipeline call on the inference executor, waiting for queue space."""
+        if self.inference_executor is None:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        
+        while True:
+            try:
+                return await self.inference_executor.run(stage, func, *args, **kwargs)
+            except InferenceQueueFullError:
+                # Batch work is not latency sensitive; yield to interactive requests
+                await asyncio.sleep(0.5)
+    
+    async def _process_request(self, batch: BatchJob, index: int, request: TranslationRequest):
+        """
+        Translate a single page of a batch and record the outcome.
+        
+        Args:
+            batch: Batch the request belongs to
+            index: 1-based position of the request in the batch
+            request: Request to process
+        """
+        def on_stage(stage: str):
+            self.events.publish(request.request_id, "stage", batch_id=batch.batch_id, stage=stage)
+        
+        try:
+            logger.info(f"Processing request {index}/{batch.total_requests} in batch {batch.batch_id}")
+            
+            # Convert bytes to image
+            from PIL import Image
+            import numpy as np
+            
+            image_data = await self._load_upload(request)
+            image = Image.open(io.BytesIO(image_data))
+            image_array = np.array(image)
+            del image_data, image
+            
+            # Process translation with proper defaults
+            options = dict(
+                source_lang=request.source_lang,
+                target_lang=request.target_lang,
+                detector=request.detector or "RT-DETR-V2",
+                ocr_model=request.ocr_model or "Default",
+                translator=request.translator or "Google Translate",
+                inpainter=request.inpainter or "LaMa",
+                render_text=True,  # Always render text for batch processing
+                font_path=request.font_path,
+                init_font_size=request.init_font_size,
+                min_font_size=request.min_font_size,
+                bbox_expand_ratio=request.bbox_expand_ratio
+            )
+            if self.chapter_pipeline is not None:
+                result = await self.chapter_pipeline.process_page(
+                    image_array, on_stage=on_stage, **options
+                )
+            else:
+                on_stage("pipeline")
+                result = await self._run_inference(
+                    "batch",
+                    self.manga_service.full_translation_pipeline,
+                    image_array,
+                    **options
+                )
+            
+            # Ensure result has translated_image
+            if 'rendered_image' in result and 'translated_image' not in result:
+                result['translated_image'] = result['rendered_image']
+            elif 'inpainted_image' in result and 'translated_image' not in result:
+                result['translated_image'] = result['inpainted_image']
+            
+            # Add metadata for batch tracking
+            result['blocks_detected'] = result.get('count', 0)
+            result['blocks_translated'] = result.get('count', 0)
+            
+            # Keep the result only on disk; subscribers load it when they deliver the event
+            request.result = result
+            try:
+                request.result_path = await asyncio.to_thread(self._spill_result, request, result)
+                request.result = None
+            except OSError as e:
+                logger.warning(f"Could not spill result of {request.request_id}, keeping it in memory: {e}")
+            del result
+            self.events.publish(request.request_id, "completed", batch_id=batch.batch_id)
+            batch.completed_requests += 1
+            logger.info(f"Request {request.request_id} completed successfully")
+            
+        except Exception as e:
+            logger.error(f"Request {request.request_id} failed: {e}")
+            request.error = str(e)
+            batch.failed_requests += 1
+            self.events.publish(request.request_id, "failed", batch_id=batch.batch_id, error=str(e))
+        
+        finally:
+            # The decoded page is no longer needed
+            request.image_data = b""
+    
     async def _process_batch(self, batch: BatchJob):
         """
         Process a batch of translation requests.
         
+        Waits for a free batch slot and for enough memory before starting.
+        
         Args:
             batch: Batch job to process
         """
+        async with self._batch_slots:
+            reserved_mb = await self._reserve_memory(batch)
+            try:
+                await self._run_batch(batch)
+            finally:
+                self._release_memory(reserved_mb)
+    
+    async def _run_batch(self, batch: BatchJob):
         try:
             self.processing_batches += 1
             batch.status = BatchStatus.PROCESSING
             batch.started_at = datetime.now()
             
             logger.info(f"Processing batch {batch.batch_id} with {batch.total_requests} requests")
+            for request in batch.requests:
+                self.events.publish(request.request_id, "processing", batch_id=batch.batch_id)
             
-            # Process each request in the batch
-            for i, request in enumerate(batch.requests, 1):
-                try:
-                    logger.info(f"Processing request {i}/{batch.total_requests} in batch {batch.batch_id}")
-                    
-                    # Convert bytes to image
-                    import io
-                    from PIL import Image
-                    import numpy as np
-                    
-                    image = Image.open(io.BytesIO(request.image_data))
-                    image_array = np.array(image)
-                    
-                    # Process translation with proper defaults
-                    result = await asyncio.to_thread(
-                        self.manga_service.full_translation_pipeline,
-                        image_array,
-                        request.source_lang,
-                        request.target_lang,
-                        detector=request.detector or "RT-DETR-V2",
-                        ocr_model=request.ocr_model or "Default",
-                        translator=request.translator or "Google Translate",
-                        inpainter=request.inpainter or "LaMa",
-                        render_text=True,  # Always render text for batch processing
-                        font_path=request.font_path,
-                        init_font_size=request.init_font_size,
-                        min_font_size=request.min_font_size,
-                        bbox_expand_ratio=request.bbox_expand_ratio
-                    )
-                    
-                    # Ensure result has translated_image
-                    if 'rendered_image' in result and 'translated_image' not in result:
-                        result['translated_image'] = result['rendered_image']
-                    elif 'inpainted_image' in result and 'translated_image' not in result:
-                        result['translated_image'] = result['inpainted_image']
-                    
-                    # Add metadata for batch tracking
-                    result['blocks_detected'] = result.get('count', 0)
-                    result['blocks_translated'] = result.get('count', 0)
-                    
-                    request.result = result
-                    batch.completed_requests += 1
-                    logger.info(f"Request {request.request_id} completed successfully")
-                    
-                except Exception as e:
-                    logger.error(f"Request {request.request_id} failed: {e}")
-                    request.error = str(e)
-                    batch.failed_requests += 1
+            if self.chapter_pipeline is not None:
+                # Pages overlap across stages; per-stage limits live in the pipeline
+                await asyncio.gather(*(
+                    self._process_request(batch, i, request)
+                    for i, request in enumerate(batch.requests, 1)
+                ))
+            else:
+                # Process each request in the batch
+                for i, request in enumerate(batch.requests, 1):
+                    await self._process_request(batch, i, request)
             
             # Mark batch as completed
             batch.status = BatchStatus.COMPLETED
@@ -0,0 +1,231 @@
+"""
+Stage-pipelined translation for multi-page chapters.
+Pages flow through detection -> OCR -> translation -> inpainting -> rendering
+with a concurrency limit per stage, so different pages occupy different stages
+at the same time instead of each page running every stage back to back.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Order in which a page visits the stages
+STAGES = ("detection", "ocr", "translation", "inpainting", "rendering", "encoding")
+
+# Default number of pages allowed in each stage at once
+DEFAULT_STAGE_LIMITS = {
+    "detection": 1,
+    "ocr": 1,
+    "translation": 4,   # network-bound, overlaps well
+    "inpainting": 1,
+    "rendering": 2,
+    "encoding": 2,
+}
+
+# Stages that wait on the network rather than on local compute
+IO_STAGES = frozenset({"translation"})
+
+# Defaults for per-page options (mirror full_translation_pipeline)
+PAGE_DEFAULTS = {
+    "source_lang": "Japanese",
+    "target_lang": "English",
+    "detector": "RT-DETR-V2",
+    "ocr_model": "Default",
+    "translator": "Google Translate",
+    "inpainter": None,
+    "use_gpu": False,
+    "extra_context": "",
+    "render_text": False,
+    "font_path": None,
+    "init_font_size": 60,
+    "min_font_size": 16,
+    "bbox_expand_ratio": 1.15,
+}
+
+
+async def _to_thread(stage: str, func: Callable, *args, **kwargs) -> Any:
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+class ChapterPipeline:
+    """
+    Runs MangaTranslationService stages for many pages concurrently.
+
+    Each stage is guarded by its own semaphore. While page N is in OCR,
+    page N+1 can be in detection and page N-1 can wait on the translator,
+    so chapter wall time approaches that of the slowest stage.
+    """
+
+    def __init__(
+        self,
+        manga_service,
+        stage_limits: Optional[Dict[str, int]] = None,
+        run_blocking: Optional[Callable[..., Awaitable[Any]]] = None
+    ):
+        """
+        Initialize chapter pipeline.
+
+        Args:
+            manga_service: MangaTranslationService instance (in-process)
+            stage_limits: Per-stage concurrency overrides, e.g. {"translation": 8}
+            run_blocking: Coroutine ``(stage, func, *args, **kwargs)`` used to run
+                compute stages, typically backed by the InferenceExecutor.
+                Defaults to ``asyncio.to_thread``.
+        """
+        unknown = set(stage_limits or {}) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}")
+
+        self.manga_service = manga_service
+        self.stage_limits = {**DEFAULT_STAGE_LIMITS, **(stage_limits or {})}
+        self._run_blocking = run_blocking or _to_thread
+        self._semaphores = {
+            stage: asyncio.Semaphore(max(1, limit))
+            for stage, limit in self.stage_limits.items()
+        }
+        self._busy_time = {stage: 0.0 for stage in STAGES}
+
+        logger.info(f"ChapterPipeline initialized: limits={self.stage_limits}")
+
+    async def _stage(
+        self,
+        stage: str,
+        func: Callable,
+        *args,
+        on_stage: Optional[Callable[[str], None]] = None,
+        **kwargs
+    ) -> Any:
+        async with self._semaphores[stage]:
+            if on_stage is not None:
+                on_stage(stage)
+            started = time.perf_counter()
+            try:
+                if stage in IO_STAGES:
+                    return await asyncio.to_thread(func, *args, **kwargs)
+                return await self._run_blocking(stage, func, *args, **kwargs)
+            finally:
+                self._busy_time[stage] += time.perf_counter() - started
+
+    async def process_page(
+        self,
+        image: np.ndarray,
+        on_stage: Optional[Callable[[str], None]] = None,
+        **options
+    ) -> Dict[str, Any]:
+        """
+        Translate one page, waiting for a slot at each stage.
+
+        Args:
+            image: Page image as numpy array
+            on_stage: Optional callback receiving each stage name as the page enters it
+            **options: Same keyword options as full_translation_pipeline
+
+        Returns:
+            Dictionary shaped like full_translation_pipeline's result
+        """
+        opts = {**PAGE_DEFAULTS, **options}
+        service = self.manga_service
+        # Hashed once; every stage keys its cached result on it
+        image_hash = await asyncio.to_thread(service.page_hash, image)
+
+        blk_list = await self._stage(
+            "detection", service.run_detection, image,
+            on_stage=on_stage,
+            detector=opts["detector"], use_gpu=opts["use_gpu"], image_hash=image_hash
+        )
+        await self._stage(
+            "ocr", service.run_ocr, image, blk_list,
+            on_stage=on_stage,
+            source_lang=opts["source_lang"], ocr_model=opts["ocr_model"],
+            use_gpu=opts["use_gpu"], image_hash=image_hash
+        )
+        await self._stage(
+            "translation", service.run_translation, image, blk_list,
+            on_stage=on_stage,
+            source_lang=opts["source_lang"], target_lang=opts["target_lang"],
+            translator=opts["translator"], use_gpu=opts["use_gpu"],
+            extra_context=opts["extra_context"], image_hash=image_hash
+        )
+
+        result = {
+            'blocks': service._textblocks_to_dict(blk_list),
+            'count': len(blk_list),
+            'source_lang': opts["source_lang"],
+            'target_lang': opts["target_lang"],
+            'pipeline_steps': ['detection', 'ocr', 'translation']
+        }
+
+        if not opts["inpainter"]:
+            return result
+
+        inpainting = await self._stage(
+            "inpainting", service.run_inpainting, image, blk_list,
+            on_stage=on_stage,
+            inpainter=opts["inpainter"], use_gpu=opts["use_gpu"], image_hash=image_hash
+        )
+        inpainted = inpainting['image']
+        result['pipeline_steps'].append('inpainting')
+
+        rendered = None
+        if opts["render_text"]:
+            rendered = await self._stage(
+                "rendering", service.run_rendering, inpainted, blk_list,
+                on_stage=on_stage,
+                font_path=opts["font_path"], init_font_size=opts["init_font_size"],
+                min_font_size=opts["min_font_size"],
+                bbox_expand_ratio=opts["bbox_expand_ratio"]
+            )
+            result['pipeline_steps'].append('rendering')
+
+        result['inpainted_image'] = await self._stage(
+            "encoding", service._image_to_base64, inpainted,
+            on_stage=on_stage
+        )
+        if rendered is not None:
+            result['rendered_image'] = await self._stage(
+                "encoding", service._image_to_base64, rendered,
+                on_stage=on_stage
+            )
+
+        return result
+
+    async def process_chapter(
+        self,
+        images: List[np.ndarray],
+        **options
+    ) -> List[Any]:
+        """
+        Translate all pages of a chapter with stage overlap.
+
+        Args:
+            images: Page images in reading order
+            **options: Options applied to every page
+
+        Returns:
+            Per-page results in input order; a failed page yields its exception
+        """
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.process_page(image, **options) for image in images),
+            return_exceptions=True
+        )
+        logger.info(
+            f"Chapter of {len(images)} pages finished in "
+            f"{time.perf_counter() - started:.2f}s"
+        )
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage limits and cumulative busy time."""
+        return {
+            stage: {
+                "limit": self.stage_limits[stage],
+                "busy_seconds": round(self._busy_time[stage], 3),
+            }
+            for stage in STAGES
+        }
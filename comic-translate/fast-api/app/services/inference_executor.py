@@ -0,0 +1,162 @@
+"""
+Dedicated executor for blocking model inference.
+Keeps the event loop free while detection, OCR, translation and inpainting run.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFullError(RuntimeError):
+    """Raised when the inference queue cannot accept more work."""
+
+
+@dataclass
+class StageStats:
+    """Timing counters for one pipeline stage."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_run: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        started = self.completed + self.failed
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": round(self.total_wait / started * 1000, 2) if started else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "avg_run_ms": round(self.total_run / started * 1000, 2) if started else 0.0,
+        }
+
+
+class InferenceExecutor:
+    """
+    Bounded worker pool for running blocking model calls from async handlers.
+
+    Jobs are queued in submission order and run on ``max_workers`` threads.
+    When more than ``max_queue_size`` jobs are waiting for a worker, new jobs
+    are rejected with ``InferenceQueueFullError`` instead of piling up.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue_size: int = 16):
+        """
+        Initialize inference executor.
+
+        Args:
+            max_workers: Number of worker threads running model calls (default: 2)
+            max_queue_size: Maximum jobs waiting for a worker (default: 16)
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._stages: Dict[str, StageStats] = {}
+
+        logger.info(f"InferenceExecutor initialized: workers={max_workers}, queue={max_queue_size}")
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a free worker."""
+        return self._queued
+
+    async def run(self, stage: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the inference pool.
+
+        Args:
+            stage: Stage name used for statistics (e.g. "detection", "ocr")
+            func: Blocking callable to execute
+            *args, **kwargs: Arguments passed to ``func``
+
+        Returns:
+            Return value of ``func``
+
+        Raises:
+            InferenceQueueFullError: If the queue is already full
+        """
+        with self._lock:
+            if self._queued >= self.max_queue_size:
+                raise InferenceQueueFullError(
+                    f"Inference queue is full ({self._queued} jobs waiting)"
+                )
+            self._queued += 1
+            stats = self._stages.setdefault(stage, StageStats())
+            stats.submitted += 1
+
+        enqueued_at = time.perf_counter()
+        started = False
+        abandoned = False
+
+        def job():
+            nonlocal started
+            started_at = time.perf_counter()
+            wait = started_at - enqueued_at
+            with self._lock:
+                if abandoned:
+                    return None
+                started = True
+                self._queued -= 1
+                self._running += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+
+            succeeded = False
+            try:
+                result = func(*args, **kwargs)
+                succeeded = True
+                return result
+            finally:
+                elapsed = time.perf_counter() - started_at
+                with self._lock:
+                    self._running -= 1
+                    stats.total_run += elapsed
+                    if succeeded:
+                        stats.completed += 1
+                    else:
+                        stats.failed += 1
+                logger.debug(f"Stage {stage} waited {wait * 1000:.1f}ms, ran {elapsed * 1000:.1f}ms")
+
+        # A cancelled caller stops waiting, but a started job still runs to completion
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._pool, job)
+        except asyncio.CancelledError:
+            with self._lock:
+                if not started:
+                    # The job never took a worker; drop it from the queue
+                    abandoned = True
+                    self._queued -= 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, worker usage and per-stage timings."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "stages": {name: s.to_dict() for name, s in self._stages.items()},
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and release worker threads."""
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+        logger.info("InferenceExecutor stopped")
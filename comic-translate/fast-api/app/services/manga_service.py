@@ -4,19 +4,23 @@ Handles detection, OCR, translation, and inpainting without GUI dependencies.
 """
 
 import logging
+import time
 import numpy as np
 import json
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable
 
 from modules.detection.processor import TextBlockDetector
 from modules.ocr.processor import OCRProcessor
+from modules.ocr.factory import OCRFactory
 from modules.translation.processor import Translator
 from modules.utils.textblock import TextBlock, sort_blk_list
-from modules.utils.device import resolve_device
+from modules.utils.device import resolve_device, configure_sessions, int8_models_enabled
 from modules.utils.pipeline_utils import inpaint_map, get_config, language_codes
 from modules.inpainting.schema import Config
 from modules.detection.utils.content import get_inpaint_bboxes
 from modules.utils.download import ModelDownloader, ModelID
+from modules.utils.result_cache import ResultCache
 import imkit as imk
 import os
 
@@ -152,6 +156,30 @@ class MockSettingsPage:
         """Check if GPU is enabled."""
         return self.use_gpu
     
+    def get_detection_batching(self) -> Dict[str, Any]:
+        """Micro-batching and input options for the detector, shared across concurrent requests."""
+        from config.settings import settings
+        return {
+            'max_batch_size': settings.detector_max_batch_size,
+            'max_wait_ms': settings.detector_max_wait_ms,
+            'io_binding': settings.detector_io_binding,
+        }
+    
+    def get_ocr_request_limit(self) -> int:
+        """Per-region requests the cloud OCR engines keep in flight."""
+        from config.settings import settings
+        return settings.ocr_max_concurrent_requests
+    
+    def is_ocr_atlas_enabled(self) -> bool:
+        """Whether the LLM OCR engines read all bubbles of a page from atlas images."""
+        from config.settings import settings
+        return settings.llm_ocr_atlas
+    
+    def is_int8_enabled(self) -> bool:
+        """Whether CPU engines should load the locally quantized INT8 models."""
+        from config.settings import settings
+        return settings.use_int8_models
+    
     def get_llm_settings(self) -> Dict[str, Any]:
         """Get LLM settings."""
         return {'extra_context': ''}
@@ -254,6 +282,12 @@ class MangaTranslationService:
         self.inpainter_cache = None
         self.cached_settings = {}
         
+        # Disk cache of stage results, so re-uploaded pages skip finished stages
+        self.result_cache = self._create_result_cache()
+        
+        # ONNX session tuning, applied before any engine is built
+        self._configure_onnx_sessions()
+        
         # Set default font from parameter or environment variable
         self.default_font_path = (
             default_font_path or 
@@ -267,6 +301,37 @@ class MangaTranslationService:
         # Ensure mandatory models are available
         self._ensure_core_models()
     
+    @staticmethod
+    def _create_result_cache() -> Optional[ResultCache]:
+        """Open the stage result cache configured in settings (None when disabled)."""
+        from config.settings import settings
+        if not settings.enable_caching:
+            return None
+        try:
+            cache_kwargs = {
+                'max_bytes': settings.result_cache_max_mb * 1024 * 1024,
+                'ttl': settings.cache_ttl,
+            }
+            if settings.result_cache_dir:
+                cache_kwargs['cache_dir'] = settings.result_cache_dir
+            return ResultCache(**cache_kwargs)
+        except Exception as e:
+            logger.warning(f"Result cache disabled: {e}")
+            return None
+    
+    @staticmethod
+    def _configure_onnx_sessions():
+        """Apply the configured ONNX Runtime session profile to this process."""
+        from config.settings import settings
+        configure_sessions(
+            profile=settings.onnx_session_profile,
+            intra_op_threads=settings.onnx_intra_op_threads,
+            # Each inference thread (or worker process) may run a session at once
+            parallel_sessions=max(settings.inference_workers, settings.worker_processes, 1),
+            cache_optimized=settings.onnx_optimized_model_cache,
+        )
+        logger.info(f"ONNX session profile: {settings.onnx_session_profile}")
+    
     def _find_default_font(self) -> Optional[str]:
         """Find the first available default font from the list."""
         for font_path in self.DEFAULT_FONTS:
@@ -312,7 +377,8 @@ class MangaTranslationService:
         logger.info(f"Creating new inpainter: {inpainter_key}")
         device = resolve_device(use_gpu)
         InpainterClass = inpaint_map[inpainter_name]
-        inpainter = InpainterClass(device, backend='onnx')
+        quantized = int8_models_enabled(MockSettingsPage(inpainter=inpainter_name, use_gpu=use_gpu), device)
+        inpainter = InpainterClass(device, backend='onnx', quantized=quantized)
         
         # Store in shared cache
         self._shared_inpainter_cache[inpainter_key] = inpainter
@@ -437,6 +503,100 @@ class MangaTranslationService:
         logger.info(f"OCR cached: {ocr_key}")
         return processor
     
+    # ------------------------------------------------------------------
+    # Startup preloading
+    # ------------------------------------------------------------------
+    
+    def preload(
+        self,
+        detector: str = "RT-DETR-V2",
+        ocr_model: str = "Default",
+        source_langs: Optional[List[str]] = None,
+        inpainter: str = "LaMa",
+        use_gpu: bool = False,
+        warm_up: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Build the detector, OCR and inpainter sessions in parallel so the
+        first request does not pay for model loading.
+        
+        Args:
+            detector: Detector to load
+            ocr_model: OCR model to load
+            source_langs: Source languages to load OCR engines for (default: Japanese)
+            inpainter: Inpainter to load
+            use_gpu: Load GPU sessions
+            warm_up: Run one small inference per model after loading
+            
+        Returns:
+            Dictionary with overall readiness, total seconds and a per-model report
+        """
+        source_langs = source_langs or ["Japanese"]
+        tasks = {
+            f"detector:{detector}": lambda: self._preload_detector(detector, use_gpu, warm_up),
+            f"ocr:{ocr_model}": lambda: self._preload_ocr(ocr_model, source_langs, use_gpu, warm_up),
+            f"inpainter:{inpainter}": lambda: self._preload_inpainter(inpainter, use_gpu, warm_up),
+        }
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="model-preload") as pool:
+            futures = {name: pool.submit(self._timed_preload, name, task) for name, task in tasks.items()}
+            models = {name: future.result() for name, future in futures.items()}
+        
+        report = {
+            "ready": all(m["status"] == "ready" for m in models.values()),
+            "seconds": round(time.perf_counter() - start, 2),
+            "models": models,
+        }
+        logger.info(f"Model preload finished in {report['seconds']}s (ready: {report['ready']})")
+        return report
+    
+    @staticmethod
+    def _timed_preload(name: str, task: Callable[[], None]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            task()
+            status = {"status": "ready"}
+        except Exception as e:
+            logger.error(f"Preloading {name} failed: {e}", exc_info=True)
+            status = {"status": "failed", "error": str(e)}
+        status["seconds"] = round(time.perf_counter() - start, 2)
+        return status
+    
+    @staticmethod
+    def _warm_up_page(height: int = 640, width: int = 640):
+        """Blank white page with one text-sized block, for warm-up runs."""
+        image = np.full((height, width, 3), 255, dtype=np.uint8)
+        block = TextBlock(text_bbox=np.array([width // 4, height // 4, width // 2, height // 2]))
+        return image, block
+    
+    def _preload_detector(self, detector: str, use_gpu: bool, warm_up: bool):
+        detector_obj = self._get_or_create_detector(MockSettingsPage(detector=detector, use_gpu=use_gpu))
+        if warm_up:
+            image, _ = self._warm_up_page()
+            detector_obj.detect(image)
+    
+    def _preload_ocr(self, ocr_model: str, source_langs: List[str], use_gpu: bool, warm_up: bool):
+        for source_lang in source_langs:
+            self._ensure_ocr_model(ocr_model, source_lang)
+            main_page = MockMainPage(MockSettingsPage(ocr_model=ocr_model, use_gpu=use_gpu), source_lang=source_lang)
+            processor = self._get_or_create_ocr(main_page, source_lang)
+            if warm_up:
+                image, block = self._warm_up_page(128, 256)
+                processor.process(image, [block])
+            else:
+                # Engines are otherwise only built on the first process() call
+                OCRFactory.create_engine(processor.settings, processor.source_lang_english, processor.ocr_key)
+    
+    def _preload_inpainter(self, inpainter: str, use_gpu: bool, warm_up: bool):
+        inpainter_obj = self._get_or_create_inpainter(inpainter, use_gpu)
+        if warm_up:
+            image, block = self._warm_up_page(256, 256)
+            mask = np.zeros(image.shape[:2], dtype=np.uint8)
+            x1, y1, x2, y2 = block.xyxy
+            mask[y1:y2, x1:x2] = 255
+            inpainter_obj(image, mask, Config())
+    
     def _textblocks_to_dict(self, blk_list: List[TextBlock]) -> List[Dict[str, Any]]:
         """Convert TextBlock objects to dictionary representation."""
         result = []
@@ -463,10 +623,8 @@ class MangaTranslationService:
     
     def _dict_to_textblocks(self, blocks_data: List[Dict[str, Any]]) -> List[TextBlock]:
         """Convert dictionary representation to TextBlock objects."""
-        print(blocks_data)
         result = []
         for block_dict in blocks_data:
-            print(block_dict)
             text_bbox = np.array(block_dict['bbox'], dtype=np.float32)
             bubble_bbox = np.array(block_dict.get('bubble_bbox'), dtype=np.float32) if block_dict.get('bubble_bbox') else None
             inpaint_bboxes = np.array(block_dict.get('inpaint_bboxes'), dtype=np.int32) if block_dict.get('inpaint_bboxes') else None
@@ -486,6 +644,307 @@ class MangaTranslationService:
         
         return result
     
+    def _parse_blocks_json(self, blocks_json: str) -> List[TextBlock]:
+        """Parse a blocks JSON payload (list or dict with 'blocks') into TextBlocks."""
+        parsed_json = json.loads(blocks_json)
+        # Handle both cases: full response with 'blocks' key or just blocks array
+        if isinstance(parsed_json, dict) and 'blocks' in parsed_json:
+            blocks_data = parsed_json['blocks']
+        elif isinstance(parsed_json, list):
+            blocks_data = parsed_json
+        else:
+            raise ValueError("Invalid blocks_json format. Expected a list of blocks or a dict with 'blocks' key")
+        return self._dict_to_textblocks(blocks_data)
+    
+    @staticmethod
+    def _image_to_base64(image: np.ndarray) -> str:
+        """Encode an image array as base64 PNG for transmission."""
+        from PIL import Image
+        import io
+        import base64
+        
+        pil_image = Image.fromarray(image)
+        buffer = io.BytesIO()
+        pil_image.save(buffer, format="PNG")
+        return base64.b64encode(buffer.getvalue()).decode()
+    
+    @staticmethod
+    def _blocks_signature(blk_list: List[TextBlock], with_text: bool = False) -> List[list]:
+        """Geometry (and optionally OCR text) of blocks, used in result cache keys."""
+        signature = []
+        for blk in blk_list:
+            entry = [
+                np.asarray(blk.xyxy).tolist(),
+                np.asarray(blk.bubble_xyxy).tolist() if blk.bubble_xyxy is not None else None,
+                float(blk.angle or 0),
+            ]
+            if with_text:
+                entry.append(blk.text or '')
+            signature.append(entry)
+        return signature
+    
+    def page_hash(self, image: np.ndarray) -> Optional[str]:
+        """
+        Content hash of a page for result cache keys, or None when caching is off.
+        
+        Hash a page once per request and pass it to each stage as ``image_hash``
+        so the pixels are not hashed again for every stage.
+        """
+        if self.result_cache is None:
+            return None
+        return ResultCache.hash_image(image)
+    
+    def _cache_key(
+        self,
+        stage: str,
+        image: np.ndarray,
+        *parts,
+        use_gpu: bool = False,
+        image_hash: Optional[str] = None
+    ) -> Optional[str]:
+        if self.result_cache is None:
+            return None
+        if stage != "translation" and int8_models_enabled(
+            MockSettingsPage(use_gpu=use_gpu), resolve_device(use_gpu)
+        ):
+            # Quantized models give slightly different results; keep them apart
+            parts = (*parts, "int8")
+        return ResultCache.make_key(stage, image_hash or ResultCache.hash_image(image), *parts)
+    
+    # ------------------------------------------------------------------
+    # Stage methods: operate on TextBlock lists and numpy arrays directly.
+    # Used by the public endpoints below and by the chapter pipeline.
+    # Results are cached on page content plus the options that affect them.
+    # ------------------------------------------------------------------
+    
+    def run_detection(
+        self,
+        image: np.ndarray,
+        detector: str = "RT-DETR-V2",
+        use_gpu: bool = False,
+        image_hash: Optional[str] = None
+    ) -> List[TextBlock]:
+        """Detect text blocks and sort them in reading order."""
+        cache_key = self._cache_key("detection", image, detector, use_gpu=use_gpu, image_hash=image_hash)
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Detection served from result cache ({len(cached)} blocks)")
+                return cached
+        
+        settings = MockSettingsPage(detector=detector, use_gpu=use_gpu)
+        detector_obj = self._get_or_create_detector(settings)
+        
+        blk_list = detector_obj.detect(image)
+        
+        # Sort blocks based on typical reading order
+        blk_list = sort_blk_list(blk_list, right_to_left=True)
+        
+        if cache_key is not None:
+            self.result_cache.put(cache_key, blk_list)
+        return blk_list
+    
+    def run_ocr(
+        self,
+        image: np.ndarray,
+        blk_list: List[TextBlock],
+        source_lang: str = "Japanese",
+        ocr_model: str = "Default",
+        use_gpu: bool = False,
+        image_hash: Optional[str] = None
+    ) -> List[TextBlock]:
+        """Fill in ``text`` for each block in place."""
+        cache_key = self._cache_key(
+            "ocr", image, ocr_model, source_lang, self._blocks_signature(blk_list),
+            use_gpu=use_gpu, image_hash=image_hash
+        )
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                for blk, text in zip(blk_list, cached):
+                    blk.text = text
+                logger.info("OCR served from result cache")
+                return blk_list
+        
+        # Ensure OCR model is downloaded
+        self._ensure_ocr_model(ocr_model, source_lang)
+        
+        settings = MockSettingsPage(ocr_model=ocr_model, use_gpu=use_gpu)
+        main_page = MockMainPage(settings, source_lang=source_lang)
+        
+        ocr_processor = self._get_or_create_ocr(main_page, source_lang)
+        ocr_processor.process(image, blk_list)
+        
+        # Pages where nothing was read are not cached (usually a failed run)
+        texts = [blk.text or '' for blk in blk_list]
+        if cache_key is not None and any(texts):
+            self.result_cache.put(cache_key, texts)
+        return blk_list
+    
+    def run_translation(
+        self,
+        image: np.ndarray,
+        blk_list: List[TextBlock],
+        source_lang: str = "Japanese",
+        target_lang: str = "English",
+        translator: str = "Google Translate",
+        use_gpu: bool = False,
+        extra_context: str = "",
+        image_hash: Optional[str] = None
+    ) -> List[TextBlock]:
+        """Fill in ``translation`` for each block in place."""
+        cache_key = self._cache_key(
+            "translation", image, translator, source_lang, target_lang, extra_context,
+            self._blocks_signature(blk_list, with_text=True),
+            image_hash=image_hash
+        )
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                for blk, translation in zip(blk_list, cached):
+                    blk.translation = translation
+                logger.info("Translation served from result cache")
+                return blk_list
+        
+        settings = MockSettingsPage(translator=translator, use_gpu=use_gpu)
+        main_page = MockMainPage(settings, source_lang=source_lang, target_lang=target_lang)
+        
+        translator_obj = self._get_or_create_translator(main_page, source_lang, target_lang)
+        translator_obj.translate(blk_list, image, extra_context)
+        
+        translations = [blk.translation or '' for blk in blk_list]
+        if cache_key is not None and any(translations):
+            self.result_cache.put(cache_key, translations)
+        return blk_list
+    
+    def run_inpainting(
+        self,
+        image: np.ndarray,
+        blk_list: List[TextBlock],
+        inpainter: str = "LaMa",
+        use_gpu: bool = False,
+        image_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Inpaint blocks that carry text or a translation.
+        
+        Returns:
+            Dictionary with the inpainted image array and block counts
+        """
+        # The mask depends on block geometry and on which blocks carry text
+        cache_key = self._cache_key(
+            "inpainting", image, inpainter,
+            [
+                [
+                    np.asarray(blk.xyxy).tolist(),
+                    np.asarray(blk.inpaint_bboxes).tolist() if blk.inpaint_bboxes is not None else None,
+                    bool((blk.text or '').strip() or (blk.translation or '').strip()),
+                ]
+                for blk in blk_list
+            ],
+            use_gpu=use_gpu, image_hash=image_hash
+        )
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Inpainting served from result cache")
+                return cached
+        
+        # Ensure inpainting model is downloaded
+        self._ensure_inpainting_model(inpainter)
+        
+        # Filter blocks: only inpaint blocks that have text and translation
+        # Skip blocks with empty text or empty translation to preserve image quality
+        blocks_to_inpaint = []
+        skipped_count = 0
+        
+        for blk in blk_list:
+            has_text = hasattr(blk, 'text') and blk.text and len(blk.text.strip()) > 0
+            has_translation = hasattr(blk, 'translation') and blk.translation and len(blk.translation.strip()) > 0
+            
+            if has_text or has_translation:
+                blocks_to_inpaint.append(blk)
+            else:
+                skipped_count += 1
+                logger.info(f"Skipping inpainting for block (no text/translation): bbox={blk.xyxy}")
+        
+        logger.info(f"Inpainting {len(blocks_to_inpaint)} blocks, skipped {skipped_count} empty blocks")
+        
+        # Create mask from filtered text blocks
+        mask = np.zeros(image.shape[:2], dtype=np.uint8)
+        
+        for blk in blocks_to_inpaint:
+            # Get inpaint bboxes or use text bbox
+            if blk.inpaint_bboxes is not None and len(blk.inpaint_bboxes) > 0:
+                bboxes = blk.inpaint_bboxes
+            else:
+                # Generate inpaint bboxes if not present
+                bboxes = get_inpaint_bboxes(blk.xyxy, image)
+            
+            # Draw filled rectangles on mask
+            for bbox in bboxes:
+                x1, y1, x2, y2 = map(int, bbox)
+                mask[y1:y2, x1:x2] = 255
+        
+        # Perform inpainting with cached inpainter
+        inpainter_obj = self._get_or_create_inpainter(inpainter, use_gpu)
+        
+        config = Config()
+        inpainted_image = inpainter_obj(image, mask, config)
+        inpainted_image = imk.convert_scale_abs(inpainted_image)
+        
+        result = {
+            'image': inpainted_image,
+            'blocks_inpainted': len(blocks_to_inpaint),
+            'blocks_skipped': skipped_count
+        }
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result)
+        return result
+    
+    def run_rendering(
+        self,
+        image: np.ndarray,
+        blk_list: List[TextBlock],
+        font_path: Optional[str] = None,
+        font_color: str = "#000000",
+        init_font_size: int = 60,
+        min_font_size: int = 16,
+        outline: bool = True,
+        bbox_expand_ratio: float = 1.15
+    ) -> np.ndarray:
+        """Draw block translations onto the image and return the result."""
+        # Use provided font or fall back to service default
+        if not font_path:
+            if self.default_font_path:
+                font_path = self.default_font_path
+                logger.info(f"Using service default font: {font_path}")
+            else:
+                raise ValueError(
+                    "No font available. Please either:\n"
+                    "1. Provide font_path parameter, or\n"
+                    "2. Set MANGA_TRANSLATE_DEFAULT_FONT environment variable, or\n"
+                    "3. Install a Unicode font in system font directories"
+                )
+        else:
+            logger.info(f"Using provided font: {font_path}")
+        
+        # Verify font exists
+        if not os.path.exists(font_path):
+            raise ValueError(f"Font file not found: {font_path}")
+        
+        # Render text on image
+        return simple_draw_text(
+            image=image,
+            blk_list=blk_list,
+            font_pth=font_path,
+            colour=font_color,
+            init_font_size=init_font_size,
+            min_font_size=min_font_size,
+            outline=outline,
+            bbox_expand_ratio=bbox_expand_ratio
+        )
+    
     def detect_text_blocks(
         self, 
         image: np.ndarray, 
@@ -505,13 +964,7 @@ class MangaTranslationService:
         """
         logger.info(f"Starting text block detection with {detector}")
         
-        settings = MockSettingsPage(detector=detector, use_gpu=use_gpu)
-        detector_obj = self._get_or_create_detector(settings)
-        
-        blk_list = detector_obj.detect(image)
-        
-        # Sort blocks based on typical reading order
-        blk_list = sort_blk_list(blk_list, right_to_left=True)
+        blk_list = self.run_detection(image, detector=detector, use_gpu=use_gpu)
         
         logger.info(f"Detected {len(blk_list)} text blocks")
         
@@ -544,31 +997,20 @@ class MangaTranslationService:
         """
         logger.info(f"Starting OCR with model {ocr_model} for language {source_lang}")
         
-        # Ensure OCR model is downloaded
-        self._ensure_ocr_model(ocr_model, source_lang)
-        
-        settings = MockSettingsPage(ocr_model=ocr_model, use_gpu=use_gpu)
-        main_page = MockMainPage(settings, source_lang=source_lang)
+        image_hash = self.page_hash(image)
         
         # Get or detect text blocks
         if blocks_json:
-            parsed_json = json.loads(blocks_json)
-            # Handle both cases: full response with 'blocks' key or just blocks array
-            if isinstance(parsed_json, dict) and 'blocks' in parsed_json:
-                blocks_data = parsed_json['blocks']
-            elif isinstance(parsed_json, list):
-                blocks_data = parsed_json
-            else:
-                raise ValueError("Invalid blocks_json format. Expected a list of blocks or a dict with 'blocks' key")
-            blk_list = self._dict_to_textblocks(blocks_data)
+            blk_list = self._parse_blocks_json(blocks_json)
         else:
             logger.info("No blocks provided, performing detection first")
-            detection_result = self.detect_text_blocks(image, use_gpu=use_gpu)
-            blk_list = self._dict_to_textblocks(detection_result['blocks'])
+            blk_list = self.run_detection(image, use_gpu=use_gpu, image_hash=image_hash)
         
         # Perform OCR with cached processor
-        ocr_processor = self._get_or_create_ocr(main_page, source_lang)
-        ocr_processor.process(image, blk_list)
+        self.run_ocr(
+            image, blk_list, source_lang=source_lang, ocr_model=ocr_model, use_gpu=use_gpu,
+            image_hash=image_hash
+        )
         
         logger.info(f"OCR completed for {len(blk_list)} blocks")
         
@@ -605,33 +1047,31 @@ class MangaTranslationService:
         """
         logger.info(f"Starting translation from {source_lang} to {target_lang} using {translator}")
         
-        settings = MockSettingsPage(translator=translator, use_gpu=use_gpu)
-        main_page = MockMainPage(settings, source_lang=source_lang, target_lang=target_lang)
+        image_hash = self.page_hash(image)
         
         # Get or perform OCR
         if blocks_json:
-            parsed_json = json.loads(blocks_json)
-            # Handle both cases: full response with 'blocks' key or just blocks array
-            if isinstance(parsed_json, dict) and 'blocks' in parsed_json:
-                blocks_data = parsed_json['blocks']
-            elif isinstance(parsed_json, list):
-                blocks_data = parsed_json
-            else:
-                raise ValueError("Invalid blocks_json format. Expected a list of blocks or a dict with 'blocks' key")
-            blk_list = self._dict_to_textblocks(blocks_data)
+            blk_list = self._parse_blocks_json(blocks_json)
             # If blocks don't have text, perform OCR
             if not all(blk.text for blk in blk_list):
                 logger.info("Blocks provided without OCR text, performing OCR")
-                ocr_processor = self._get_or_create_ocr(main_page, source_lang)
-                ocr_processor.process(image, blk_list)
+                self.run_ocr(image, blk_list, source_lang=source_lang, use_gpu=use_gpu, image_hash=image_hash)
         else:
             logger.info("No blocks provided, performing detection and OCR")
-            ocr_result = self.perform_ocr(image, source_lang=source_lang, use_gpu=use_gpu)
-            blk_list = self._dict_to_textblocks(ocr_result['blocks'])
+            blk_list = self.run_detection(image, use_gpu=use_gpu, image_hash=image_hash)
+            self.run_ocr(image, blk_list, source_lang=source_lang, use_gpu=use_gpu, image_hash=image_hash)
         
         # Perform translation with cached translator
-        translator_obj = self._get_or_create_translator(main_page, source_lang, target_lang)
-        translator_obj.translate(blk_list, image, extra_context)
+        self.run_translation(
+            image,
+            blk_list,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            translator=translator,
+            use_gpu=use_gpu,
+            extra_context=extra_context,
+            image_hash=image_hash
+        )
         
         logger.info(f"Translation completed for {len(blk_list)} blocks")
         
@@ -663,84 +1103,30 @@ class MangaTranslationService:
         """
         logger.info(f"Starting inpainting with {inpainter}")
         
-        # Ensure inpainting model is downloaded
-        self._ensure_inpainting_model(inpainter)
-        
-        settings = MockSettingsPage(inpainter=inpainter, use_gpu=use_gpu)
+        image_hash = self.page_hash(image)
         
         # Get or detect text blocks
         if blocks_json:
-            parsed_json = json.loads(blocks_json)
-            # Handle both cases: full response with 'blocks' key or just blocks array
-            if isinstance(parsed_json, dict) and 'blocks' in parsed_json:
-                blocks_data = parsed_json['blocks']
-            elif isinstance(parsed_json, list):
-                blocks_data = parsed_json
-            else:
-                raise ValueError("Invalid blocks_json format. Expected a list of blocks or a dict with 'blocks' key")
-            blk_list = self._dict_to_textblocks(blocks_data)
+            blk_list = self._parse_blocks_json(blocks_json)
         else:
             logger.info("No blocks provided, performing detection first")
-            detection_result = self.detect_text_blocks(image, use_gpu=use_gpu)
-            blk_list = self._dict_to_textblocks(detection_result['blocks'])
-        
-        # Filter blocks: only inpaint blocks that have text and translation
-        # Skip blocks with empty text or empty translation to preserve image quality
-        blocks_to_inpaint = []
-        skipped_count = 0
-        
-        for blk in blk_list:
-            has_text = hasattr(blk, 'text') and blk.text and len(blk.text.strip()) > 0
-            has_translation = hasattr(blk, 'translation') and blk.translation and len(blk.translation.strip()) > 0
-            
-            if has_text or has_translation:
-                blocks_to_inpaint.append(blk)
-            else:
-                skipped_count += 1
-                logger.info(f"Skipping inpainting for block (no text/translation): bbox={blk.xyxy}")
-        
-        logger.info(f"Inpainting {len(blocks_to_inpaint)} blocks, skipped {skipped_count} empty blocks")
-        
-        # Create mask from filtered text blocks
-        mask = np.zeros(image.shape[:2], dtype=np.uint8)
-        
-        for blk in blocks_to_inpaint:
-            # Get inpaint bboxes or use text bbox
-            if blk.inpaint_bboxes is not None and len(blk.inpaint_bboxes) > 0:
-                bboxes = blk.inpaint_bboxes
-            else:
-                # Generate inpaint bboxes if not present
-                bboxes = get_inpaint_bboxes(blk.xyxy, image)
-            
-            # Draw filled rectangles on mask
-            for bbox in bboxes:
-                x1, y1, x2, y2 = map(int, bbox)
-                mask[y1:y2, x1:x2] = 255
+            blk_list = self.run_detection(image, use_gpu=use_gpu, image_hash=image_hash)
         
-        # Perform inpainting with cached inpainter
-        inpainter_obj = self._get_or_create_inpainter(inpainter, use_gpu)
-        
-        config = Config()
-        inpainted_image = inpainter_obj(image, mask, config)
-        inpainted_image = imk.convert_scale_abs(inpainted_image)
+        inpainting = self.run_inpainting(
+            image, blk_list, inpainter=inpainter, use_gpu=use_gpu, image_hash=image_hash
+        )
+        inpainted_image = inpainting['image']
         
         logger.info("Inpainting completed")
         
         # Convert to base64 for transmission
-        from PIL import Image
-        import io
-        import base64
-        
-        pil_image = Image.fromarray(inpainted_image)
-        buffer = io.BytesIO()
-        pil_image.save(buffer, format="PNG")
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
+        image_base64 = self._image_to_base64(inpainted_image)
         
         return {
             'inpainted_image': image_base64,
             'blocks_count': len(blk_list),
-            'blocks_inpainted': len(blocks_to_inpaint),
-            'blocks_skipped': skipped_count,
+            'blocks_inpainted': inpainting['blocks_inpainted'],
+            'blocks_skipped': inpainting['blocks_skipped'],
             'image_shape': inpainted_image.shape
         }
     
@@ -775,42 +1161,15 @@ class MangaTranslationService:
         
         # Parse blocks if provided
         if blocks_json:
-            parsed_json = json.loads(blocks_json)
-            if isinstance(parsed_json, dict) and 'blocks' in parsed_json:
-                blocks_data = parsed_json['blocks']
-            elif isinstance(parsed_json, list):
-                blocks_data = parsed_json
-            else:
-                raise ValueError("Invalid blocks_json format")
-            blk_list = self._dict_to_textblocks(blocks_data)
+            blk_list = self._parse_blocks_json(blocks_json)
         else:
             raise ValueError("blocks_json is required for rendering")
         
-        # Use provided font or fall back to service default
-        if not font_path:
-            if self.default_font_path:
-                font_path = self.default_font_path
-                logger.info(f"Using service default font: {font_path}")
-            else:
-                raise ValueError(
-                    "No font available. Please either:\n"
-                    "1. Provide font_path parameter, or\n"
-                    "2. Set MANGA_TRANSLATE_DEFAULT_FONT environment variable, or\n"
-                    "3. Install a Unicode font in system font directories"
-                )
-        else:
-            logger.info(f"Using provided font: {font_path}")
-        
-        # Verify font exists
-        if not os.path.exists(font_path):
-            raise ValueError(f"Font file not found: {font_path}")
-        
-        # Render text on image
-        rendered_image = simple_draw_text(
-            image=image,
-            blk_list=blk_list,
-            font_pth=font_path,
-            colour=font_color,
+        rendered_image = self.run_rendering(
+            image,
+            blk_list,
+            font_path=font_path,
+            font_color=font_color,
             init_font_size=init_font_size,
             min_font_size=min_font_size,
             outline=outline,
@@ -820,14 +1179,7 @@ class MangaTranslationService:
         logger.info("Text rendering completed")
         
         # Convert to base64 for transmission
-        from PIL import Image
-        import io
-        import base64
-        
-        pil_image = Image.fromarray(rendered_image)
-        buffer = io.BytesIO()
-        pil_image.save(buffer, format="PNG")
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
+        image_base64 = self._image_to_base64(rendered_image)
         
         return {
             'rendered_image': image_base64,
@@ -876,40 +1228,40 @@ class MangaTranslationService:
         """
         logger.info(f"Starting full translation pipeline: {source_lang} -> {target_lang}")
         
-        # Step 1: Detection
-        detection_result = self.detect_text_blocks(
-            image=image,
-            detector=detector,
-            use_gpu=use_gpu
-        )
+        # Stages hand TextBlock lists and arrays to each other directly;
+        # serialization happens once, when the response is built.
         
-        blocks_json = json.dumps(detection_result['blocks'])
+        image_hash = self.page_hash(image)
+        
+        # Step 1: Detection
+        blk_list = self.run_detection(image, detector=detector, use_gpu=use_gpu, image_hash=image_hash)
+        logger.info(f"Detected {len(blk_list)} text blocks")
         
         # Step 2: OCR
-        ocr_result = self.perform_ocr(
-            image=image,
+        self.run_ocr(
+            image,
+            blk_list,
             source_lang=source_lang,
             ocr_model=ocr_model,
             use_gpu=use_gpu,
-            blocks_json=blocks_json
+            image_hash=image_hash
         )
         
-        blocks_json = json.dumps(ocr_result['blocks'])
-        
         # Step 3: Translation
-        translation_result = self.perform_translation(
-            image=image,
+        self.run_translation(
+            image,
+            blk_list,
             source_lang=source_lang,
             target_lang=target_lang,
             translator=translator,
             use_gpu=use_gpu,
-            blocks_json=blocks_json,
-            extra_context=extra_context
+            extra_context=extra_context,
+            image_hash=image_hash
         )
         
         result = {
-            'blocks': translation_result['blocks'],
-            'count': translation_result['count'],
+            'blocks': self._textblocks_to_dict(blk_list),
+            'count': len(blk_list),
             'source_lang': source_lang,
             'target_lang': target_lang,
             'pipeline_steps': ['detection', 'ocr', 'translation']
@@ -918,36 +1270,28 @@ class MangaTranslationService:
         # Step 4: Optional Inpainting
         if inpainter:
             logger.info(f"Performing inpainting with {inpainter}")
-            inpainting_result = self.perform_inpainting(
-                image=image,
+            inpainted_image = self.run_inpainting(
+                image,
+                blk_list,
                 inpainter=inpainter,
                 use_gpu=use_gpu,
-                blocks_json=json.dumps(translation_result['blocks'])
-            )
-            result['inpainted_image'] = inpainting_result['inpainted_image']
+                image_hash=image_hash
+            )['image']
+            result['inpainted_image'] = self._image_to_base64(inpainted_image)
             result['pipeline_steps'].append('inpainting')
             
             # Step 5: Optional Text Rendering (requires inpainted image)
             if render_text:
                 logger.info("Rendering translated text on inpainted image")
-                # Decode inpainted image from base64
-                import base64
-                import io
-                from PIL import Image
-                
-                inpainted_bytes = base64.b64decode(inpainting_result['inpainted_image'])
-                inpainted_pil = Image.open(io.BytesIO(inpainted_bytes))
-                inpainted_np = np.array(inpainted_pil)
-                
-                rendering_result = self.render_translated_text(
-                    image=inpainted_np,
-                    blocks_json=json.dumps(translation_result['blocks']),
+                rendered_image = self.run_rendering(
+                    inpainted_image,
+                    blk_list,
                     font_path=font_path,
                     init_font_size=init_font_size,
                     min_font_size=min_font_size,
                     bbox_expand_ratio=bbox_expand_ratio
                 )
-                result['rendered_image'] = rendering_result['rendered_image']
+                result['rendered_image'] = self._image_to_base64(rendered_image)
                 result['pipeline_steps'].append('rendering')
         
         logger.info("Full translation pipeline completed")
@@ -0,0 +1,89 @@
+"""
+Progress events for batch translation requests.
+Streaming endpoints subscribe to request IDs and receive stage updates and
+finished results as they happen, instead of polling the status endpoints.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Events after which a request produces no further updates
+TERMINAL_EVENTS = frozenset({"completed", "failed"})
+
+
+class ProgressBroker:
+    """
+    In-process publish/subscribe hub keyed by request ID.
+
+    The latest event of every request is remembered, so a client that
+    subscribes late first receives the current state and then live updates.
+    Events only reference results by request ID; subscribers load the
+    payload when they deliver it. Call ``forget`` once a request's outcome
+    has been collected or has expired. Subscriber queues are bounded; a
+    subscriber that stops reading loses intermediate stage events but never
+    blocks the pipeline.
+    """
+
+    def __init__(self, max_queue_size: int = 256):
+        """
+        Initialize progress broker.
+
+        Args:
+            max_queue_size: Maximum undelivered events per subscriber (default: 256)
+        """
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+
+    def publish(self, request_id: str, event: str, **data) -> None:
+        """
+        Record an event for a request and deliver it to subscribers.
+
+        Must be called from the event loop thread.
+
+        Args:
+            request_id: Request the event belongs to
+            event: Event type ("queued", "stage", "completed", "failed", ...)
+            **data: JSON-serialisable event payload
+        """
+        message = {"request_id": request_id, "event": event, **data}
+        self._latest[request_id] = message
+
+        for queue in self._subscribers.get(request_id, ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                if event in TERMINAL_EVENTS:
+                    # Make room: the final event matters more than a stale stage update
+                    queue.get_nowait()
+                    queue.put_nowait(message)
+                else:
+                    logger.debug(f"Dropping {event} event for slow subscriber of {request_id}")
+
+    def latest(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Last event published for a request, unless it has been forgotten."""
+        return self._latest.get(request_id)
+
+    def subscribe(self, request_ids: Iterable[str]) -> asyncio.Queue:
+        """Create a queue receiving events for all given request IDs."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        for request_id in request_ids:
+            self._subscribers.setdefault(request_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, request_ids: Iterable[str]) -> None:
+        for request_id in request_ids:
+            subscribers = self._subscribers.get(request_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[request_id]
+
+    def forget(self, request_ids: List[str]) -> None:
+        """Drop remembered state for requests that are no longer tracked."""
+        for request_id in request_ids:
+            self._latest.pop(request_id, None)
@@ -0,0 +1,407 @@
+"""
+Multi-process model worker pool.
+Each worker process keeps its own warm MangaTranslationService so NumPy/ONNX
+pre- and post-processing scales across cores instead of sharing one GIL.
+"""
+
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import traceback
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Service methods that may be dispatched to a worker process
+POOLED_METHODS = (
+    "detect_text_blocks",
+    "perform_ocr",
+    "perform_translation",
+    "perform_inpainting",
+    "render_translated_text",
+    "full_translation_pipeline",
+)
+
+# Attempts to start a replacement worker before its slot is given up
+REPLACEMENT_ATTEMPTS = 3
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process dies while handling a job."""
+
+
+class WorkerJobError(RuntimeError):
+    """Raised when a job fails inside a worker process."""
+
+
+def _worker_main(
+    conn,
+    worker_index: int,
+    service_kwargs: Dict[str, Any],
+    preload_kwargs: Optional[Dict[str, Any]] = None
+):
+    """
+    Worker process entry point.
+
+    With ``preload_kwargs`` the worker builds and warms up its models before
+    reporting ready, and sends the preload report along with ("ready", index, report).
+
+    Receives jobs as (method, shm_name, shape, dtype, args, kwargs) tuples and replies
+    with ("ok", result) or ("error", type_name, message, traceback).
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - worker-{worker_index} - %(name)s - %(levelname)s - %(message)s'
+    )
+    from app.services.manga_service import MangaTranslationService
+
+    service = MangaTranslationService(**service_kwargs)
+    report = None
+    if preload_kwargs is not None:
+        try:
+            report = service.preload(**preload_kwargs)
+        except Exception as e:
+            # Still serve; models load lazily on first use
+            logger.error(f"Model preload failed: {e}", exc_info=True)
+            report = {"ready": False, "error": str(e)}
+    conn.send(("ready", worker_index, report))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+
+        method, shm_name, shape, dtype, args, kwargs = job
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            image = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            result = getattr(service, method)(image, *args, **kwargs)
+            reply = ("ok", result)
+        except Exception as e:
+            reply = ("error", type(e).__name__, str(e), traceback.format_exc())
+        finally:
+            image = None
+            try:
+                shm.close()
+            except BufferError:
+                # A lingering view still references the mapping; it is released on GC
+                pass
+
+        conn.send(reply)
+
+    conn.close()
+
+
+class _Worker:
+    """Parent-side handle for one worker process."""
+
+    def __init__(
+        self,
+        ctx,
+        index: int,
+        service_kwargs: Dict[str, Any],
+        preload_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        self.index = index
+        self.conn, child_conn = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, index, service_kwargs, preload_kwargs),
+            name=f"model-worker-{index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs_done = 0
+        self.preload_report: Optional[Dict[str, Any]] = None
+        # Set once a replacement could not be started; the slot stays empty
+        self.failed = False
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, timeout: float = 5.0):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
+
+
+class ModelWorkerPool:
+    """
+    Pool of long-lived model worker processes.
+
+    Pages are copied once into shared memory and handed to an idle worker.
+    ``call`` blocks until the worker replies, so it is meant to run on the
+    InferenceExecutor threads. A worker that dies mid-job fails only that job
+    and is replaced with a fresh process; a slot whose replacement fails to
+    start ``REPLACEMENT_ATTEMPTS`` times is given up. Callers waiting for a
+    worker fail once the pool stops or no live or starting worker is left.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = 2,
+        poll_interval: float = 0.5,
+        service_kwargs: Optional[Dict[str, Any]] = None,
+        preload_kwargs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize worker pool.
+
+        Args:
+            num_workers: Number of worker processes (default: 2)
+            poll_interval: Seconds between liveness checks while waiting (default: 0.5)
+            service_kwargs: Keyword arguments for MangaTranslationService in workers
+            preload_kwargs: Arguments for MangaTranslationService.preload, run in
+                each worker before it accepts jobs (None = load models lazily)
+        """
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.service_kwargs = service_kwargs or {}
+        self.preload_kwargs = preload_kwargs
+
+        self._ctx = mp.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._restarts = 0
+        self.is_running = False
+
+    def start(self, ready_timeout: float = 600.0):
+        """Spawn all worker processes and wait until their services are built."""
+        if self.is_running:
+            return
+
+        for index in range(self.num_workers):
+            self._workers.append(_Worker(self._ctx, index, self.service_kwargs, self.preload_kwargs))
+
+        for worker in self._workers:
+            self._wait_ready(worker, ready_timeout)
+            self._idle.put(worker)
+
+        self.is_running = True
+        logger.info(f"ModelWorkerPool started with {self.num_workers} workers")
+
+    def stop(self):
+        """Stop all worker processes."""
+        self.is_running = False
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+        logger.info("ModelWorkerPool stopped")
+
+    def _wait_ready(self, worker: _Worker, timeout: float):
+        if not worker.conn.poll(timeout):
+            raise WorkerCrashedError(f"Worker {worker.index} did not become ready in {timeout}s")
+        message = worker.conn.recv()
+        if message[0] != "ready":
+            raise WorkerCrashedError(f"Worker {worker.index} sent unexpected message: {message!r}")
+        worker.preload_report = message[2]
+
+    def _replace(self, dead: _Worker) -> None:
+        """Replace a crashed worker with a new process."""
+        logger.error(
+            f"Worker {dead.index} (pid {dead.process.pid}) died with exit code "
+            f"{dead.process.exitcode}, restarting"
+        )
+        try:
+            dead.conn.close()
+        except OSError:
+            pass
+
+        worker = self._respawn(dead)
+        with self._lock:
+            self._restarts += 1
+
+        # Finish warm-up in the background so the failing request returns promptly
+        def warm_up():
+            nonlocal worker
+            for attempt in range(1, REPLACEMENT_ATTEMPTS + 1):
+                try:
+                    self._wait_ready(worker, 600.0)
+                except Exception as e:
+                    logger.error(
+                        f"Replacement worker {worker.index} failed to start "
+                        f"(attempt {attempt}/{REPLACEMENT_ATTEMPTS}): {e}"
+                    )
+                    worker.stop()
+                    if not self.is_running:
+                        return
+                    if attempt < REPLACEMENT_ATTEMPTS:
+                        worker = self._respawn(worker)
+                    continue
+                if self.is_running:
+                    self._idle.put(worker)
+                else:
+                    worker.stop()
+                return
+            worker.failed = True
+            logger.error(f"Giving up on worker slot {worker.index}")
+
+        threading.Thread(target=warm_up, name=f"model-worker-{worker.index}-warmup", daemon=True).start()
+
+    def _respawn(self, old: _Worker) -> _Worker:
+        """Start a new process in ``old``'s slot."""
+        worker = _Worker(self._ctx, old.index, self.service_kwargs, self.preload_kwargs)
+        with self._lock:
+            self._workers = [worker if w is old else w for w in self._workers]
+        return worker
+
+    def _acquire(self) -> _Worker:
+        """Wait for an idle worker, failing if the pool stops or has no usable worker left."""
+        while True:
+            try:
+                return self._idle.get(timeout=self.poll_interval)
+            except queue.Empty:
+                pass
+            if not self.is_running:
+                raise RuntimeError("ModelWorkerPool is not running")
+            with self._lock:
+                usable = any(not w.failed for w in self._workers)
+            if not usable:
+                raise WorkerCrashedError("No model worker is running or starting")
+
+    def call(self, method: str, image: np.ndarray, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Run a MangaTranslationService method on an idle worker.
+
+        Args:
+            method: Name of the service method (see POOLED_METHODS)
+            image: Page image as numpy array
+            *args, **kwargs: Remaining arguments for the service method
+
+        Returns:
+            The method's result dictionary
+        """
+        if method not in POOLED_METHODS:
+            raise ValueError(f"Method {method} cannot be dispatched to the worker pool")
+        if not self.is_running:
+            raise RuntimeError("ModelWorkerPool is not running")
+
+        image = np.ascontiguousarray(image)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+        try:
+            shared = np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)
+            shared[...] = image
+            del shared
+
+            worker = self._acquire()
+            try:
+                worker.conn.send((method, shm.name, image.shape, image.dtype.str, args, kwargs))
+                reply = self._wait_reply(worker)
+            except WorkerCrashedError:
+                self._replace(worker)
+                raise
+            except BaseException:
+                # Unknown state (e.g. interrupted mid-send); don't hand it out again
+                worker.process.terminate()
+                self._replace(worker)
+                raise
+            else:
+                worker.jobs_done += 1
+                self._idle.put(worker)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        if reply[0] == "ok":
+            return reply[1]
+
+        _, type_name, message, tb = reply
+        logger.debug(f"Worker traceback:\n{tb}")
+        raise WorkerJobError(f"{type_name}: {message}")
+
+    def _wait_reply(self, worker: _Worker) -> Tuple:
+        while True:
+            try:
+                if worker.conn.poll(self.poll_interval):
+                    return worker.conn.recv()
+            except (EOFError, OSError) as e:
+                raise WorkerCrashedError(f"Worker {worker.index} connection lost: {e}")
+            if not worker.is_alive():
+                raise WorkerCrashedError(
+                    f"Worker {worker.index} exited with code {worker.process.exitcode}"
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of worker liveness and job counts."""
+        with self._lock:
+            return {
+                "num_workers": self.num_workers,
+                "idle_workers": self._idle.qsize(),
+                "restarts": self._restarts,
+                "workers": [
+                    {
+                        "index": w.index,
+                        "pid": w.process.pid,
+                        "alive": w.is_alive(),
+                        "failed": w.failed,
+                        "jobs_done": w.jobs_done,
+                    }
+                    for w in self._workers
+                ],
+            }
+
+    def preload_report(self) -> Optional[Dict[str, Any]]:
+        """
+        Combined model preload report of all workers, shaped like
+        MangaTranslationService.preload's plus a "status", or None when
+        workers load models lazily.
+
+        The pool is "ready" when every worker preloaded all its models,
+        "loading" while no worker has reported yet, and "degraded" otherwise
+        (a model failed, or a replacement worker is still loading).
+        """
+        if self.preload_kwargs is None:
+            return None
+        with self._lock:
+            reports = {f"worker-{w.index}": w.preload_report for w in self._workers}
+
+        finished = [r for r in reports.values() if r is not None]
+        ready = bool(finished) and len(finished) == len(reports) and all(r["ready"] for r in finished)
+        if ready:
+            status = "ready"
+        elif not finished:
+            status = "loading"
+        else:
+            status = "degraded"
+        return {"status": status, "ready": ready, "workers": reports}
+
+
+class PooledMangaTranslationService:
+    """
+    Drop-in stand-in for MangaTranslationService that runs every pipeline
+    method on a ModelWorkerPool.
+    """
+
+    def __init__(self, pool: ModelWorkerPool):
+        self.pool = pool
+
+    def __getattr__(self, name: str) -> Callable:
+        if name not in POOLED_METHODS:
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            if args:
+                image, args = args[0], args[1:]
+            else:
+                image = kwargs.pop("image")
+            return self.pool.call(name, image, *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
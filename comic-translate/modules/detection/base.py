@@ -3,8 +3,7 @@ import numpy as np
 from typing import Optional
 
 from ..utils.textblock import TextBlock
-from .utils.geometry import does_rectangle_fit, do_rectangles_overlap, \
-    merge_overlapping_boxes
+from .utils.geometry import find_containing_rectangles, merge_overlapping_boxes
 from .utils.content import filter_and_fix_bboxes
 
 
@@ -49,59 +48,29 @@ class DetectionEngine(ABC):
         text_boxes = merge_overlapping_boxes(text_boxes)
 
         text_blocks = []
-        text_matched = [False] * len(text_boxes)  # Track matched text boxes
         
         # Set bubble_boxes to empty array if None
         if bubble_boxes is None:
             bubble_boxes = np.array([])
         
-        # Process text boxes
-        if len(text_boxes) > 0:
-            for txt_idx, txt_box in enumerate(text_boxes):
-                
-                # If no bubble boxes, all text is free text
-                if len(bubble_boxes) == 0:
-                    text_blocks.append(
-                        TextBlock(
-                            text_bbox=txt_box,
-                            text_class='text_free',
-                        )
+        # Each text box goes to the first bubble it fits in or overlaps with;
+        # without a bubble it is free text
+        bubble_ids = find_containing_rectangles(bubble_boxes, text_boxes)
+        for txt_box, bubble_id in zip(text_boxes, bubble_ids):
+            if bubble_id < 0:
+                text_blocks.append(
+                    TextBlock(
+                        text_bbox=txt_box,
+                        text_class='text_free',
                     )
-                    continue
-                
-                for bble_box in bubble_boxes:
-                    if bble_box is None:
-                        continue
-                    if does_rectangle_fit(bble_box, txt_box):
-                        # Text is inside a bubble
-                        text_blocks.append(
-                            TextBlock(
-                                text_bbox=txt_box,
-                                bubble_bbox=bble_box,
-                                text_class='text_bubble',
-                            )
-                        )
-                        text_matched[txt_idx] = True  
-                        break
-                    elif do_rectangles_overlap(bble_box, txt_box):
-                        # Text overlaps with a bubble
-                        text_blocks.append(
-                            TextBlock(
-                                text_bbox=txt_box,
-                                bubble_bbox=bble_box,
-                                text_class='text_bubble',
-                            )
-                        )
-                        text_matched[txt_idx] = True  
-                        break
-                
-                if not text_matched[txt_idx]:
-                    text_blocks.append(
-                        TextBlock(
-                            text_bbox=txt_box,
-                            text_class='text_free',
-                        )
+                )
+            else:
+                text_blocks.append(
+                    TextBlock(
+                        text_bbox=txt_box,
+                        bubble_bbox=bubble_boxes[bubble_id],
+                        text_class='text_bubble',
                     )
+                )
         
         return text_blocks
-    
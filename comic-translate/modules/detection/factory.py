@@ -1,6 +1,6 @@
 from .base import DetectionEngine
 from .rtdetr_v2_onnx import RTDetrV2ONNXDetection
-from ..utils.device import resolve_device, torch_available
+from ..utils.device import resolve_device, torch_available, int8_models_enabled
 
 
 class DetectionEngineFactory:
@@ -29,6 +29,8 @@ class DetectionEngineFactory:
         # build cache key
         device = resolve_device(settings.is_gpu_enabled(), backend)
         cache_key = f"{model_name}_{backend}_{device}"
+        if int8_models_enabled(settings, device):
+            cache_key += "_int8"
 
         # Return cached engine if available
         if cache_key in cls._engines:
@@ -58,7 +60,15 @@ class DetectionEngineFactory:
             engine.initialize(device=device)
         else:
             engine = RTDetrV2ONNXDetection()
-            engine.initialize(device=device)
+            # Cross-request micro-batching is opt-in (used by the API server)
+            batching = {}
+            if hasattr(settings, 'get_detection_batching'):
+                batching = settings.get_detection_batching() or {}
+            engine.initialize(
+                device=device,
+                quantized=int8_models_enabled(settings, device),
+                **batching
+            )
         
         return engine
     
\ No newline at end of file
@@ -56,7 +56,8 @@ class RTDetrV2Detection(DetectionEngine):
         # The slicer does not slice images below the width to height threshold
         bubble_boxes, text_boxes = self.image_slicer.process_slices_for_detection(
             image,
-            self._detect_single_image
+            self._detect_single_image,
+            batch_detect_func=self._detect_batch
         )
         return self.create_text_blocks(image, text_boxes, bubble_boxes)
     
@@ -70,11 +71,23 @@ class RTDetrV2Detection(DetectionEngine):
         Returns:
             Tuple of (bubble_boxes, text_boxes) as numpy arrays
         """
+        return self._detect_batch([image])[0]
+    
+    def _detect_batch(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Performs detection on several images in one forward pass.
+        
+        Args:
+            images: Input images (e.g. the slices of a tall page)
+            
+        Returns:
+            One (bubble_boxes, text_boxes) tuple per image
+        """
         # Convert OpenCV image (BGR) to PIL image (RGB)
-        pil_image = Image.fromarray(image)  # image is already in RGB format
+        pil_images = [Image.fromarray(image) for image in images]  # images are already in RGB format
         
-        # Prepare image for model
-        inputs = self.processor(images=pil_image, return_tensors="pt")
+        # Prepare images for model
+        inputs = self.processor(images=pil_images, return_tensors="pt")
         # Move inputs to selected device
         inputs = tensors_to_device(inputs, self.device)
 
@@ -83,30 +96,32 @@ class RTDetrV2Detection(DetectionEngine):
             outputs = self.model(**inputs)
 
         # Post-process results
-        target_sizes = torch.tensor([pil_image.size[::-1]], device=self.device)
-        results = self.processor.post_process_object_detection(
+        target_sizes = torch.tensor([img.size[::-1] for img in pil_images], device=self.device)
+        batch_results = self.processor.post_process_object_detection(
             outputs,
             target_sizes=target_sizes,
             threshold=self.confidence_threshold,
-        )[0]
+        )
 
-        # Create bounding boxes for each class
-        bubble_boxes = []
-        text_boxes = []
-        
-        for box, score, label in zip(results['boxes'], results['scores'], results['labels']):
-            box = box.tolist()
-            x1, y1, x2, y2 = map(int, box)
+        detections = []
+        for results in batch_results:
+            # Create bounding boxes for each class
+            bubble_boxes = []
+            text_boxes = []
             
-            # Class 0: bubble, Class 1: text_bubble, Class 2: text_free
-            if label.item() == 0:  # bubble
-                bubble_boxes.append([x1, y1, x2, y2])
-            elif label.item() in [1, 2]:  # text_bubble or text_free
-                text_boxes.append([x1, y1, x2, y2])
-        
-        # Convert to numpy arrays
-        bubble_boxes = np.array(bubble_boxes) if bubble_boxes else np.array([])
-        text_boxes = np.array(text_boxes) if text_boxes else np.array([])
+            for box, score, label in zip(results['boxes'], results['scores'], results['labels']):
+                box = box.tolist()
+                x1, y1, x2, y2 = map(int, box)
+                
+                # Class 0: bubble, Class 1: text_bubble, Class 2: text_free
+                if label.item() == 0:  # bubble
+                    bubble_boxes.append([x1, y1, x2, y2])
+                elif label.item() in [1, 2]:  # text_bubble or text_free
+                    text_boxes.append([x1, y1, x2, y2])
+            
+            # Convert to numpy arrays
+            bubble_boxes = np.array(bubble_boxes) if bubble_boxes else np.array([])
+            text_boxes = np.array(text_boxes) if text_boxes else np.array([])
+            detections.append((bubble_boxes, text_boxes))
         
-        return bubble_boxes, text_boxes
-    
+        return detections
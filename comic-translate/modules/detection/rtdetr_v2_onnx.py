@@ -1,8 +1,10 @@
 import os
+import threading
 import numpy as np
 from PIL import Image
-import onnxruntime as ort
-from modules.utils.device import get_providers
+from modules.utils.device import create_session
+from modules.utils.batching import MicroBatcher
+from modules.utils.download import ModelDownloader, ModelID
 from huggingface_hub import hf_hub_download
 
 from .base import DetectionEngine
@@ -18,10 +20,19 @@ class RTDetrV2ONNXDetection(DetectionEngine):
     """RT-DETR-V2 ONNX backend detection engine.
     """
 
+    # Slices of a tall page sent through the session per run
+    SLICE_BATCH_SIZE = 8
+    # Model input resolution (square)
+    INPUT_SIZE = 640
+
     def __init__(self):
         self.session = None
         self.device = 'cpu'
         self.confidence_threshold = 0.3
+        self.batcher = None
+        self.io_binding = False
+        # Per-thread reusable (N,3,640,640) input tensors
+        self._buffers = threading.local()
         self.repo_name = 'ogkalu/comic-text-and-bubble-detector'
         self.model_dir = os.path.join(project_root, 'models', 'detection')
 
@@ -36,50 +47,136 @@ class RTDetrV2ONNXDetection(DetectionEngine):
         self, 
         device: str = 'cpu', 
         confidence_threshold: float = 0.3, 
+        max_batch_size: int = 1,
+        max_wait_ms: float = 5.0,
+        io_binding: bool = False,
+        quantized: bool = False,
     ) -> None:
+        """Load the ONNX session.
+
+        Args:
+            device: Device to run on.
+            confidence_threshold: Minimum score for a detection to be kept.
+            max_batch_size: When > 1, concurrent ``detect`` calls are grouped
+                into batched session runs of up to this many images.
+            max_wait_ms: How long the first queued image waits for others
+                before a batch is run.
+            io_binding: Bind the preallocated input and the outputs with
+                ONNX Runtime IO binding instead of passing arrays to ``run``.
+            quantized: Load the locally generated INT8 variant (CPU only).
+        """
         
         self.device = device
         self.confidence_threshold = confidence_threshold
+        self.io_binding = io_binding
 
         os.makedirs(self.model_dir, exist_ok=True)
         hf_hub_download(repo_id=self.repo_name, filename='config.json')
-        file_path = hf_hub_download(repo_id=self.repo_name, filename='detector.onnx')
-        providers = get_providers(self.device)
-        self.session = ort.InferenceSession(file_path, providers=providers)
+        # Both variants come from ModelDownloader, so the INT8 model is built
+        # from the same detector.onnx the FP32 path loads
+        model_id = ModelID.RTDETRV2_ONNX_INT8 if quantized else ModelID.RTDETRV2_ONNX
+        file_path = ModelDownloader.primary_path(model_id)
+        self.session = create_session(file_path, self.device)
+
+        if self.batcher is not None:
+            self.batcher.close()
+            self.batcher = None
+        if max_batch_size > 1 and self._supports_batching():
+            self.batcher = MicroBatcher(
+                self._run_batch,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                name='rtdetr-batcher',
+            )
+
+    def _supports_batching(self) -> bool:
+        """True if the model's batch dimension is dynamic."""
+        batch_dim = self.session.get_inputs()[0].shape[0]
+        return not isinstance(batch_dim, int) or batch_dim != 1
 
     def detect(self, image: np.ndarray) -> list[TextBlock]:
         bubble_boxes, text_boxes = self.image_slicer.process_slices_for_detection(
-            image, self._detect_single_image
+            image, self._detect_single_image, batch_detect_func=self._detect_batch
         )
         return self.create_text_blocks(image, text_boxes, bubble_boxes)
 
-    def _detect_single_image(self, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-        pil_image = Image.fromarray(image)  # image is already in RGB format
+    def _preprocess(self, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (640,640,3) uint8 resized image and the original [w, h].
 
-        # preprocess to (1,3,H,W) float32
-        im_resized = pil_image.resize((640, 640))
-        arr = np.asarray(im_resized, dtype=np.float32) / 255.0  # (H,W,3)
-        arr = np.transpose(arr, (2, 0, 1))  # (3,H,W)
-        im_data = arr[np.newaxis, ...]  # (1,3,H,W)
+        Normalisation and the CHW layout are applied when the image is written
+        into the session's input buffer (see ``_fill_input``).
+        """
+        pil_image = Image.fromarray(image)  # image is already in RGB format
+        im_resized = np.asarray(pil_image.resize((self.INPUT_SIZE, self.INPUT_SIZE)))
 
         w, h = pil_image.size
-        orig_size = np.array([[w, h]], dtype=np.int64)
-
-        outputs = self.session.run(None, {
-            "images": im_data,
-            "orig_target_sizes": orig_size
-        })
-
-        # expected outputs: labels, boxes, scores
+        return im_resized, np.array([w, h], dtype=np.int64)
+
+    def _input_buffer(self, batch_size: int) -> np.ndarray:
+        """Reusable float32 (N,3,H,W) tensor owned by the calling thread."""
+        buffer = getattr(self._buffers, 'images', None)
+        if buffer is None or len(buffer) < batch_size:
+            buffer = np.empty((batch_size, 3, self.INPUT_SIZE, self.INPUT_SIZE), dtype=np.float32)
+            self._buffers.images = buffer
+        return buffer[:batch_size]
+
+    @staticmethod
+    def _fill_input(out: np.ndarray, resized: np.ndarray) -> None:
+        """Write an HWC uint8 image into a CHW float32 slot scaled to [0, 1]."""
+        np.divide(resized.transpose(2, 0, 1), np.float32(255.0), out=out, dtype=np.float32)
+
+    def _run_batch(self, items: list[tuple[np.ndarray, np.ndarray]]) -> list[tuple]:
+        """Run one session call for N preprocessed inputs; return per-image outputs."""
+        im_data = self._input_buffer(len(items))  # (N,3,H,W)
+        for slot, (resized, _) in zip(im_data, items):
+            self._fill_input(slot, resized)
+        orig_size = np.stack([size for _, size in items])  # (N,2)
+
+        if self.io_binding:
+            outputs = self._run_with_io_binding(im_data, orig_size)
+        else:
+            outputs = self.session.run(None, {
+                "images": im_data,
+                "orig_target_sizes": orig_size
+            })
+
+        # expected outputs: labels, boxes, scores (each with a leading batch dim)
         labels, boxes, scores = outputs[:3]
+        if len(items) == 1 and np.ndim(labels) == 1:
+            # Some exports drop the batch dim for single inputs
+            return [(labels, boxes, scores)]
+        return [(labels[i], boxes[i], scores[i]) for i in range(len(items))]
+
+    def _run_with_io_binding(self, im_data: np.ndarray, orig_size: np.ndarray) -> list[np.ndarray]:
+        """Run the session reading the input buffer in place through IO binding."""
+        binding = self.session.io_binding()
+        binding.bind_cpu_input("images", im_data)
+        binding.bind_cpu_input("orig_target_sizes", orig_size)
+        for output in self.session.get_outputs():
+            binding.bind_output(output.name, 'cpu')
+        self.session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()
 
-        if isinstance(labels, np.ndarray) and labels.ndim == 2 and labels.shape[0] == 1:
-            labels = labels[0]
-        if isinstance(scores, np.ndarray) and scores.ndim == 2 and scores.shape[0] == 1:
-            scores = scores[0]
-        if isinstance(boxes, np.ndarray) and boxes.ndim == 3 and boxes.shape[0] == 1:
-            boxes = boxes[0]
-
+    def _detect_single_image(self, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        item = self._preprocess(image)
+        if self.batcher is not None:
+            labels, boxes, scores = self.batcher.submit(item)
+        else:
+            labels, boxes, scores = self._run_batch([item])[0]
+        return self._postprocess(labels, boxes, scores)
+
+    def _detect_batch(self, images: list[np.ndarray]) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Detect several images (e.g. slices of one page) in as few session runs as possible."""
+        if not self._supports_batching():
+            return [self._detect_single_image(image) for image in images]
+
+        outputs = []
+        for start in range(0, len(images), self.SLICE_BATCH_SIZE):
+            items = [self._preprocess(image) for image in images[start:start + self.SLICE_BATCH_SIZE]]
+            outputs.extend(self._run_batch(items))
+        return [self._postprocess(*output) for output in outputs]
+
+    def _postprocess(self, labels, boxes, scores) -> tuple[np.ndarray, np.ndarray]:
         bubble_boxes = []
         text_boxes = []
         for lab, box, scr in zip(labels, boxes, scores):
@@ -0,0 +1,236 @@
+"""
+Benchmark for detection post-processing.
+
+Compares the vectorized merge and bubble-matching routines against the
+original pairwise loops on random box sets and checks that both produce
+identical output.
+
+Run from the project root:
+    python -m modules.detection.utils.benchmark
+"""
+import argparse
+import time
+
+import numpy as np
+
+from .geometry import (
+    merge_overlapping_boxes,
+    find_containing_rectangles,
+    does_rectangle_fit,
+    is_mostly_contained,
+    do_rectangles_overlap,
+    merge_boxes,
+    calculate_iou,
+)
+from .slicer import ImageSlicer
+
+DEFAULT_SIZES = (10, 50, 100, 500, 1000, 2000)
+
+
+def reference_merge_overlapping_boxes(
+    bboxes: np.ndarray,
+    containment_threshold: float = 0.3,
+    overlap_threshold: float = 0.5,
+) -> np.ndarray:
+    """Pairwise-loop version of ``geometry.merge_overlapping_boxes``."""
+    accepted = []
+
+    for i, box in enumerate(bboxes):
+        merged = box.copy()
+        for j, other in enumerate(bboxes):
+            if i == j:
+                continue
+            if (is_mostly_contained(merged, other, containment_threshold)
+             or is_mostly_contained(other, merged, containment_threshold)):
+                merged = merge_boxes(merged, other)
+
+        conflict = False
+        for acc in accepted:
+            if np.array_equal(merged, acc) or do_rectangles_overlap(merged, acc, overlap_threshold):
+                conflict = True
+                break
+
+        if conflict:
+            continue
+
+        accepted = [
+            acc for acc in accepted
+            if not (np.array_equal(acc, merged)
+                    or do_rectangles_overlap(merged, acc, overlap_threshold))
+        ]
+        accepted.append(merged)
+
+    return np.array(accepted)
+
+
+def reference_slicer_merge(
+    slicer: ImageSlicer,
+    boxes: np.ndarray,
+    class_ids: np.ndarray = None,
+    image_height: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pairwise-loop version of ``ImageSlicer.merge_overlapping_boxes``."""
+    if boxes.size == 0:
+        return boxes, np.array([]) if class_ids is not None else boxes
+
+    box_list = boxes.tolist()
+    class_list = class_ids.tolist() if class_ids is not None else [0] * len(box_list)
+    y_distance_threshold = slicer.merge_y_distance_threshold * image_height
+
+    i = 0
+    while i < len(box_list) - 1:
+        j = i + 1
+        while j < len(box_list):
+            if class_ids is not None and class_list[i] != class_list[j]:
+                j += 1
+                continue
+
+            box1 = box_list[i]
+            box2 = box_list[j]
+            iou = calculate_iou(box1, box2)
+
+            box1_width = box1[2] - box1[0]
+            box1_height = box1[3] - box1[1]
+            box2_width = box2[2] - box2[0]
+            box2_height = box2[3] - box2[1]
+            box1_area = box1_width * box1_height
+            box2_area = box2_width * box2_height
+
+            is_contained, _, which_contains = slicer.box_contained(box1, box2)
+            if is_contained:
+                if which_contains != 1:
+                    box_list[i] = box2
+                box_list.pop(j)
+                class_list.pop(j)
+                continue
+
+            if iou >= slicer.duplicate_iou_threshold:
+                if box2_area > box1_area:
+                    box_list[i] = box2
+                box_list.pop(j)
+                class_list.pop(j)
+                continue
+
+            y_dist = min(abs(box1[1] - box2[3]), abs(box1[3] - box2[1]))
+            local_y_threshold = min(y_distance_threshold, max(box1_height, box2_height) * 0.1)
+            x_overlap = max(0, min(box1[2], box2[2]) - max(box1[0], box2[0]))
+            x_overlap_ratio = x_overlap / min(box1_width, box2_width) if min(box1_width, box2_width) > 0 else 0
+            size_ratio = min(box1_area, box2_area) / max(box1_area, box2_area) if max(box1_area, box2_area) > 0 else 0
+
+            if (y_dist < local_y_threshold and
+                x_overlap_ratio > slicer.merge_iou_threshold and
+                size_ratio > 0.3 and
+                abs(box1[0] - box2[0]) < 0.5 * max(box1_width, box2_width) and
+                abs(box1[2] - box2[2]) < 0.5 * max(box1_width, box2_width)):
+
+                merged_box = [
+                    min(box1[0], box2[0]),
+                    min(box1[1], box2[1]),
+                    max(box1[2], box2[2]),
+                    max(box1[3], box2[3])
+                ]
+                merged_area = (merged_box[2] - merged_box[0]) * (merged_box[3] - merged_box[1])
+                if merged_area > 3 * max(box1_area, box2_area):
+                    j += 1
+                    continue
+
+                box_list[i] = merged_box
+                box_list.pop(j)
+                class_list.pop(j)
+            else:
+                j += 1
+        i += 1
+
+    merged_boxes = np.array(box_list)
+    merged_class_ids = np.array(class_list) if class_ids is not None else None
+    return merged_boxes, merged_class_ids
+
+
+def reference_find_containing_rectangles(containers: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Pairwise-loop bubble matching as done in ``DetectionEngine.create_text_blocks``."""
+    matches = []
+    for box in boxes:
+        match = -1
+        for idx, container in enumerate(containers):
+            if does_rectangle_fit(container, box) or do_rectangles_overlap(container, box):
+                match = idx
+                break
+        matches.append(match)
+    return np.array(matches, dtype=np.intp)
+
+
+def random_boxes(n: int, rng: np.random.Generator, width: int = 1200,
+                 height: int = 6000, max_size: int = 200) -> np.ndarray:
+    """Random integer boxes in a tall page, dense enough to overlap often."""
+    x1 = rng.integers(0, width - max_size, n)
+    y1 = rng.integers(0, height - max_size, n)
+    w = rng.integers(8, max_size, n)
+    h = rng.integers(8, max_size, n)
+    return np.stack([x1, y1, x1 + w, y1 + h], axis=1)
+
+
+def _time(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _check(name: str, n: int, expected, actual) -> None:
+    expected = expected if isinstance(expected, tuple) else (expected,)
+    actual = actual if isinstance(actual, tuple) else (actual,)
+    for exp, act in zip(expected, actual):
+        if exp is None and act is None:
+            continue
+        if exp.dtype != act.dtype or not np.array_equal(exp, act):
+            raise AssertionError(f"{name}: vectorized output differs from reference for n={n}")
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 3, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    slicer = ImageSlicer()
+
+    print(f"{'function':<34}{'n':>6}{'reference (ms)':>16}{'vectorized (ms)':>17}{'speedup':>9}")
+    for n in sizes:
+        boxes = random_boxes(n, rng)
+        class_ids = rng.integers(0, 2, n)
+        bubbles = random_boxes(max(1, n // 4), rng, max_size=400)
+        image_height = int(boxes[:, 3].max())
+
+        cases = [
+            (
+                "geometry.merge_overlapping_boxes",
+                lambda: reference_merge_overlapping_boxes(boxes),
+                lambda: merge_overlapping_boxes(boxes),
+            ),
+            (
+                "ImageSlicer.merge_overlapping_boxes",
+                lambda: reference_slicer_merge(slicer, boxes, class_ids, image_height),
+                lambda: slicer.merge_overlapping_boxes(boxes, class_ids, image_height),
+            ),
+            (
+                "find_containing_rectangles",
+                lambda: reference_find_containing_rectangles(bubbles, boxes),
+                lambda: find_containing_rectangles(bubbles, boxes),
+            ),
+        ]
+        for name, reference, vectorized in cases:
+            _check(name, n, reference(), vectorized())
+            ref_time = _time(reference, repeat)
+            vec_time = _time(vectorized, repeat)
+            print(f"{name:<34}{n:>6}{ref_time * 1000:>16.2f}{vec_time * 1000:>17.2f}{ref_time / vec_time:>8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark detection box merging")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -134,6 +134,119 @@ def merge_boxes(box1: list[float], box2: list[float]) -> list[float]:
     ]
 
 
+def pairwise_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``calculate_iou`` of one box against many.
+    
+    Args:
+        box: Box as [x1, y1, x2, y2]
+        boxes: Array of boxes with shape (N, 4)
+    
+    Returns:
+        Array of N IoU values
+    """
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    
+    intersection_area = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    
+    box_area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    
+    union_area = box_area + areas - intersection_area
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(union_area != 0, intersection_area / union_area, 0)
+
+
+def find_containing_rectangles(
+    containers: np.ndarray, 
+    boxes: np.ndarray, 
+    iou_threshold: float = 0.2, 
+    chunk_size: int = 256
+) -> np.ndarray:
+    """
+    For each box, find the first container it fits in or overlaps with.
+    
+    Vectorized equivalent of scanning ``containers`` in order with
+    ``does_rectangle_fit(container, box) or do_rectangles_overlap(container, box)``.
+    
+    Args:
+        containers: Array of rectangles with shape (M, 4), e.g. bubbles
+        boxes: Array of rectangles with shape (N, 4), e.g. text boxes
+        iou_threshold: Minimum IoU to consider as overlap
+        chunk_size: Number of boxes compared against all containers at once
+    
+    Returns:
+        Array of N container indices, -1 where no container matches
+    """
+    boxes = np.asarray(boxes)
+    containers = np.asarray(containers)
+    matches = np.full(len(boxes), -1, dtype=np.intp)
+    if len(boxes) == 0 or len(containers) == 0:
+        return matches
+    
+    # Ensure the coordinates are properly ordered
+    c_left = np.minimum(containers[:, 0], containers[:, 2])
+    c_top = np.minimum(containers[:, 1], containers[:, 3])
+    c_right = np.maximum(containers[:, 0], containers[:, 2])
+    c_bottom = np.maximum(containers[:, 1], containers[:, 3])
+    c_area = (containers[:, 2] - containers[:, 0]) * (containers[:, 3] - containers[:, 1])
+    
+    for start in range(0, len(boxes), chunk_size):
+        chunk = boxes[start:start + chunk_size, None, :]
+        left = np.minimum(chunk[..., 0], chunk[..., 2])
+        top = np.minimum(chunk[..., 1], chunk[..., 3])
+        right = np.maximum(chunk[..., 0], chunk[..., 2])
+        bottom = np.maximum(chunk[..., 1], chunk[..., 3])
+        fits = (c_left <= left) & (c_right >= right) & (c_top <= top) & (c_bottom >= bottom)
+        
+        intersection_area = (
+            np.maximum(0, np.minimum(containers[:, 2], chunk[..., 2]) - np.maximum(containers[:, 0], chunk[..., 0])) *
+            np.maximum(0, np.minimum(containers[:, 3], chunk[..., 3]) - np.maximum(containers[:, 1], chunk[..., 1]))
+        )
+        box_area = (chunk[..., 2] - chunk[..., 0]) * (chunk[..., 3] - chunk[..., 1])
+        union_area = c_area + box_area - intersection_area
+        with np.errstate(divide='ignore', invalid='ignore'):
+            iou = np.where(union_area != 0, intersection_area / union_area, 0)
+        
+        hits = fits | (iou >= iou_threshold)
+        first = np.argmax(hits, axis=1)
+        matches[start:start + len(first)] = np.where(hits.any(axis=1), first, -1)
+    
+    return matches
+
+
+# Number of boxes tested per step when growing a box in merge_overlapping_boxes
+_MERGE_SCAN_WINDOW = 128
+
+
+def _containment_hits(
+    box: np.ndarray, 
+    others: np.ndarray, 
+    other_areas: np.ndarray, 
+    threshold: float
+) -> np.ndarray:
+    """
+    Vectorized ``is_mostly_contained(box, other) or is_mostly_contained(other, box)``.
+    """
+    box_area = (box[2] - box[0]) * (box[3] - box[1])
+    intersection_area = (
+        np.maximum(0, np.minimum(others[:, 2], box[2]) - np.maximum(others[:, 0], box[0])) *
+        np.maximum(0, np.minimum(others[:, 3], box[3]) - np.maximum(others[:, 1], box[1]))
+    )
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # other inside box
+        hits = (box_area >= other_areas) & (other_areas != 0) & (intersection_area / other_areas >= threshold)
+        # box inside other
+        if box_area != 0:
+            hits |= (other_areas >= box_area) & (intersection_area / box_area >= threshold)
+    return hits
+
+
 def merge_overlapping_boxes(
     bboxes: np.ndarray,
     containment_threshold: float = 0.3,
@@ -143,6 +256,11 @@ def merge_overlapping_boxes(
     Merge boxes that are mostly contained within each other, and
     prune out duplicates/overlaps immediately as you go.
     
+    Each box is grown by absorbing, in order, every other box that is mostly
+    contained in it (or contains it). The scan is vectorized: the current box
+    is tested against all remaining boxes at once and only the first hit is
+    merged before testing again, so results match the pairwise definition.
+    
     Args:
         bboxes: Array of bounding boxes
         containment_threshold: Threshold for containment-based merging
@@ -151,40 +269,52 @@ def merge_overlapping_boxes(
     Returns:
         Array of merged and filtered bounding boxes
     """
-    accepted = []
+    bboxes = np.asarray(bboxes)
+    if len(bboxes) == 0:
+        return np.array([])
+    
+    n = len(bboxes)
+    indices = np.arange(n)
+    areas = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+    accepted = np.empty((n, 4), dtype=bboxes.dtype)
+    num_accepted = 0
 
-    for i, box in enumerate(bboxes):
-        # 1) Merge this box against all others based on containment:
-        merged = box.copy()
-        for j, other in enumerate(bboxes):
-            if i == j:
+    for i in range(n):
+        # 1) Merge this box against all others based on containment
+        merged = bboxes[i].copy()
+        others = bboxes[indices != i]
+        other_areas = areas[indices != i]
+        start = 0
+        while start < len(others):
+            # Test a window of boxes at a time; dense pages merge often and
+            # everything past the first hit has to be re-tested anyway.
+            stop = start + _MERGE_SCAN_WINDOW
+            rest = others[start:stop]
+            hits = _containment_hits(merged, rest, other_areas[start:stop], containment_threshold)
+            first = np.flatnonzero(hits)
+            if first.size == 0:
+                start += len(rest)
                 continue
-            if (is_mostly_contained(merged, other, containment_threshold)
-             or is_mostly_contained(other, merged, containment_threshold)):
-                merged = merge_boxes(merged, other)
-
-        # 2) On-the-fly pruning: see if `merged` overlaps or duplicates any accepted box
-        conflict = False
-        for acc in accepted:
-            if np.array_equal(merged, acc) or do_rectangles_overlap(merged, acc, overlap_threshold):
-                conflict = True
-                break
+            k = start + first[0]
+            merged = np.concatenate([
+                np.minimum(merged[:2], others[k, :2]),
+                np.maximum(merged[2:], others[k, 2:])
+            ])
+            start = k + 1
 
-        if conflict:
-            # skip this one entirely
-            continue
-
-        # 3) Optionally, remove any already-accepted boxes that overlap too much with the new merged box
-        accepted = [
-            acc for acc in accepted
-            if not (np.array_equal(acc, merged)
-                    or do_rectangles_overlap(merged, acc, overlap_threshold))
-        ]
+        # 2) On-the-fly pruning: skip `merged` if it duplicates or overlaps an accepted box.
+        # (No accepted box needs removing afterwards: it would have been a conflict here.)
+        if num_accepted:
+            current = accepted[:num_accepted]
+            duplicate = np.all(current == merged, axis=1)
+            if np.any(duplicate | (pairwise_iou(merged, current) >= overlap_threshold)):
+                continue
 
-        # 4) Finally accept the new box
-        accepted.append(merged)
+        # 3) Accept the new box
+        accepted[num_accepted] = merged
+        num_accepted += 1
 
-    return np.array(accepted)
+    return accepted[:num_accepted].copy()
 
 
 def calculate_polygon_angle(polygon_points: list[list[float]]) -> float:
@@ -1,7 +1,7 @@
 import math
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Any
-from .geometry import calculate_iou
 
 
 class ImageSlicer:
@@ -9,6 +9,15 @@ class ImageSlicer:
     Utility class to handle slicing extremely tall images (Webtoons) for object detection and recombining results.
     """
     
+    # Outcomes of comparing two boxes in merge_overlapping_boxes
+    _KEEP_NONE = 0      # boxes are unrelated
+    _KEEP_FIRST = 1     # second box is dropped
+    _KEEP_SECOND = 2    # first box is replaced by the second
+    _KEEP_MERGED = 3    # first box is replaced by the union of both
+    
+    # Pairwise comparisons evaluated at once when merging boxes
+    MERGE_BLOCK_ELEMENTS = 1 << 16
+    
     def __init__(self, 
                  height_to_width_ratio_threshold: float = 3.5,
                  target_slice_ratio: float = 3.0,
@@ -163,6 +172,11 @@ class ImageSlicer:
         Merge boxes that are likely part of the same object across slices and
         remove duplicate detections from overlapping slices.
         
+        Boxes are visited in order and compared against all later boxes at
+        once. Later boxes are absorbed in order; whenever that changes the
+        current box, the boxes after it are compared again. This gives the
+        same result as checking pairs one by one.
+        
         Args:
             boxes: Array of boxes in format [x1, y1, x2, y2]
             class_ids: Array of class IDs corresponding to each box
@@ -174,136 +188,188 @@ class ImageSlicer:
         if boxes.size == 0:
             return boxes, np.array([]) if class_ids is not None else boxes
             
-        # Convert to list for easier manipulation
-        box_list = boxes.tolist()
-        class_list = class_ids.tolist() if class_ids is not None else [0] * len(box_list)
+        # Python-list semantics of the original values (ints stay ints)
+        out_dtype = np.array(boxes.tolist()).dtype
+        work = np.asarray(boxes, dtype=np.float64)
+        classes = np.asarray(class_ids) if class_ids is not None else None
+        n = len(work)
         
         # Calculate a global distance threshold in pixels based on full image height.
         # We'll still cap this per pair to avoid merging far apart boxes on very tall images.
         y_distance_threshold = self.merge_y_distance_threshold * image_height
         
-        i = 0
-        while i < len(box_list) - 1:
-            j = i + 1
-            while j < len(box_list):
-                # Only merge boxes with same class ID if class_ids is provided
-                if class_ids is not None and class_list[i] != class_list[j]:
-                    j += 1
-                    continue
-                    
-                box1 = box_list[i]
-                box2 = box_list[j]
-                
-                # Calculate IoU to identify duplicates or highly overlapping boxes
-                iou = calculate_iou(box1, box2)
-                
-                # Calculate box dimensions
-                box1_width = box1[2] - box1[0]
-                box1_height = box1[3] - box1[1]
-                box2_width = box2[2] - box2[0]
-                box2_height = box2[3] - box2[1]
-                box1_area = box1_width * box1_height
-                box2_area = box2_width * box2_height
-                
-                # Check for containment (one box mostly inside another)
-                is_contained, containment_ratio, which_contains = self.box_contained(box1, box2)
-                
-                # Case 1: One box is mostly contained within the other
-                if is_contained:
-                    # Keep the larger box
-                    if which_contains == 1:  # box1 contains box2
-                        # Remove box2
-                        box_list.pop(j)
-                        if class_ids is not None:
-                            class_list.pop(j)
-                    else:  # box2 contains box1
-                        # Replace box1 with box2 and remove box2
-                        box_list[i] = box2
-                        box_list.pop(j)
-                        if class_ids is not None:
-                            class_list.pop(j)
-                    continue
-                
-                # Case 2: High IoU - likely the same object detected twice (duplicate)
-                if iou >= self.duplicate_iou_threshold:
-                    # Choose the larger box (which often has better coverage of the object)
-                    if box2_area > box1_area:
-                        box_list[i] = box2  # Keep the larger box
-                    
-                    # Remove the duplicate
-                    box_list.pop(j)
-                    if class_ids is not None:
-                        class_list.pop(j)
+        alive = np.ones(n, dtype=bool)
+        result = work.copy()
+        same_class = np.ones(n, dtype=bool)
+        
+        # Evaluate the original boxes against each other a block of rows at a time
+        block_rows = max(1, self.MERGE_BLOCK_ELEMENTS // n)
+        for block_start in range(0, n - 1, block_rows):
+            block_stop = min(block_start + block_rows, n - 1)
+            rows = np.flatnonzero(alive[block_start:block_stop]) + block_start
+            if rows.size == 0:
+                continue
+            block_cols = np.flatnonzero(alive[block_start + 1:]) + block_start + 1
+            block_actions, block_merged = self._merge_actions(
+                work[rows], work[block_cols], y_distance_threshold
+            )
+            
+            for row, i in enumerate(rows):
+                if not alive[i]:
                     continue
+                # Only merge boxes with same class ID if class_ids is provided
+                if classes is not None:
+                    same_class = classes == classes[i]
                 
-                # Calculate vertical distance between boxes
-                y_dist = min(abs(box1[1] - box2[3]), abs(box1[3] - box2[1]))
-
-                # Cap the allowable vertical gap using the local box heights so that
-                # boxes from very tall images do not merge into a single huge region.
-                local_y_threshold = min(
-                    y_distance_threshold,
-                    max(box1_height, box2_height) * 0.1
-                )
-                
-                # Calculate horizontal overlap
-                x_overlap = max(0, min(box1[2], box2[2]) - max(box1[0], box2[0]))
-                x_overlap_ratio = x_overlap / min(box1_width, box2_width) if min(box1_width, box2_width) > 0 else 0
-                
-                # Calculate size ratio to prevent merging very different sized boxes
-                size_ratio = min(box1_area, box2_area) / max(box1_area, box2_area) if max(box1_area, box2_area) > 0 else 0
-                
-                # Case 3: Boxes likely part of the same object across slices
-                # More strict conditions to prevent over-merging
-                if (y_dist < local_y_threshold and  # Close vertically
-                    x_overlap_ratio > self.merge_iou_threshold and  # Sufficient horizontal overlap
-                    size_ratio > 0.3 and  # Similar size (prevent merging very different sized boxes)
-                    # Check that boxes are not too far apart horizontally
-                    abs(box1[0] - box2[0]) < 0.5 * max(box1_width, box2_width) and
-                    abs(box1[2] - box2[2]) < 0.5 * max(box1_width, box2_width)):
-                    
-                    # Merge the boxes
-                    merged_box = [
-                        min(box1[0], box2[0]),
-                        min(box1[1], box2[1]),
-                        max(box1[2], box2[2]),
-                        max(box1[3], box2[3])
-                    ]
-                    
-                    # Additional check: Don't allow merged boxes to get too large
-                    merged_width = merged_box[2] - merged_box[0]
-                    merged_height = merged_box[3] - merged_box[1]
-                    merged_area = merged_width * merged_height
-                    
-                    # If merged box is more than 3x larger than either original box, don't merge
-                    if merged_area > 3 * max(box1_area, box2_area):
-                        j += 1
-                        continue
-                        
-                    box_list[i] = merged_box
-                    box_list.pop(j)
-                    if class_ids is not None:
-                        class_list.pop(j)
-                else:
-                    j += 1
-            i += 1
-            
-        merged_boxes = np.array(box_list)
-        merged_class_ids = np.array(class_list) if class_ids is not None else None
+                box1 = work[i]
+                first = np.searchsorted(block_cols, i + 1)
+                cols = block_cols[first:]
+                actions = block_actions[row, first:]
+                merged = block_merged[row, first:]
+                while cols.size:
+                    changed = False
+                    for k in np.flatnonzero((actions != self._KEEP_NONE) & alive[cols] & same_class[cols]):
+                        alive[cols[k]] = False
+                        action = actions[k]
+                        if action == self._KEEP_FIRST:
+                            continue
+                        box1 = work[cols[k]] if action == self._KEEP_SECOND else merged[k]
+                        changed = True
+                        break
+                    if not changed:
+                        break
+                    # box1 changed: re-evaluate the boxes after the absorbed one
+                    cols = cols[k + 1:]
+                    cols = cols[alive[cols] & same_class[cols]]
+                    actions, merged = self._merge_actions(box1, work[cols], y_distance_threshold)
+                result[i] = box1
+        
+        merged_boxes = result[alive].astype(out_dtype)
+        merged_class_ids = np.array(np.asarray(class_ids)[alive].tolist()) if class_ids is not None else None
         
         return merged_boxes, merged_class_ids
     
+    def _merge_actions(self, box1: np.ndarray, others: np.ndarray,
+                       y_distance_threshold: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Decide what happens when box1 meets each box in ``others``.
+        
+        Args:
+            box1: One box [x1, y1, x2, y2], or an (M, 4) array of boxes
+            others: Array of boxes with shape (N, 4)
+            y_distance_threshold: Global vertical distance threshold in pixels
+            
+        Returns:
+            Tuple of (action codes with shape (N,) or (M, N), merged boxes
+            with shape (N, 4) or (M, N, 4))
+        """
+        # Broadcast box1 against others: (..., 1) against (N,)
+        box1 = box1[..., None, :]
+        box1_width = box1[..., 2] - box1[..., 0]
+        box1_height = box1[..., 3] - box1[..., 1]
+        box1_area = box1_width * box1_height
+        
+        widths = others[:, 2] - others[:, 0]
+        heights = others[:, 3] - others[:, 1]
+        areas = widths * heights
+        
+        # Intersection (shared by containment and IoU)
+        inter_x1 = np.maximum(box1[..., 0], others[:, 0])
+        inter_y1 = np.maximum(box1[..., 1], others[:, 1])
+        inter_x2 = np.minimum(box1[..., 2], others[:, 2])
+        inter_y2 = np.minimum(box1[..., 3], others[:, 3])
+        intersects = (inter_x2 > inter_x1) & (inter_y2 > inter_y1)
+        intersection = np.maximum(0, inter_x2 - inter_x1) * np.maximum(0, inter_y2 - inter_y1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Case 1: One box is mostly contained within the other
+            containment_ratio = intersection / np.minimum(box1_area, areas)
+            contained = intersects & (containment_ratio >= self.containment_threshold)
+            
+            # Case 2: High IoU - likely the same object detected twice (duplicate)
+            union = box1_area + areas - intersection
+            iou = np.where(union != 0, intersection / union, 0)
+            duplicate = iou >= self.duplicate_iou_threshold
+            
+            # Case 3: Boxes likely part of the same object across slices
+            y_dist = np.minimum(np.abs(box1[..., 1] - others[:, 3]), np.abs(box1[..., 3] - others[:, 1]))
+            local_y_threshold = np.minimum(y_distance_threshold, np.maximum(box1_height, heights) * 0.1)
+            
+            min_width = np.minimum(box1_width, widths)
+            x_overlap_ratio = np.where(min_width > 0, np.maximum(0, inter_x2 - inter_x1) / min_width, 0)
+            
+            max_area = np.maximum(box1_area, areas)
+            size_ratio = np.where(max_area > 0, np.minimum(box1_area, areas) / max_area, 0)
+        
+        max_width = np.maximum(box1_width, widths)
+        merged = np.stack([
+            np.minimum(box1[..., 0], others[:, 0]),
+            np.minimum(box1[..., 1], others[:, 1]),
+            np.maximum(box1[..., 2], others[:, 2]),
+            np.maximum(box1[..., 3], others[:, 3]),
+        ], axis=-1)
+        merged_area = (merged[..., 2] - merged[..., 0]) * (merged[..., 3] - merged[..., 1])
+        mergeable = (
+            (y_dist < local_y_threshold) &
+            (x_overlap_ratio > self.merge_iou_threshold) &
+            (size_ratio > 0.3) &
+            (np.abs(box1[..., 0] - others[:, 0]) < 0.5 * max_width) &
+            (np.abs(box1[..., 2] - others[:, 2]) < 0.5 * max_width) &
+            # Don't allow merged boxes to get more than 3x larger than either original box
+            (merged_area <= 3 * max_area)
+        )
+        
+        # Checked in order of priority: containment keeps the larger box, duplicates
+        # keep box1 unless box2 is larger, mergeable boxes are replaced by their union
+        actions = np.full(intersection.shape, self._KEEP_NONE, dtype=np.int8)
+        actions[mergeable] = self._KEEP_MERGED
+        actions[duplicate] = np.where(areas > box1_area, self._KEEP_SECOND, self._KEEP_FIRST)[duplicate]
+        actions[contained] = np.where(box1_area > areas, self._KEEP_FIRST, self._KEEP_SECOND)[contained]
+        return actions, merged
+    
+    def get_slices(self, image: np.ndarray) -> list[tuple[np.ndarray, int]]:
+        """
+        Cut the image into all of its detection slices up front.
+        
+        Args:
+            image: Input image as numpy array
+            
+        Returns:
+            List of (slice image, start_y) in top-to-bottom order
+        """
+        height = image.shape[0]
+        _, slice_height, effective_slice_height, _ = self.calculate_slice_params(image)
+        num_slices = math.ceil(height / effective_slice_height)
+        
+        slices = []
+        for slice_number in range(num_slices):
+            slice_img, start_y, _ = self.get_slice(
+                image, slice_number, effective_slice_height, slice_height
+            )
+            slices.append((slice_img, start_y))
+        return slices
+    
     def process_slices_for_detection(self, 
                                     image: np.ndarray, 
-                                    detect_func: Callable) -> Any:
+                                    detect_func: Callable,
+                                    batch_detect_func: Callable = None,
+                                    max_workers: int = 1) -> Any:
         """
         Process an image by slicing it and running detection on each slice.
         Flexible implementation that adapts to the return type of the detect_func.
         
+        All slices are built first and each is detected exactly once, either
+        in one call to ``batch_detect_func``, on a bounded thread pool, or
+        sequentially. Results are merged once at the end.
+        
         Args:
             image: Input image as numpy array
             detect_func: Function that performs detection on a slice
                         Can return different types based on detector implementation
+            batch_detect_func: Optional function taking a list of slices and
+                        returning one detect_func-style result per slice
+            max_workers: Threads used to run detect_func when no batch
+                        function is given (1 = sequential)
             
         Returns:
             Detection results combined from all slices, matching the return type of detect_func
@@ -312,22 +378,27 @@ class ImageSlicer:
             # If image doesn't need slicing, process it directly
             return detect_func(image)
             
-        # Calculate slicing parameters
-        slice_width, slice_height, effective_slice_height, num_slices = self.calculate_slice_params(image)
+        slices = self.get_slices(image)
+        slice_images = [slice_img for slice_img, _ in slices]
+        
+        if batch_detect_func is not None:
+            results = list(batch_detect_func(slice_images))
+        elif max_workers > 1 and len(slice_images) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(slice_images))) as pool:
+                results = list(pool.map(detect_func, slice_images))
+        else:
+            results = [detect_func(slice_img) for slice_img in slice_images]
         
-        # First, let's determine the return type by calling the function on the first slice
-        slice_img, start_y, _ = self.get_slice(
-            image, 0, effective_slice_height, slice_height
-        )
-        first_result = detect_func(slice_img)
+        offsets = [start_y for _, start_y in slices]
         
-        # Check return type to determine how to process the results
+        # Check return type to determine how to combine the results
+        first_result = results[0]
         if isinstance(first_result, tuple) and len(first_result) == 2:
             # Case 1: Function returns a tuple of two arrays (bubble_boxes, text_boxes)
-            return self._process_box_tuple_results(image, detect_func, effective_slice_height)
+            return self._merge_box_tuple_results(image, results, offsets)
         elif isinstance(first_result, np.ndarray):
             # Case 2: Function returns a single array of boxes
-            return self._process_single_box_array_results(image, detect_func, effective_slice_height)
+            return self._merge_single_box_array_results(image, results, offsets)
         else:
             # For any other return type, we'll need to handle it specifically
             # This is just a placeholder for custom implementations
@@ -335,36 +406,25 @@ class ImageSlicer:
                 "Detector return type not supported. Please implement custom slicing logic."
             )
     
-    def _process_box_tuple_results(self, 
-                                  image: np.ndarray,
-                                  detect_func: Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]],
-                                  effective_slice_height: int) -> tuple[np.ndarray, np.ndarray]:
+    def _merge_box_tuple_results(self, 
+                                 image: np.ndarray,
+                                 results: list[tuple[np.ndarray, np.ndarray]],
+                                 offsets: list[int]) -> tuple[np.ndarray, np.ndarray]:
         """
-        Process slices for detectors that return a tuple of (bubble_boxes, text_boxes).
+        Combine per-slice results of detectors that return (bubble_boxes, text_boxes).
         
         Args:
             image: Input image
-            detect_func: Detection function
-            effective_slice_height: Height of slice minus overlap
+            results: Detection result for each slice
+            offsets: Start y-coordinate of each slice
             
         Returns:
             Tuple of (combined_bubble_boxes, combined_text_boxes)
         """
-        height, width = image.shape[:2]
-        num_slices = math.ceil(height / effective_slice_height)
-        slice_height = int(width * self.target_slice_ratio)
-        
         all_bubble_boxes = []
         all_text_boxes = []
         
-        for slice_number in range(num_slices):
-            slice_img, start_y, _ = self.get_slice(
-                image, slice_number, effective_slice_height, slice_height
-            )
-            
-            # Run detection on this slice
-            bubble_boxes, text_boxes = detect_func(slice_img)
-            
+        for (bubble_boxes, text_boxes), start_y in zip(results, offsets):
             # Adjust coordinates to match original image
             if isinstance(bubble_boxes, np.ndarray) and bubble_boxes.size > 0:
                 bubble_boxes = self.adjust_box_coordinates(bubble_boxes, start_y)
@@ -393,35 +453,24 @@ class ImageSlicer:
             
         return combined_bubble_boxes, combined_text_boxes
     
-    def _process_single_box_array_results(self, 
-                                          image: np.ndarray, 
-                                          detect_func: Callable[[np.ndarray], np.ndarray],
-                                          effective_slice_height: int) -> np.ndarray:
+    def _merge_single_box_array_results(self, 
+                                        image: np.ndarray, 
+                                        results: list[np.ndarray],
+                                        offsets: list[int]) -> np.ndarray:
         """
-        Process slices for detectors that return a single array of boxes.
+        Combine per-slice results of detectors that return a single array of boxes.
         
         Args:
             image: Input image
-            detect_func: Detection function
-            effective_slice_height: Height of slice minus overlap
+            results: Detection result for each slice
+            offsets: Start y-coordinate of each slice
             
         Returns:
             Combined array of boxes
         """
-        height, width = image.shape[:2]
-        num_slices = math.ceil(height / effective_slice_height)
-        slice_height = int(width * self.target_slice_ratio)
-        
         all_boxes = []
         
-        for slice_number in range(num_slices):
-            slice_img, start_y, _ = self.get_slice(
-                image, slice_number, effective_slice_height, slice_height
-            )
-            
-            # Run detection on this slice
-            boxes = detect_func(slice_img)
-            
+        for boxes, start_y in zip(results, offsets):
             # Adjust coordinates to match original image
             if isinstance(boxes, np.ndarray) and boxes.size > 0:
                 boxes = self.adjust_box_coordinates(boxes, start_y)
@@ -437,4 +486,4 @@ class ImageSlicer:
                 image_height=image.shape[0]
             )
             
-        return combined_boxes
\ No newline at end of file
+        return combined_boxes
@@ -32,6 +32,42 @@ def _center_from_item(item):
     return (sum(xs) / len(xs), sum(ys) / len(ys))
 
 
+def adaptive_band(bboxes: np.ndarray, direction: str, band_ratio: float = 0.5) -> float:
+    """Line band for grouping: `band_ratio` times the median box height
+    (horizontal text) or width (vertical text)."""
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    if len(bboxes) == 0:
+        return band_ratio
+    if 'hor' in direction:
+        return band_ratio * float(np.median(bboxes[:, 3] - bboxes[:, 1]))
+    return band_ratio * float(np.median(bboxes[:, 2] - bboxes[:, 0]))
+
+
+def band_line_ids(positions: np.ndarray, band: float) -> np.ndarray:
+    """Label positions so that values chained within `band` of each other share a label.
+
+    This is the connected-component grouping of "|a - b| <= band" done by
+    sorting: a new line starts wherever the gap to the previous position
+    exceeds the band. Labels increase with position.
+
+    Args:
+        positions: 1-D array of line coordinates (centre y for horizontal
+            text, centre x for vertical text).
+        band: Maximum gap between neighbours of one line.
+
+    Returns:
+        Integer line label per position, in input order.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    order = np.argsort(positions, kind='stable')
+    starts = np.diff(positions[order]) > band
+    ids = np.empty(positions.size, dtype=np.intp)
+    ids[order] = np.concatenate(([0], np.cumsum(starts)))
+    return ids
+
+
 def group_items_into_lines(
     items: list, 
     direction: str = 'hor_ltr', 
@@ -44,47 +80,16 @@ def group_items_into_lines(
     if not items:
         return []
 
-    # Compute bboxes for adaptive band and sorting keys
-    bboxes = [_bbox_from_item(it) for it in items]
-
-    widths = [(x2 - x1) for x1, y1, x2, y2 in bboxes]
-    heights = [(y2 - y1) for x1, y1, x2, y2 in bboxes]
-    median_w = np.median(widths) if widths else 1.0
-    median_h = np.median(heights) if heights else 1.0
-
-    if 'hor' in direction:
-        adaptive_band = band_ratio * median_h
-    else:
-        adaptive_band = band_ratio * median_w
-
-    def in_same_line(i, j):
-        center_i = _center_from_item(items[i])
-        center_j = _center_from_item(items[j])
-        if 'hor' in direction:
-            return abs(center_i[1] - center_j[1]) <= adaptive_band
-        return abs(center_i[0] - center_j[0]) <= adaptive_band
-
-    # Union-Find
-    parent = list(range(len(items)))
-    def find(u):
-        if parent[u] == u:
-            return u
-        parent[u] = find(parent[u])
-        return parent[u]
-    def union(u, v):
-        ru, rv = find(u), find(v)
-        if ru != rv:
-            parent[rv] = ru
-
-    for i in range(len(items)):
-        for j in range(i + 1, len(items)):
-            if in_same_line(i, j):
-                union(i, j)
+    # Compute bboxes for adaptive band and centres for grouping
+    bboxes = np.array([_bbox_from_item(it) for it in items], dtype=np.float64)
+    centers = np.array([_center_from_item(it) for it in items], dtype=np.float64)
+    band = adaptive_band(bboxes, direction, band_ratio)
+    line_ids = band_line_ids(centers[:, 1] if 'hor' in direction else centers[:, 0], band)
 
+    # Lines in order of their first item, items in input order
     groups = {}
-    for idx, it in enumerate(items):
-        root = find(idx)
-        groups.setdefault(root, []).append(it)
+    for line_id, it in zip(line_ids.tolist(), items):
+        groups.setdefault(line_id, []).append(it)
 
     lines = list(groups.values())
 
@@ -1,8 +1,7 @@
 import numpy as np
 import imkit as imk
 from PIL import Image
-import onnxruntime as ort
-from modules.utils.device import get_providers
+from modules.utils.device import create_session
 
 from .base import InpaintModel
 from .schema import Config
@@ -24,8 +23,7 @@ class AOT(InpaintModel):
         if self.backend == "onnx":
             ModelDownloader.get(ModelID.AOT_ONNX)
             onnx_path = ModelDownloader.primary_path(ModelID.AOT_ONNX)
-            providers = get_providers(device)
-            self.session = ort.InferenceSession(onnx_path, providers=providers)
+            self.session = create_session(onnx_path, device)
         else:
             ModelDownloader.get(ModelID.AOT_JIT)
             local_path = ModelDownloader.primary_path(ModelID.AOT_JIT)
@@ -1,8 +1,7 @@
 import os
 import numpy as np
 import imkit as imk
-import onnxruntime as ort
-from ..utils.device import get_providers
+from ..utils.device import create_session
 
 from ..utils.inpainting import (
     norm_img,
@@ -24,10 +23,10 @@ class LaMa(InpaintModel):
     def init_model(self, device, **kwargs):
         self.backend = kwargs.get("backend")
         if self.backend == "onnx":
-            ModelDownloader.get(ModelID.LAMA_ONNX)
-            onnx_path = ModelDownloader.primary_path(ModelID.LAMA_ONNX)
-            providers = get_providers(device)
-            self.session = ort.InferenceSession(onnx_path, providers=providers)
+            model_id = ModelID.LAMA_ONNX_INT8 if kwargs.get("quantized") else ModelID.LAMA_ONNX
+            ModelDownloader.get(model_id)
+            onnx_path = ModelDownloader.primary_path(model_id)
+            self.session = create_session(onnx_path, device)
         else:
             ModelDownloader.get(ModelID.LAMA_JIT)
             local_path = ModelDownloader.primary_path(ModelID.LAMA_JIT) 
@@ -1,5 +1,4 @@
 import os
-import onnxruntime as ort
 import imkit as imk
 from PIL import Image
 import numpy as np
@@ -11,7 +10,7 @@ from ..utils.inpainting import (
     norm_img,
 )
 from modules.utils.download import ModelDownloader, ModelID
-from modules.utils.device import get_providers
+from modules.utils.device import create_session
 from .base import InpaintModel
 from .schema import Config
 
@@ -30,8 +29,7 @@ class MIGAN(InpaintModel):
             model_id = ModelID.MIGAN_PIPELINE_ONNX if self.use_pipeline_for_onnx else ModelID.MIGAN_ONNX
             ModelDownloader.get(model_id)
             onnx_path = ModelDownloader.primary_path(model_id)
-            providers = get_providers(device)
-            self.session = ort.InferenceSession(onnx_path, providers=providers)
+            self.session = create_session(onnx_path, device)
         else:
             ModelDownloader.get(ModelID.MIGAN_JIT)
             local_path = ModelDownloader.primary_path(ModelID.MIGAN_JIT)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from ..utils.http_pool import map_concurrent
+
+logger = logging.getLogger(__name__)
+
+ATLAS_PROMPT = (
+    "This image is a grid of numbered regions cut from a comic page. Each region is "
+    "framed, with its number in a box above it. Transcribe the text of every region "
+    "exactly as it appears. Do NOT translate. Reply with only a JSON object mapping "
+    "each region number to its text, for example {\"1\": \"...\", \"2\": \"...\"}. "
+    "Use an empty string for a region without text."
+)
+
+_LABEL_HEIGHT = 28
+_PADDING = 8
+_BACKGROUND = (255, 255, 255)
+_FRAME = (255, 0, 0)
+_FRAME_WIDTH = 3
+
+
+@dataclass
+class Atlas:
+    """One packed image and the ids of the regions drawn on it."""
+    image: np.ndarray
+    region_ids: list[int] = field(default_factory=list)
+
+
+def _label_font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _fit(crop: np.ndarray, max_w: int, max_h: int) -> np.ndarray:
+    """Downscale a crop so it fits in max_w x max_h; smaller crops are kept as is."""
+    h, w = crop.shape[:2]
+    scale = min(1.0, max_w / w, max_h / h)
+    if scale == 1.0:
+        return crop
+    size = (max(1, int(w * scale)), max(1, int(h * scale)))
+    return np.asarray(Image.fromarray(crop).resize(size, Image.LANCZOS))
+
+
+def build_atlases(
+    crops: Sequence[np.ndarray],
+    max_side: int = 1536,
+    max_regions: int = 16,
+) -> list[Atlas]:
+    """Pack crops row by row into labelled atlas images.
+
+    Every crop becomes a tile: a framed copy of the crop with its region id
+    (its 1-based position in ``crops``) in a box above it. Tiles fill rows
+    left to right, rows fill the atlas top to bottom, and a new atlas starts
+    once ``max_side`` or ``max_regions`` would be exceeded. Crops too large
+    for an atlas on their own are downscaled to fit.
+
+    Args:
+        crops: RGB crops in page order.
+        max_side: Maximum atlas width and height in pixels. Vision APIs
+            downscale larger images, which hurts small text.
+        max_regions: Maximum regions per atlas; models get less reliable at
+            keeping many regions apart.
+    """
+    font = _label_font(_LABEL_HEIGHT - 8)
+    inner = max_side - 2 * _PADDING - 2 * _FRAME_WIDTH
+    tile_max_h = inner - _LABEL_HEIGHT
+
+    # Lay out tiles as (region id, crop, x, y) placements per atlas
+    pages, placements, ends = [], [], {}
+    x = y = row_h = 0
+    for region_id, crop in enumerate(crops, start=1):
+        crop = _fit(crop, inner, tile_max_h)
+        left, _, right, _ = font.getbbox(str(region_id))
+        tile_w = max(crop.shape[1] + 2 * _FRAME_WIDTH, right - left + 12) + 2 * _PADDING
+        tile_h = crop.shape[0] + _LABEL_HEIGHT + 2 * _PADDING + 2 * _FRAME_WIDTH
+        if x + tile_w > max_side:
+            x, y, row_h = 0, y + row_h, 0
+        if placements and (y + tile_h > max_side or len(placements) == max_regions):
+            pages.append(placements)
+            placements, x, y, row_h = [], 0, 0, 0
+        placements.append((region_id, crop, x, y))
+        ends[region_id] = (x + tile_w, y + tile_h)
+        x += tile_w
+        row_h = max(row_h, tile_h)
+    if placements:
+        pages.append(placements)
+
+    atlases = []
+    for placements in pages:
+        width = max(ends[region_id][0] for region_id, *_ in placements)
+        height = max(ends[region_id][1] for region_id, *_ in placements)
+        canvas = Image.new('RGB', (width, height), _BACKGROUND)
+        draw = ImageDraw.Draw(canvas)
+        for region_id, crop, px, py in placements:
+            label = str(region_id)
+            left, top, right, bottom = draw.textbbox((0, 0), label, font=font)
+            box = (px + _PADDING, py + _PADDING,
+                   px + _PADDING + (right - left) + 12, py + _PADDING + _LABEL_HEIGHT - 4)
+            draw.rectangle(box, fill=(0, 0, 0))
+            draw.text((box[0] + 6 - left, box[1] + (box[3] - box[1] - (bottom - top)) // 2 - top),
+                      label, fill=(255, 255, 255), font=font)
+
+            cx, cy = px + _PADDING + _FRAME_WIDTH, py + _PADDING + _LABEL_HEIGHT + _FRAME_WIDTH
+            h, w = crop.shape[:2]
+            draw.rectangle((cx - _FRAME_WIDTH, cy - _FRAME_WIDTH, cx + w + _FRAME_WIDTH - 1, cy + h + _FRAME_WIDTH - 1),
+                           outline=_FRAME, width=_FRAME_WIDTH)
+            canvas.paste(Image.fromarray(np.ascontiguousarray(crop[..., :3])), (cx, cy))
+        atlases.append(Atlas(np.asarray(canvas), [region_id for region_id, *_ in placements]))
+    return atlases
+
+
+def parse_region_texts(reply: str, region_ids: Sequence[int]) -> Optional[dict[int, str]]:
+    """Read the ``{"region id": "text"}`` map out of a model reply.
+
+    Tolerates code fences and chatter around the JSON object. Keys that are
+    not one of ``region_ids`` are dropped; list values are joined with
+    spaces. Returns None if the reply holds no JSON object.
+    """
+    match = re.search(r'\{.*\}', reply or '', re.DOTALL)
+    if match is None:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    wanted = set(region_ids)
+    texts = {}
+    for key, value in data.items():
+        try:
+            region_id = int(str(key).strip().strip('#[]()'))
+        except ValueError:
+            continue
+        if region_id not in wanted:
+            continue
+        if isinstance(value, list):
+            value = ' '.join(str(v) for v in value)
+        texts[region_id] = '' if value is None else str(value)
+    return texts
+
+
+def read_regions(
+    crops: Sequence[np.ndarray],
+    read_crop: Callable[[np.ndarray], str],
+    read_atlas: Callable[[np.ndarray], str],
+    max_in_flight: int = 8,
+    max_side: int = 1536,
+    max_regions: int = 16,
+) -> list[Optional[str]]:
+    """OCR crops through atlas requests, falling back to one request per crop.
+
+    The crops are packed with ``build_atlases`` and each atlas is sent through
+    ``read_atlas``, which should prompt with ``ATLAS_PROMPT`` and return the
+    raw reply. Regions an atlas reply does not account for (unparseable
+    reply, missing key, failed request) are read one by one with
+    ``read_crop``.
+
+    Returns:
+        Text per crop, in the order of ``crops``; None for a crop whose
+        request failed.
+    """
+    if len(crops) <= 1:
+        return map_concurrent(read_crop, crops, 1, default=None)
+
+    def _read(atlas: Atlas) -> Optional[dict[int, str]]:
+        try:
+            texts = parse_region_texts(read_atlas(atlas.image), atlas.region_ids)
+        except Exception as e:
+            logger.warning(f"Atlas OCR request for regions {atlas.region_ids} failed: {e}")
+            return None
+        if texts is None:
+            logger.warning(f"Could not parse atlas OCR reply for regions {atlas.region_ids}")
+        return texts
+
+    atlases = build_atlases(crops, max_side, max_regions)
+    results: list[Optional[str]] = [None] * len(crops)
+    for texts in map_concurrent(_read, atlases, max_in_flight):
+        for region_id, text in (texts or {}).items():
+            results[region_id - 1] = text
+
+    missing = [i for i, text in enumerate(results) if text is None]
+    if missing:
+        logger.info(f"Atlas OCR: reading {len(missing)} of {len(crops)} regions individually")
+        for i, text in zip(missing, map_concurrent(lambda i: read_crop(crops[i]), missing, max_in_flight, default=None)):
+            results[i] = text
+    return results
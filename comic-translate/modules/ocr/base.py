@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 import numpy as np
 import base64
 import imkit as imk
 
-from ..utils.textblock import TextBlock
+from ..utils.textblock import TextBlock, adjust_text_line_coordinates
 
 
 class OCREngine(ABC):
@@ -60,4 +61,34 @@ class OCREngine(ABC):
             Base64 encoded image string
         """
         img_buffer = imk.encode_image(image, ext.lstrip('.'))
-        return base64.b64encode(img_buffer).decode('utf-8')
\ No newline at end of file
+        return base64.b64encode(img_buffer).decode('utf-8')
+
+    @staticmethod
+    def crop_block(img: np.ndarray, blk: TextBlock, expansion_percentage: int = 0) -> Optional[np.ndarray]:
+        """
+        Crop the region a block is read from: its bubble if it has one,
+        otherwise its text box expanded by ``expansion_percentage``.
+        
+        Args:
+            img: Input image as numpy array
+            blk: Text block to crop
+            expansion_percentage: Percentage to expand the text box
+        Returns:
+            Cropped image, or None if the region lies outside the image
+        """
+        if blk.bubble_xyxy is not None:
+            x1, y1, x2, y2 = blk.bubble_xyxy
+        else:
+            x1, y1, x2, y2 = adjust_text_line_coordinates(
+                blk.xyxy, 
+                expansion_percentage, 
+                expansion_percentage, 
+                img
+            )
+        
+        # Convert to integers for slicing
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        
+        if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
+            return img[y1:y2, x1:x2]
+        return None
@@ -2,7 +2,7 @@ import json
 import hashlib
 from typing import List
 
-from modules.utils.device import resolve_device, torch_available
+from modules.utils.device import resolve_device, torch_available, int8_models_enabled
 from .base import OCREngine
 from .microsoft_ocr import MicrosoftOCR
 from .google_ocr import GoogleOCR
@@ -91,6 +91,8 @@ class OCRFactory:
             extras["credentials"] = creds
         if device:
             extras["device"] = device
+        if int8_models_enabled(settings, device):
+            extras["int8"] = True
 
         # The LLM OCR engines currently don't use the settings in the LLMs tab
         # so exclude this for now
@@ -196,9 +198,26 @@ class OCRFactory:
         credentials = settings.get_credentials(settings.ui.tr("Open AI GPT"))
         api_key = credentials.get('api_key', '')
         engine = GPTOCR()
-        engine.initialize(api_key=api_key, model=model)
+        engine.initialize(
+            api_key=api_key, 
+            model=model, 
+            max_concurrent_requests=OCRFactory._request_limit(settings),
+            use_atlas=OCRFactory._atlas_enabled(settings)
+        )
         return engine
     
+    @staticmethod
+    def _request_limit(settings) -> int:
+        """Requests the per-region cloud engines keep in flight (settings may override)."""
+        if hasattr(settings, 'get_ocr_request_limit'):
+            return settings.get_ocr_request_limit()
+        return 8
+    
+    @staticmethod
+    def _atlas_enabled(settings) -> bool:
+        """Whether the LLM engines should read a page's regions from packed atlases."""
+        return hasattr(settings, 'is_ocr_atlas_enabled') and bool(settings.is_ocr_atlas_enabled())
+    
     @staticmethod
     def _create_manga_ocr(settings, backend: str = 'onnx') -> OCREngine:
         device = resolve_device(settings.is_gpu_enabled(), backend)
@@ -209,7 +228,7 @@ class OCRFactory:
             engine.initialize(device=device)
         else:
             engine = MangaOCREngineONNX()
-            engine.initialize(device=device)
+            engine.initialize(device=device, quantized=int8_models_enabled(settings, device))
         
         return engine
     
@@ -232,13 +251,18 @@ class OCRFactory:
         # PPOCRv5 only supports ONNX backend
         device = resolve_device(settings.is_gpu_enabled(), 'onnx')
         engine = PPOCRv5Engine()
-        engine.initialize(lang=lang, device=device)
+        engine.initialize(lang=lang, device=device, quantized=int8_models_enabled(settings, device))
         return engine
     
     @staticmethod
     def _create_gemini_ocr(settings, model) -> OCREngine:
         engine = GeminiOCR()
-        engine.initialize(settings, model)
+        engine.initialize(
+            settings, 
+            model, 
+            max_concurrent_requests=OCRFactory._request_limit(settings),
+            use_atlas=OCRFactory._atlas_enabled(settings)
+        )
         return engine
     
     @staticmethod
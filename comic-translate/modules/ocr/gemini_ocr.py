@@ -1,14 +1,20 @@
 import numpy as np
-import requests
 from typing import TYPE_CHECKING
 
 from .base import OCREngine
-from ..utils.textblock import TextBlock, adjust_text_line_coordinates
+from ..utils.textblock import TextBlock
 from ..utils.translator_utils import MODEL_MAP
+from ..utils.http_pool import pooled_session, map_concurrent
+from .atlas import ATLAS_PROMPT, read_regions
 
 if TYPE_CHECKING:
     from app.ui.settings.settings_page import SettingsPage
 
+OCR_PROMPT = """
+Extract the text in this image exactly as it appears. 
+Only output the raw text with no additional comments or descriptions.
+"""
+
 
 class GeminiOCR(OCREngine):
     """OCR engine using Google Gemini models via REST API with block processing method."""
@@ -19,9 +25,13 @@ class GeminiOCR(OCREngine):
         self.model = ''
         self.api_base_url = "https://generativelanguage.googleapis.com/v1beta/models"
         self.max_output_tokens = 5000
+        self.max_concurrent_requests = 8
+        self.use_atlas = False
+        self.session = None
         
     def initialize(self, settings: 'SettingsPage', model: str = 'Gemini-2.0-Flash', 
-                   expansion_percentage: int = 5) -> None:
+                   expansion_percentage: int = 5, max_concurrent_requests: int = 8,
+                   use_atlas: bool = False) -> None:
         """
         Initialize the Gemini OCR with API key and parameters.
         
@@ -29,11 +39,17 @@ class GeminiOCR(OCREngine):
             settings: Settings page containing credentials
             model: Gemini model to use for OCR (defaults to Gemini-2.0-Flash)
             expansion_percentage: Percentage to expand text bounding boxes
+            max_concurrent_requests: Text regions sent to the API at once
+            use_atlas: Read all regions of a page from packed atlas images
+                instead of one request per region
         """
         self.expansion_percentage = expansion_percentage
         credentials = settings.get_credentials(settings.ui.tr('Google Gemini'))
         self.api_key = credentials.get('api_key', '')
         self.model = MODEL_MAP.get(model)
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.use_atlas = use_atlas
+        self.session = pooled_session(pool_size=self.max_concurrent_requests)
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
         """
@@ -46,12 +62,47 @@ class GeminiOCR(OCREngine):
         Returns:
             List of updated TextBlock objects with recognized text
         """
+        if self.use_atlas:
+            return self._process_by_atlas(img, blk_list)
         return self._process_by_blocks(img, blk_list)
     
+    def _process_by_atlas(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
+        """
+        Process an image by packing its text regions into a few numbered atlas
+        images and reading each atlas with one request. Regions a reply does
+        not account for are read with one request each.
+        
+        Args:
+            img: Input image as numpy array
+            blk_list: List of TextBlock objects to update with OCR text
+            
+        Returns:
+            List of updated TextBlock objects with recognized text
+        """
+        jobs = []
+        for blk in blk_list:
+            cropped_img = self.crop_block(img, blk, self.expansion_percentage)
+            if cropped_img is not None:
+                jobs.append((blk, cropped_img))
+        
+        texts = read_regions(
+            [crop for _, crop in jobs],
+            read_crop=lambda crop: self._get_gemini_block_ocr(self.encode_image(crop)),
+            read_atlas=lambda atlas: self._get_gemini_block_ocr(self.encode_image(atlas), ATLAS_PROMPT),
+            max_in_flight=self.max_concurrent_requests
+        )
+        # A region whose request failed keeps its text; the others still get theirs
+        for (blk, _), text in zip(jobs, texts):
+            if text is not None:
+                blk.text = text.strip()
+                
+        return blk_list
+    
     def _process_by_blocks(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
         """
         Process an image by processing individual text regions separately.
-        Similar to GPTOCR approach, each text block is cropped and sent individually.
+        Similar to GPTOCR approach, each text block is cropped and sent as its
+        own request, with up to ``max_concurrent_requests`` in flight.
         
         Args:
             img: Input image as numpy array
@@ -60,43 +111,37 @@ class GeminiOCR(OCREngine):
         Returns:
             List of updated TextBlock objects with recognized text
         """
+        jobs = []
         for blk in blk_list:
-            # Get box coordinates
-            if blk.bubble_xyxy is not None:
-                x1, y1, x2, y2 = blk.bubble_xyxy
-            else:
-                x1, y1, x2, y2 = adjust_text_line_coordinates(
-                    blk.xyxy, 
-                    self.expansion_percentage, 
-                    self.expansion_percentage, 
-                    img
-                )
-            
-            # Convert to integers for slicing
-            x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-            
-            # Check if coordinates are valid
-            if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                # Crop image and encode
-                cropped_img = img[y1:y2, x1:x2]
-                encoded_img = self.encode_image(cropped_img)
-                
-                # Get OCR result from Gemini
-                blk.text = self._get_gemini_block_ocr(encoded_img)
+            cropped_img = self.crop_block(img, blk, self.expansion_percentage)
+            if cropped_img is not None:
+                jobs.append((blk, cropped_img))
+        
+        # One request per region, several in flight; results come back in block order
+        texts = map_concurrent(
+            lambda job: self._get_gemini_block_ocr(self.encode_image(job[1])),
+            jobs,
+            self.max_concurrent_requests,
+            default=None
+        )
+        for (blk, _), text in zip(jobs, texts):
+            if text is not None:
+                blk.text = text
                 
         return blk_list
     
-    def _get_gemini_block_ocr(self, base64_image: str) -> str:
+    def _get_gemini_block_ocr(self, base64_image: str, prompt: str = OCR_PROMPT) -> str:
         """
         Get OCR result for a single block from Gemini model.
         
         Args:
             base64_image: Base64 encoded image
+            prompt: Instruction sent along with the image
             
         Returns:
             OCR result text
         """
-        if not self.api_key:
+        if not self.api_key or self.session is None:
             raise ValueError("API key not initialized. Call initialize() first.")
             
         # Create API endpoint URL
@@ -108,10 +153,6 @@ class GeminiOCR(OCREngine):
         }
         
         # Prepare payload
-        prompt = """
-        Extract the text in this image exactly as it appears. 
-        Only output the raw text with no additional comments or descriptions.
-        """
         payload = {
             "contents": [{
                 "parts": [
@@ -131,7 +172,7 @@ class GeminiOCR(OCREngine):
         
         # Make POST request to Gemini API
         headers = {"Content-Type": "application/json"}
-        response = requests.post(
+        response = self.session.post(
             url,
             headers=headers, 
             json=payload,
@@ -1,10 +1,10 @@
 import json
 import numpy as np
-import requests
 
 from .base import OCREngine
 from ..utils.textblock import TextBlock
 from ..utils.pipeline_utils import lists_to_blk_list
+from ..utils.http_pool import pooled_session
 
 
 class GoogleOCR(OCREngine):
@@ -12,6 +12,8 @@ class GoogleOCR(OCREngine):
     
     def __init__(self):
         self.api_key = None
+        self.api_url = "https://vision.googleapis.com/v1/images:annotate"
+        self.session = None
         
     def initialize(self, api_key: str) -> None:
         """
@@ -21,6 +23,8 @@ class GoogleOCR(OCREngine):
             api_key: Google Cloud API key
         """
         self.api_key = api_key
+        # The whole page is one request; the pool serves concurrent pages
+        self.session = pooled_session()
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
         texts_bboxes = []
@@ -36,8 +40,8 @@ class GoogleOCR(OCREngine):
         }
         
         headers = {"Content-Type": "application/json"}
-        response = requests.post(
-            "https://vision.googleapis.com/v1/images:annotate",
+        response = self.session.post(
+            self.api_url,
             headers=headers,
             params={"key": self.api_key},
             data=json.dumps(payload),
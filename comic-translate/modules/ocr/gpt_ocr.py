@@ -1,10 +1,13 @@
 import numpy as np
-import requests
 import json
 
 from .base import OCREngine
-from ..utils.textblock import TextBlock, adjust_text_line_coordinates
+from ..utils.textblock import TextBlock
 from ..utils.translator_utils import MODEL_MAP
+from ..utils.http_pool import pooled_session, map_concurrent
+from .atlas import ATLAS_PROMPT, read_regions
+
+OCR_PROMPT = "Write out the text in this image. Do NOT Translate. Do not write anything else"
 
 
 class GPTOCR(OCREngine):
@@ -16,9 +19,13 @@ class GPTOCR(OCREngine):
         self.model = None
         self.api_base_url = 'https://api.openai.com/v1/chat/completions'
         self.max_tokens = 5000
+        self.max_concurrent_requests = 8
+        self.use_atlas = False
+        self.session = None
         
     def initialize(self, api_key: str, model: str = 'GPT-4.1-mini', 
-                  expansion_percentage: int = 0) -> None:
+                  expansion_percentage: int = 0, max_concurrent_requests: int = 8,
+                  use_atlas: bool = False) -> None:
         """
         Initialize the GPT OCR with API key and parameters.
         
@@ -26,10 +33,16 @@ class GPTOCR(OCREngine):
             api_key: OpenAI API key for authentication
             model: GPT model to use for OCR (defaults to gpt-4o)
             expansion_percentage: Percentage to expand text bounding boxes
+            max_concurrent_requests: Text regions sent to the API at once
+            use_atlas: Read all regions of a page from packed atlas images
+                instead of one request per region
         """
         self.api_key = api_key
         self.model = MODEL_MAP.get(model)
         self.expansion_percentage = expansion_percentage
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.use_atlas = use_atlas
+        self.session = pooled_session(pool_size=self.max_concurrent_requests)
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
         """
@@ -42,29 +55,34 @@ class GPTOCR(OCREngine):
         Returns:
             List of updated TextBlock objects with recognized text
         """
+        jobs = []
         for blk in blk_list:
-            # Get box coordinates
-            if blk.bubble_xyxy is not None:
-                x1, y1, x2, y2 = blk.bubble_xyxy
-            else:
-                x1, y1, x2, y2 = adjust_text_line_coordinates(
-                    blk.xyxy, 
-                    self.expansion_percentage, 
-                    self.expansion_percentage, 
-                    img
-                )
-            
-            # Convert to integers for slicing
-            x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-            
-            # Check if coordinates are valid
-            if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                # Crop image and encode
-                cropped_img = img[y1:y2, x1:x2]
-                img_to_gpt = self.encode_image(cropped_img)
-                
-                # Get OCR result from GPT
-                blk.text = self._get_gpt_ocr(img_to_gpt)
+            cropped_img = self.crop_block(img, blk, self.expansion_percentage)
+            if cropped_img is not None:
+                jobs.append((blk, cropped_img))
+        
+        crops = [crop for _, crop in jobs]
+        if self.use_atlas:
+            # Few requests carrying many regions; per-region calls for what the replies miss
+            texts = read_regions(
+                crops,
+                read_crop=lambda crop: self._get_gpt_ocr(self.encode_image(crop)),
+                read_atlas=lambda atlas: self._request(self.encode_image(atlas), ATLAS_PROMPT),
+                max_in_flight=self.max_concurrent_requests
+            )
+            texts = [text.replace('\n', ' ') if text is not None else None for text in texts]
+        else:
+            # One request per region, several in flight; results come back in block order
+            texts = map_concurrent(
+                lambda crop: self._get_gpt_ocr(self.encode_image(crop)),
+                crops,
+                self.max_concurrent_requests,
+                default=None
+            )
+        # A region whose request failed keeps its text; the others still get theirs
+        for (blk, _), text in zip(jobs, texts):
+            if text is not None:
+                blk.text = text
                 
         return blk_list
     
@@ -78,7 +96,22 @@ class GPTOCR(OCREngine):
         Returns:
             OCR result text
         """
-        if not self.api_key:
+        text = self._request(base64_image, OCR_PROMPT)
+        # Replace newlines with spaces
+        return text.replace('\n', ' ') if '\n' in text else text
+    
+    def _request(self, base64_image: str, prompt: str) -> str:
+        """
+        Send one image with a prompt to the chat completions API.
+        
+        Args:
+            base64_image: Base64 encoded image
+            prompt: Instruction sent along with the image
+            
+        Returns:
+            Raw reply text, or an empty string if the API returned an error
+        """
+        if not self.api_key or self.session is None:
             raise ValueError("API key not initialized. Call initialize() first.")
             
         # Prepare request headers
@@ -94,7 +127,7 @@ class GPTOCR(OCREngine):
                 {
                     "role": "user",
                     "content": [
-                        {"type": "text", "text": "Write out the text in this image. Do NOT Translate. Do not write anything else"},
+                        {"type": "text", "text": prompt},
                         {"type": "image_url", "image_url": {"url": f"data:image/jpg;base64,{base64_image}"}}
                     ]
                 }
@@ -103,7 +136,7 @@ class GPTOCR(OCREngine):
         }
         
         # Make POST request to OpenAI API
-        response = requests.post(
+        response = self.session.post(
             self.api_base_url,
             headers=headers,
             data=json.dumps(payload),
@@ -113,9 +146,7 @@ class GPTOCR(OCREngine):
         # Parse response
         if response.status_code == 200:
             response_json = response.json()
-            text = response_json['choices'][0]['message']['content']
-            # Replace newlines with spaces
-            return text.replace('\n', ' ') if '\n' in text else text
+            return response_json['choices'][0]['message']['content']
         else:
             print(f"API error: {response.status_code} {response.text}")
             return ""
\ No newline at end of file
@@ -4,8 +4,7 @@ import jaconv
 import numpy as np
 from PIL import Image
 from onnxruntime import InferenceSession
-import onnxruntime as ort
-from modules.utils.device import get_providers
+from modules.utils.device import create_session
 
 from modules.ocr.base import OCREngine
 from modules.utils.textblock import TextBlock, adjust_text_line_coordinates
@@ -23,22 +22,26 @@ class MangaOCREngineONNX(OCREngine):
         self.current_file_dir = os.path.dirname(os.path.abspath(__file__))
         self.project_root = os.path.abspath(os.path.join(self.current_file_dir, '..', '..', '..'))
 
-    def initialize(self, device: str = 'cpu', expansion_percentage: int = 5) -> None:
+    def initialize(self, device: str = 'cpu', expansion_percentage: int = 5, quantized: bool = False) -> None:
         """Initialize the ONNX Manga OCR engine.
 
         Args:
             device: 'cpu' or a device string containing 'cuda' to attempt GPU provider.
             expansion_percentage: bounding box expansion percentage used when cropping.
+            quantized: use the locally generated INT8 encoder/decoder (CPU only).
         """
 
         self.device = device
         self.expansion_percentage = expansion_percentage
 
         if self.model is None:
-            ModelDownloader.get(ModelID.MANGA_OCR_BASE_ONNX)
-            self.model = MangaOCRONNX(device=device)
+            model_id = ModelID.MANGA_OCR_BASE_ONNX_INT8 if quantized else ModelID.MANGA_OCR_BASE_ONNX
+            ModelDownloader.get(model_id)
+            self.model = MangaOCRONNX(device=device, model_id=model_id)
 
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
+        crops = []
+        crop_blocks = []
         for blk in blk_list:
             # Get box coordinates
             if blk.bubble_xyxy is not None:
@@ -55,14 +58,27 @@ class MangaOCREngineONNX(OCREngine):
             x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
 
             # Validate coordinates
+            blk.text = ""
             if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                cropped_img = img[y1:y2, x1:x2]
+                crops.append(img[y1:y2, x1:x2])
+                crop_blocks.append(blk)
+
+        if not crops:
+            return blk_list
+
+        # Decode every bubble on the page together
+        try:
+            texts = self.model.recognize_batch(crops)
+        except Exception:
+            texts = []
+            for crop in crops:
                 try:
-                    blk.text = self.model(cropped_img)
+                    texts.append(self.model(crop))
                 except Exception:
-                    blk.text = ""
-            else:
-                blk.text = ""
+                    texts.append("")
+
+        for blk, text in zip(crop_blocks, texts):
+            blk.text = text
 
         return blk_list
 
@@ -73,18 +89,25 @@ class MangaOCRONNX:
     The implementation is intentionally defensive: input and output names
     are discovered from the ONNX graphs so the wrapper is robust to small
     naming differences. The model expects images resized to 224x224.
+
+    Decoding is greedy and batched: all crops are encoded together and
+    decoded step by step, dropping each sequence from the batch once it
+    emits EOS.
     """
 
-    def __init__(self, device: str = 'cpu'):
+    BOS_TOKEN = 2
+    EOS_TOKEN = 3
+    MAX_LENGTH = 300
+
+    def __init__(self, device: str = 'cpu', model_id: ModelID = ModelID.MANGA_OCR_BASE_ONNX):
         self.device = device
 
-        encoder_path = ModelDownloader.get_file_path(ModelID.MANGA_OCR_BASE_ONNX, "encoder_model.onnx")
-        decoder_path = ModelDownloader.get_file_path(ModelID.MANGA_OCR_BASE_ONNX, "decoder_model.onnx")
-        vocab_path = ModelDownloader.get_file_path(ModelID.MANGA_OCR_BASE_ONNX, "vocab.txt")
+        encoder_path = ModelDownloader.get_file_path(model_id, "encoder_model.onnx")
+        decoder_path = ModelDownloader.get_file_path(model_id, "decoder_model.onnx")
+        vocab_path = ModelDownloader.get_file_path(model_id, "vocab.txt")
 
-        providers = get_providers(self.device)
-        self.encoder = InferenceSession(encoder_path, providers=providers)
-        self.decoder = InferenceSession(decoder_path, providers=providers)
+        self.encoder = create_session(encoder_path, self.device)
+        self.decoder = create_session(decoder_path, self.device)
 
         self.vocab = self._load_vocab(vocab_path)
 
@@ -96,6 +119,14 @@ class MangaOCRONNX:
         # decoder likely accepts encoder hidden states under a name; prefer common ones
         self.decoder_encoder_input = self._find_input_name(self.decoder, candidates=('encoder_hidden_states', 'encoder_outputs', 'encoder_last_hidden_state'))
 
+        self.encoder_batched = self._has_dynamic_batch(self.encoder)
+        self.decoder_batched = self._has_dynamic_batch(self.decoder)
+
+    @staticmethod
+    def _has_dynamic_batch(session: InferenceSession) -> bool:
+        dim = session.get_inputs()[0].shape[0]
+        return not isinstance(dim, int) or dim != 1
+
     def _find_input_name(self, session: InferenceSession, candidates=('input',)) -> str:
         names = [inp.name for inp in session.get_inputs()]
         for cand in candidates:
@@ -111,11 +142,20 @@ class MangaOCRONNX:
         return lines
 
     def __call__(self, img: np.ndarray) -> str:
-        img_in = self._preprocess(img)
-        token_ids = self._generate(img_in)
-        text = self._decode(token_ids)
-        text = self._postprocess(text)
-        return text
+        return self.recognize_batch([img])[0]
+
+    def recognize_batch(self, imgs: list[np.ndarray], batch_size: int = 16) -> list[str]:
+        """Recognize several crops, decoding up to ``batch_size`` at once."""
+        if not self.decoder_batched:
+            batch_size = 1
+
+        texts = []
+        for start in range(0, len(imgs), batch_size):
+            chunk = imgs[start:start + batch_size]
+            pixel_values = np.concatenate([self._preprocess(img) for img in chunk])
+            for token_ids in self._generate(pixel_values):
+                texts.append(self._postprocess(self._decode(token_ids)))
+        return texts
 
     def _preprocess(self, img: np.ndarray) -> np.ndarray:
         # Expecting BGR (OpenCV) numpy array from cropping logic used elsewhere.
@@ -144,32 +184,47 @@ class MangaOCRONNX:
 
         return arr
 
-    def _generate(self, image: np.ndarray) -> list:
-        # Run encoder once
-        encoder_feed = {self.encoder_image_input: image}
-        encoder_outs = self.encoder.run(None, encoder_feed)
-        encoder_hidden = encoder_outs[0]
-
-        token_ids = [2]
-
-        for _ in range(300):
-            # prepare decoder inputs
-            decoder_feed = {
-                self.decoder_token_input: np.array([token_ids], dtype=np.int64),
+    def _encode(self, images: np.ndarray) -> np.ndarray:
+        if self.encoder_batched or images.shape[0] == 1:
+            return self.encoder.run(None, {self.encoder_image_input: images})[0]
+        return np.concatenate([
+            self.encoder.run(None, {self.encoder_image_input: images[i:i + 1]})[0]
+            for i in range(images.shape[0])
+        ])
+
+    def _generate(self, images: np.ndarray) -> list[list[int]]:
+        """Greedy-decode a batch of preprocessed images; returns token ids per image."""
+        # Run encoder once for the whole batch
+        encoder_hidden = self._encode(images)
+        batch = encoder_hidden.shape[0]
+
+        sequences = [[self.BOS_TOKEN] for _ in range(batch)]
+        active = np.arange(batch)
+        tokens = np.full((batch, 1), self.BOS_TOKEN, dtype=np.int64)
+
+        for _ in range(self.MAX_LENGTH):
+            outs = self.decoder.run(None, {
+                self.decoder_token_input: tokens,
                 self.decoder_encoder_input: encoder_hidden,
-            }
+            })
+
+            # assume logits are first output; pick last timestep logits
+            next_tokens = np.argmax(outs[0][:, -1, :], axis=-1).astype(np.int64)
+            for idx, tok in zip(active, next_tokens):
+                sequences[idx].append(int(tok))
 
-            outs = self.decoder.run(None, decoder_feed)
-            # assume logits are first output
-            logits = outs[0]
-            # pick last timestep logits
-            next_token = int(np.argmax(logits[0, -1, :]))
-            token_ids.append(next_token)
+            tokens = np.concatenate([tokens, next_tokens[:, None]], axis=1)
 
-            if next_token == 3:
-                break
+            # Drop finished sequences so later steps only run live ones
+            keep = next_tokens != self.EOS_TOKEN
+            if not keep.all():
+                if not keep.any():
+                    break
+                active = active[keep]
+                tokens = tokens[keep]
+                encoder_hidden = encoder_hidden[keep]
 
-        return token_ids
+        return sequences
 
     def _decode(self, token_ids: list) -> str:
         text = ''
@@ -29,8 +29,12 @@ class MicrosoftOCR(OCREngine):
 
         self.api_key = api_key
         self.endpoint = endpoint
+        # The client keeps its connection pool; retry 429/5xx with backoff
         self.client = ImageAnalysisClient(
-            endpoint=endpoint, credential=AzureKeyCredential(api_key)
+            endpoint=endpoint, 
+            credential=AzureKeyCredential(api_key),
+            retry_total=3,
+            retry_backoff_factor=0.5,
         )
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
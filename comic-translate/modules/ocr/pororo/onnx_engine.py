@@ -1,17 +1,16 @@
 from __future__ import annotations
 
+import math
 import os
 import numpy as np
 from PIL import Image
 import imkit as imk
-import onnxruntime as ort
 from typing import Optional
 
 from modules.utils.download import ModelDownloader, ModelID
 from modules.ocr.base import OCREngine
-from modules.utils.device import get_providers
+from modules.utils.device import create_session
 from modules.utils.textblock import TextBlock
-from modules.utils.textblock import adjust_text_line_coordinates
 from .pororo.models.brainOCR.brainocr import Reader
 from .pororo.models.brainOCR.detection import (
     resize_aspect_ratio,
@@ -24,6 +23,40 @@ from .pororo.models.brainOCR.utils import group_text_box
 from .pororo.models.brainOCR.utils import get_image_list
 from .pororo.models.brainOCR.utils import reformat_input, get_paragraph, diff
 
+# Blank border kept between bubble crops packed onto one detection canvas, so
+# CRAFT never links characters of neighbouring bubbles
+_PACK_GAP = 32
+
+
+def _pack_crops(sizes: list[tuple[int, int]], max_side: int, gap: int = _PACK_GAP) -> list[list[tuple[int, int, int]]]:
+    """Shelf-pack (h, w) sizes, tallest first, into canvases of at most max_side.
+
+    Returns one list of (index, x, y) placements per canvas. Every size must
+    fit on a canvas on its own, gaps included.
+    """
+    if not sizes:
+        return []
+    area = sum((h + gap) * (w + gap) for h, w in sizes)
+    widest = max(w for _, w in sizes) + 2 * gap
+    # Aim for a square canvas; CRAFT's cost follows the padded area
+    width = min(max_side, max(widest, math.ceil(math.sqrt(area))))
+
+    canvases, placements = [], []
+    x = y = gap
+    row_h = 0
+    for i in sorted(range(len(sizes)), key=lambda i: -sizes[i][0]):
+        h, w = sizes[i]
+        if x + w + gap > width:
+            x, y, row_h = gap, y + row_h + gap, 0
+        if placements and y + h + gap > max_side:
+            canvases.append(placements)
+            placements, x, y, row_h = [], gap, gap, 0
+        placements.append((i, x, y))
+        x += w + gap
+        row_h = max(row_h, h)
+    canvases.append(placements)
+    return canvases
+
 
 class PororoOCREngineONNX(OCREngine):
     """Runs Pororo OCR fully with ONNXRuntime."""
@@ -35,24 +68,39 @@ class PororoOCREngineONNX(OCREngine):
         self.opt2val["vocab_size"] = len(self.opt2val["vocab"])
         self.converter = CTCLabelConverter(self.opt2val["vocab"])  # type: ignore
 
-    def initialize(self, lang: str = 'ko', expansion_percentage: int = 5, device: Optional[str] = None):  # match signature style of torch engine
+    def initialize(
+        self,
+        lang: str = 'ko',
+        expansion_percentage: int = 5,
+        device: Optional[str] = None,
+        page_batching: bool = True,
+        rec_batch_size: int = 16,
+    ):  # match signature style of torch engine
         """Initialize engine runtime options and create ONNX sessions with device hint.
 
         device: optional device hint (e.g. 'cpu' or 'cuda') that controls ONNX provider selection.
+        page_batching: detect text in all bubbles of a page with one CRAFT run over a
+            packed canvas and recognize all their lines together, instead of running
+            the full pipeline bubble by bubble.
+        rec_batch_size: text lines per recognizer run (1 if the model has a fixed batch).
         """
         ModelDownloader.get(ModelID.PORORO_ONNX)
         self.lang = lang
         self.expansion_percentage = expansion_percentage
+        self.page_batching = page_batching
 
         if device:
             self.opt2val["device"] = device
 
-        sess_opts = ort.SessionOptions()
-        providers = get_providers(self.opt2val.get("device"))
         self.det_path = ModelDownloader.get_file_path(ModelID.PORORO_ONNX, "craft.onnx")
         self.rec_path = ModelDownloader.get_file_path(ModelID.PORORO_ONNX, "brainocr.onnx")
-        self.det_sess = ort.InferenceSession(self.det_path, sess_options=sess_opts, providers=providers)
-        self.rec_sess = ort.InferenceSession(self.rec_path, sess_options=sess_opts, providers=providers)
+        self.det_sess = create_session(self.det_path, self.opt2val.get("device"))
+        self.rec_sess = create_session(self.rec_path, self.opt2val.get("device"))
+
+        # Exported recognizers may fix the batch and/or width axis of their (N, 1, H, W) input
+        rec_shape = self.rec_sess.get_inputs()[0].shape
+        self.rec_batch_size = rec_shape[0] if isinstance(rec_shape[0], int) else max(1, rec_batch_size)
+        self.rec_dynamic_width = len(rec_shape) == 4 and not isinstance(rec_shape[3], int)
         return None
 
     # Detection
@@ -86,6 +134,55 @@ class PororoOCREngineONNX(OCREngine):
                 polys[k] = boxes[k]
         return boxes, polys
 
+    def _detect_crops(self, crops: list[np.ndarray]) -> list[list[np.ndarray]]:
+        """Detect text polygons in many crops with as few CRAFT runs as possible.
+
+        Crops are packed onto canvases no larger than the detector's canvas size
+        (divided by ``mag_ratio``), so every crop is scaled exactly as it would
+        be on its own. Polygons are assigned to the crop holding their centre
+        and returned in that crop's coordinates.
+        """
+        opt = self.opt2val
+        max_side = int(opt.get("canvas_size", 2560) / max(opt.get("mag_ratio", 1.0), 1e-6))
+        polys_per_crop: list[list[np.ndarray]] = [[] for _ in crops]
+
+        packable = []
+        for i, crop in enumerate(crops):
+            if max(crop.shape[:2]) + 2 * _PACK_GAP > max_side:
+                # Too large to share a canvas; the detector downscales it anyway
+                polys_per_crop[i] = [np.asarray(p, dtype=np.float32) for p in self._detect(crop)[1]]
+            else:
+                packable.append(i)
+
+        sizes = [crops[i].shape[:2] for i in packable]
+        for placements in _pack_crops(sizes, max_side):
+            height = max(y + sizes[j][0] for j, _, y in placements) + _PACK_GAP
+            width = max(x + sizes[j][1] for j, x, _ in placements) + _PACK_GAP
+            canvas = np.zeros((height, width, 3), dtype=np.uint8)
+            origins = np.zeros((len(placements), 4), dtype=np.float32)
+            for k, (j, x, y) in enumerate(placements):
+                h, w = sizes[j]
+                canvas[y:y + h, x:x + w] = crops[packable[j]][..., :3]
+                origins[k] = (x, y, x + w, y + h)
+
+            _, polys = self._detect(canvas)
+            for poly in polys:
+                poly = np.asarray(poly, dtype=np.float32).reshape(-1, 2)
+                cx, cy = poly.mean(axis=0)
+                inside = np.flatnonzero(
+                    (origins[:, 0] <= cx) & (cx < origins[:, 2]) & (origins[:, 1] <= cy) & (cy < origins[:, 3])
+                )
+                if inside.size == 0:
+                    continue
+                k = int(inside[0])
+                j = placements[k][0]
+                x1, y1, x2, y2 = origins[k]
+                local = poly - (x1, y1)
+                local[:, 0] = np.clip(local[:, 0], 0, x2 - x1)
+                local[:, 1] = np.clip(local[:, 1], 0, y2 - y1)
+                polys_per_crop[packable[j]].append(local)
+        return polys_per_crop
+
     # Recognition
     def _prepare_recognition_crops(self, img_cv_grey: np.ndarray, horizontal_list, free_list):
         imgH = self.opt2val.get("imgH", 64)
@@ -104,9 +201,8 @@ class PororoOCREngineONNX(OCREngine):
         imgH = opt.get("imgH", 64)
         imgW = opt.get("imgW", 640)
         adjust_contrast = opt.get("adjust_contrast", 0.5)
-        batch_size = opt.get("batch_size", 1)
+        batch_size = getattr(self, "rec_batch_size", 1)
 
-        import math
         # We'll implement a small numpy-based normalize+pad to avoid torch dependency
         def normalize_pad_numpy(pil_image: Image.Image, max_size=(1, imgH, imgW)) -> np.ndarray:
             # pil_image is mode 'L'
@@ -140,18 +236,21 @@ class PororoOCREngineONNX(OCREngine):
                 resized_w = math.ceil(imgH * ratio)
             return pil.resize((resized_w, imgH), Image.BICUBIC)
 
-        tensors = []
-        for im in img_list:
-            resized = _resize(im)
-            t = normalize_pad_numpy(resized, max_size=(1, imgH, imgW))  # (1,H,Wpad)
-            tensors.append(t[np.newaxis, ...])
-        # batch_tensor shape: (N,1,H,W)
-        batch_tensor = np.concatenate(tensors, axis=0).astype(np.float32)
+        resized_list = [_resize(im) for im in img_list]
+        # Batch lines of similar aspect ratio, as PP-OCR does; with a dynamic width
+        # axis each batch is only padded to its widest line instead of imgW
+        order = np.argsort([im.size[0] for im in resized_list], kind="stable")
 
-        results = []
+        results = [None] * len(resized_list)
         converter = self.converter
-        for start in range(0, batch_tensor.shape[0], batch_size):
-            chunk = batch_tensor[start:start+batch_size]
+        for start in range(0, len(order), batch_size):
+            idxs = order[start:start+batch_size]
+            width = imgW
+            if getattr(self, "rec_dynamic_width", False):
+                widest = max(resized_list[i].size[0] for i in idxs)
+                width = min(imgW, 32 * math.ceil(widest / 32))
+            # chunk shape: (N,1,H,W)
+            chunk = np.stack([normalize_pad_numpy(resized_list[i], max_size=(1, imgH, width)) for i in idxs])
             preds = self.rec_sess.run(None, {self.rec_sess.get_inputs()[0].name: chunk})[0]
             # preds: (N, length, num_classes)
             # compute softmax along classes axis
@@ -164,8 +263,8 @@ class PororoOCREngineONNX(OCREngine):
             max_prob = probs.max(axis=2)
             cumprods = np.cumprod(max_prob, axis=1)
             confs = cumprods[:, -1]
-            for s, conf in zip(strings, confs.tolist()):
-                results.append([s, float(conf)])
+            for i, s, conf in zip(idxs, strings, confs.tolist()):
+                results[i] = [s, float(conf)]
 
         out = []
         for coord_box, (text, score) in zip(coord, results):
@@ -175,10 +274,27 @@ class PororoOCREngineONNX(OCREngine):
     # Public API
     def read(self, image):  # type: ignore
         opt = self.opt2val
-        opt.setdefault("batch_size", 1)
         opt.setdefault("skip_details", False)
         opt.setdefault("paragraph", False)
         opt.setdefault("min_size", 20)
+
+        _, img_cv_grey = reformat_input(image)
+        boxes, polys = self._detect(image if isinstance(image, np.ndarray) else img_cv_grey)
+
+        image_list = self._line_crops(img_cv_grey, polys)
+        # Guard against empty image list (shouldn't happen after fallback)
+        if not image_list:
+            return [] if opt["skip_details"] else []
+        result = self._recognize(image_list)
+        if opt["paragraph"]:
+            result = get_paragraph(result, mode="ltr")  # type: ignore
+        if opt["skip_details"]:
+            return [item[1] for item in result]  # type: ignore
+        return result  # type: ignore
+
+    def _line_crops(self, img_cv_grey: np.ndarray, polys) -> list:
+        """Group detected polygons into text lines and cut them out of the grey image."""
+        opt = self.opt2val
         # thresholds (defaults match Reader.__call__)
         slope_ths = opt.setdefault("slope_ths", 0.1)
         ycenter_ths = opt.setdefault("ycenter_ths", 0.5)
@@ -186,9 +302,6 @@ class PororoOCREngineONNX(OCREngine):
         width_ths = opt.setdefault("width_ths", 0.5)
         add_margin = opt.setdefault("add_margin", 0.1)
 
-        _, img_cv_grey = reformat_input(image)
-        boxes, polys = self._detect(image if isinstance(image, np.ndarray) else img_cv_grey)
-
         # Reconstruct text_box list (flattened polys) as expected by group_text_box
         text_box = []
         for p in polys:
@@ -216,44 +329,27 @@ class PororoOCREngineONNX(OCREngine):
 
         # Fallback: if no boxes detected / retained, treat whole image
         if not horizontal_list and not free_list:
-            image_list = self._prepare_recognition_crops(img_cv_grey, None, None)
-        else:
-            image_list = self._prepare_recognition_crops(img_cv_grey, horizontal_list, free_list)
-
-        # Guard against empty image list (shouldn't happen after fallback)
-        if not image_list:
-            return [] if opt["skip_details"] else []
-        result = self._recognize(image_list)
-        if opt["paragraph"]:
-            result = get_paragraph(result, mode="ltr")  # type: ignore
-        if opt["skip_details"]:
-            return [item[1] for item in result]  # type: ignore
-        return result  # type: ignore
+            return self._prepare_recognition_crops(img_cv_grey, None, None)
+        return self._prepare_recognition_crops(img_cv_grey, horizontal_list, free_list)
 
     # OCREngine interface
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]): 
         # ensure defaults present
-        self.opt2val.setdefault("batch_size", 1)
         self.opt2val.setdefault("skip_details", False)
         self.opt2val.setdefault("paragraph", False)
         self.opt2val.setdefault("min_size", 20)
+        expansion_percentage = getattr(self, 'expansion_percentage', 5)
 
+        jobs = []
         for blk in blk_list:
-            if getattr(blk, 'bubble_xyxy', None) is not None:
-                x1, y1, x2, y2 = blk.bubble_xyxy
+            cropped = self.crop_block(img, blk, expansion_percentage)
+            if cropped is None:
+                blk.text = ''
             else:
-                x1, y1, x2, y2 = adjust_text_line_coordinates(
-                    blk.xyxy,
-                    getattr(self, 'expansion_percentage', 5),
-                    getattr(self, 'expansion_percentage', 5),
-                    img,
-                )
-            
-            # Convert to integers for slicing
-            x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-            
-            if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                cropped = img[y1:y2, x1:x2]
+                jobs.append((blk, cropped))
+
+        if not getattr(self, 'page_batching', True):
+            for blk, cropped in jobs:
                 # run full pipeline on cropped region
                 # detection+recognition expects color or grey; keep as is
                 res = self.read(cropped)
@@ -264,6 +360,23 @@ class PororoOCREngineONNX(OCREngine):
                     blk.text = ' '.join(res)
                 else:
                     blk.text = ''
-            else:
-                blk.text = ''
+            return blk_list
+
+        # One detector pass for all bubbles, then one recognition queue for all their lines
+        polys_per_crop = self._detect_crops([cropped for _, cropped in jobs])
+        image_list, owners = [], []
+        for k, ((_, cropped), polys) in enumerate(zip(jobs, polys_per_crop)):
+            _, img_cv_grey = reformat_input(cropped)
+            lines = self._line_crops(img_cv_grey, polys)
+            image_list.extend(lines)
+            owners.extend([k] * len(lines))
+
+        results = self._recognize(image_list) if image_list else []
+        per_block = [[] for _ in jobs]
+        for k, result in zip(owners, results):
+            per_block[k].append(result)
+        for (blk, _), result in zip(jobs, per_block):
+            if self.opt2val["paragraph"] and result:
+                result = get_paragraph(result, mode="ltr")  # type: ignore
+            blk.text = ' '.join([r[1] for r in result])
         return blk_list
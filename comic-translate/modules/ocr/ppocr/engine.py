@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import List, Tuple, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple, Optional
 import numpy as np
 import onnxruntime as ort
 
 from ..base import OCREngine
 from modules.utils.textblock import TextBlock
 from modules.utils.pipeline_utils import lists_to_blk_list
-from modules.utils.device import get_providers
-from modules.utils.download import ModelDownloader, ModelID
-from .preprocessing import det_preprocess, crop_quad, rec_resize_norm
+from modules.utils.device import create_session
+from modules.utils.download import ModelDownloader, ModelID, quantized_variant
+from .preprocessing import det_preprocess, crop_quad, quad_size, rec_resize_norm
 from .postprocessing import DBPostProcessor, CTCLabelDecoder
 
 
@@ -38,16 +40,26 @@ class PPOCRv5Engine(OCREngine):
 		)
 		self.decoder: Optional[CTCLabelDecoder] = None
 		self.rec_img_shape = (3, 48, 320)
+		# Recognition batches are capped by padded pixels (N x H x W), not crop count
+		self.rec_pixel_budget = 32 * 48 * 320
+		# Start a new batch rather than pad more than this share of it
+		self.rec_max_pad_ratio = 0.25
+		self._rec_buffers = threading.local()
+		self._prep_pool: Optional[ThreadPoolExecutor] = None
 
 	def initialize(
 		self, 
 		lang: str = 'ch', 
 		device: str = 'cpu', 
-		det_model: str = 'mobile'
+		det_model: str = 'mobile',
+		quantized: bool = False
 	) -> None:
 		# Ensure models present
 		det_id = ModelID.PPOCR_V5_DET_MOBILE if det_model == 'mobile' else ModelID.PPOCR_V5_DET_SERVER
 		rec_id = LANG_TO_REC_MODEL.get(lang, ModelID.PPOCR_V5_REC_LATIN_MOBILE)
+		if quantized:
+			# Only the recognizer is quantized; the detector is small and sensitive to it
+			rec_id = quantized_variant(rec_id)
 		ModelDownloader.ensure([det_id, rec_id])
 
 		# Load ONNX sessions
@@ -58,11 +70,10 @@ class PPOCRv5Engine(OCREngine):
 		dict_file = [p for n, p in rec_paths.items() if n.endswith('.txt')]
 		dict_path = dict_file[0] if dict_file else None
 
-		providers = get_providers(device)
-		sess_opt = ort.SessionOptions()
-		sess_opt.log_severity_level = 3
-		self.det_sess = ort.InferenceSession(det_path, sess_options=sess_opt, providers=providers)
-		self.rec_sess = ort.InferenceSession(rec_model, sess_options=sess_opt, providers=providers)
+		self.det_sess = create_session(det_path, device, log_severity_level=3)
+		self.rec_sess = create_session(rec_model, device, log_severity_level=3)
+		self.det_io = (self.det_sess.get_inputs()[0].name, self.det_sess.get_outputs()[0].name)
+		self.rec_io = (self.rec_sess.get_inputs()[0].name, self.rec_sess.get_outputs()[0].name)
 
 		# Prepare CTC decoder
 		if dict_path:
@@ -79,40 +90,121 @@ class PPOCRv5Engine(OCREngine):
 	def _det_infer(self, img: np.ndarray) -> Tuple[np.ndarray, List[float]]:
 		assert self.det_sess is not None
 		inp = det_preprocess(img, limit_side_len=960, limit_type='min')
-		input_name = self.det_sess.get_inputs()[0].name
-		output_name = self.det_sess.get_outputs()[0].name
+		input_name, output_name = self.det_io
 		pred = self.det_sess.run([output_name], {input_name: inp})[0]
 		boxes, scores = self.det_post(pred, (img.shape[0], img.shape[1]))
 		return boxes, scores
 
+	def _plan_rec_batches(self, ratios: np.ndarray) -> List[Tuple[np.ndarray, float]]:
+		"""Group crops into recognition batches by aspect ratio.
+
+		Crops are taken narrowest first. A batch closes when adding the next
+		crop would push its padded size over ``rec_pixel_budget`` or its
+		padding over ``rec_max_pad_ratio``; a crop too wide for the budget
+		gets a batch of its own.
+
+		Returns:
+			(crop indices, max width/height ratio) per batch.
+		"""
+		_, H, _ = self.rec_img_shape
+		widths = np.ceil(H * ratios)
+		batches = []
+		current: List[int] = []
+		used = 0.0
+		for i in np.argsort(ratios, kind='stable'):
+			n = len(current) + 1
+			padded = n * widths[i]
+			if current and (
+				padded * H > self.rec_pixel_budget
+				or padded - (used + widths[i]) > self.rec_max_pad_ratio * padded
+			):
+				batches.append((np.array(current), float(ratios[current[-1]])))
+				current, used = [], 0.0
+			current.append(int(i))
+			used += widths[i]
+		if current:
+			batches.append((np.array(current), float(ratios[current[-1]])))
+		return batches
+
+	def _rec_buffer(self, slot: int, size: int) -> np.ndarray:
+		"""Flat float32 input buffer for the calling thread, grown on demand."""
+		buffers = getattr(self._rec_buffers, 'slots', None)
+		if buffers is None:
+			buffers = self._rec_buffers.slots = [np.empty(0, np.float32), np.empty(0, np.float32)]
+		if buffers[slot].size < size:
+			buffers[slot] = np.empty(size, np.float32)
+		return buffers[slot]
+
+	def _rec_run(
+		self,
+		ratios: np.ndarray,
+		get_crop: Callable[[int], np.ndarray],
+	) -> Tuple[List[str], List[float]]:
+		"""Recognize crops in budgeted batches, preparing one batch ahead.
+
+		While ONNX Runtime runs a batch, a helper thread crops and normalizes
+		the next one into the other of two reused input buffers.
+		"""
+		assert self.rec_sess is not None and self.decoder is not None
+		c, H, _ = self.rec_img_shape
+		batches = self._plan_rec_batches(ratios)
+		shapes = [(len(idxs), c, H, int(H * max_ratio)) for idxs, max_ratio in batches]
+		largest = max(int(np.prod(shape)) for shape in shapes)
+		# Fetched here: the buffers belong to the calling thread, not the helper
+		buffers = [self._rec_buffer(slot, largest) for slot in (0, 1)]
+
+		def prepare(b: int) -> np.ndarray:
+			idxs, max_ratio = batches[b]
+			shape = shapes[b]
+			x = buffers[b % 2][:int(np.prod(shape))].reshape(shape)
+			for row, i in enumerate(idxs):
+				rec_resize_norm(get_crop(i), self.rec_img_shape, max_ratio, out=x[row])
+			return x
+
+		if self._prep_pool is None:
+			self._prep_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ppocr-rec-prep')
+		texts = [""] * len(ratios)
+		confs = [0.0] * len(ratios)
+		inp_name, out_name = self.rec_io
+		pending = self._prep_pool.submit(prepare, 0)
+		try:
+			for b, (idxs, _) in enumerate(batches):
+				x = pending.result()
+				if b + 1 < len(batches):
+					pending = self._prep_pool.submit(prepare, b + 1)
+				logits = self.rec_sess.run([out_name], {inp_name: x})[0]  # (N, T, C) or (N, C, T)
+				if logits.ndim == 3 and logits.shape[1] > logits.shape[2]:
+					# If output is (N, C, T), transpose to (N, T, C)
+					logits = np.transpose(logits, (0, 2, 1))
+				# Match PaddleOCR behavior: do not drop characters by per-step prob threshold
+				dec_texts, dec_confs = self.decoder(logits, prob_threshold=0.0)
+				for oi, t, s in zip(idxs, dec_texts, dec_confs):
+					texts[oi] = t
+					confs[oi] = float(s)
+		finally:
+			# Never leave a prepare running into buffers the next call reuses
+			if not pending.cancel():
+				pending.exception()
+		return texts, confs
+
 	def _rec_infer(self, crops: List[np.ndarray]) -> Tuple[List[str], List[float]]:
 		assert self.rec_sess is not None and self.decoder is not None
 		if not crops:
 			return [], []
-		# batch by padded width heuristic
-		ratios = [c.shape[1] / float(max(1, c.shape[0])) for c in crops]
-		order = np.argsort(ratios)
-		texts = [""] * len(crops)
-		confs = [0.0] * len(crops)
-		bs = 8
-		c, H, W = self.rec_img_shape
-		for b in range(0, len(crops), bs):
-			idxs = order[b:b+bs]
-			max_ratio = max(ratios[i] for i in idxs) if idxs.size > 0 else (W/float(H))
-			batch = [rec_resize_norm(crops[i], self.rec_img_shape, max_ratio)[None, ...] for i in idxs]
-			x = np.concatenate(batch, axis=0).astype(np.float32)
-			inp_name = self.rec_sess.get_inputs()[0].name
-			out_name = self.rec_sess.get_outputs()[0].name
-			logits = self.rec_sess.run([out_name], {inp_name: x})[0]  # (N, T, C) or (N, C, T)
-			if logits.ndim == 3 and logits.shape[1] > logits.shape[2]:
-				# If output is (N, C, T), transpose to (N, T, C)
-				logits = np.transpose(logits, (0, 2, 1))
-			# Match PaddleOCR behavior: do not drop characters by per-step prob threshold
-			dec_texts, dec_confs = self.decoder(logits, prob_threshold=0.0)
-			for oi, t, s in zip(idxs, dec_texts, dec_confs):
-				texts[oi] = t
-				confs[oi] = float(s)
-		return texts, confs
+		ratios = np.array([c.shape[1] / float(max(1, c.shape[0])) for c in crops])
+		return self._rec_run(ratios, crops.__getitem__)
+
+	def _rec_infer_quads(self, img: np.ndarray, quads: np.ndarray) -> Tuple[List[str], List[float]]:
+		"""Recognize quadrilateral regions of an image, cropping each one lazily per batch."""
+		if len(quads) == 0:
+			return [], []
+		ratios = []
+		for quad in quads:
+			h, w = quad_size(quad)
+			if h > 0 and w > 0 and (h / float(w)) >= 1.5:
+				h, w = w, h  # crop_quad rotates tall crops
+			ratios.append(w / float(max(1, h)))
+		return self._rec_run(np.array(ratios), lambda i: crop_quad(img, quads[i].astype(np.float32)))
 
 	def process_image(self, img: np.ndarray, blk_list: List[TextBlock]) -> List[TextBlock]:
 		if self.det_sess is None or self.rec_sess is None or self.decoder is None:
@@ -120,8 +212,7 @@ class PPOCRv5Engine(OCREngine):
 		boxes, _ = self._det_infer(img)
 		if boxes is None or len(boxes) == 0:
 			return blk_list
-		crops = [crop_quad(img, quad.astype(np.float32)) for quad in boxes]
-		texts, _ = self._rec_infer(crops)
+		texts, _ = self._rec_infer_quads(img, boxes)
 		# map quads -> axis-aligned boxes
 		bboxes = []
 		for quad in boxes:
@@ -42,11 +42,13 @@ def det_preprocess(img: np.ndarray, mean=(0.5, 0.5, 0.5), std=(0.5, 0.5, 0.5),
 	return x
 
 
-def rec_resize_norm(img: np.ndarray, img_shape=(3, 48, 320), max_wh_ratio: float | None = None) -> np.ndarray:
+def rec_resize_norm(img: np.ndarray, img_shape=(3, 48, 320), max_wh_ratio: float | None = None,
+					out: np.ndarray | None = None) -> np.ndarray:
 	"""Resize and normalize for PP-OCR recognition (CTC):
 	- target H=img_shape[1], W computed from ratio, padded to target width.
 	- normalize to [-1,1].
-	Returns CHW float32 padded array.
+	Returns CHW float32 padded array, written into ``out`` (shape (C, H, target W))
+	when given instead of a new array.
 	"""
 	c, H, W = img_shape
 	assert img.shape[2] == c, "Expect BGR with 3 channels"
@@ -60,20 +62,31 @@ def rec_resize_norm(img: np.ndarray, img_shape=(3, 48, 320), max_wh_ratio: float
 	resized_w = min(target_w, int(np.ceil(H * ratio)))
 
 	resized = imk.resize(img, (resized_w, H))
-	x = resized.astype(np.float32) / 255.0
-	x = x.transpose(2, 0, 1)
-	x = (x - 0.5) / 0.5
-
-	out = np.zeros((c, H, target_w), dtype=np.float32)
-	out[:, :, :resized_w] = x
+	if out is None:
+		out = np.zeros((c, H, target_w), dtype=np.float32)
+	else:
+		out[:, :, resized_w:] = 0.0
+	# Same arithmetic as (x / 255 - 0.5) / 0.5, done in place in the output
+	x = out[:, :, :resized_w]
+	np.copyto(x, resized.transpose(2, 0, 1))
+	x /= 255.0
+	x -= 0.5
+	x /= 0.5
 	return out
 
 
-def crop_quad(img: np.ndarray, quad: np.ndarray) -> np.ndarray:
-	"""Perspective-crop a quadrilateral region. Auto-rotate tall crops."""
+def quad_size(quad: np.ndarray) -> tuple[int, int]:
+	"""(h, w) of the crop ``crop_quad`` cuts for a quadrilateral, before rotation."""
 	pts = quad.astype(np.float32)
 	w = int(max(np.linalg.norm(pts[0]-pts[1]), np.linalg.norm(pts[2]-pts[3])))
 	h = int(max(np.linalg.norm(pts[0]-pts[3]), np.linalg.norm(pts[1]-pts[2])))
+	return h, w
+
+
+def crop_quad(img: np.ndarray, quad: np.ndarray) -> np.ndarray:
+	"""Perspective-crop a quadrilateral region. Auto-rotate tall crops."""
+	pts = quad.astype(np.float32)
+	h, w = quad_size(pts)
 	dst = np.array([[0,0],[w,0],[w,h],[0,h]], dtype=np.float32)
 	# imkit expects 4x2 arrays (x,y)
 	M = imk.get_perspective_transform(pts, dst)
@@ -1,6 +1,8 @@
 import numpy as np
 import cv2
-from typing import List
+import threading
+from collections import defaultdict
+from typing import List, Optional
 from PIL import Image
 import logging
 
@@ -12,26 +14,48 @@ logger = logging.getLogger(__name__)
 class VietOCREngine(OCREngine):
     """Vietnamese OCR engine using VietOCR models with Multi-line Support."""
     
+    # Loaded predictors by (model name, device); weights are only read once per process
+    _predictors = {}
+    _predictors_lock = threading.Lock()
+    
     def __init__(self):
         super().__init__()
         self.predictor = None
         self.device = 'cpu'
+        self.max_batch_size = 32
     
-    def initialize(self, device: str = 'cpu'):
+    def initialize(self, device: str = 'cpu', max_batch_size: int = 32):
+        """
+        Load (or reuse) the VietOCR predictor.
+        
+        Args:
+            device: 'cuda' or 'cpu'
+            max_batch_size: Text lines per batched decoder run
+        """
         try:
             from vietocr.tool.predictor import Predictor
             from vietocr.tool.config import Cfg
             
-            logger.info("Initializing VietOCR engine...")
+            self.max_batch_size = max(1, max_batch_size)
+            model_name = 'vgg_transformer'
+            torch_device = 'cuda:0' if device == 'cuda' else 'cpu'
             
-            # Sử dụng vgg_transformer (hoặc vgg_seq2seq nếu muốn nhanh hơn)
-            config = Cfg.load_config_from_name('vgg_transformer')
-            config['device'] = 'cuda:0' if device == 'cuda' else 'cpu'
-            config['predictor']['beamsearch'] = False # Tắt beamsearch để tăng tốc
+            with self._predictors_lock:
+                predictor = self._predictors.get((model_name, torch_device))
+                if predictor is None:
+                    logger.info("Initializing VietOCR engine...")
+                    
+                    # Sử dụng vgg_transformer (hoặc vgg_seq2seq nếu muốn nhanh hơn)
+                    config = Cfg.load_config_from_name(model_name)
+                    config['device'] = torch_device
+                    config['predictor']['beamsearch'] = False # Tắt beamsearch để tăng tốc
+                    
+                    predictor = Predictor(config)
+                    self._predictors[(model_name, torch_device)] = predictor
+                    logger.info(f"VietOCR initialized successfully on {device}")
             
-            self.predictor = Predictor(config)
+            self.predictor = predictor
             self.device = device
-            logger.info(f"VietOCR initialized successfully on {device}")
             
         except Exception as e:
             logger.error(f"Failed to initialize VietOCR: {e}")
@@ -108,6 +132,69 @@ class VietOCREngine(OCREngine):
         if not lines: return [img_cv2]
         return lines
 
+    def _predict_lines(self, lines: List[Image.Image]) -> List[str]:
+        """
+        Recognize many text lines with batched greedy decoding.
+        
+        Lines are resized exactly as Predictor.predict does and grouped by
+        resized width, so each batch is a dense tensor and every line decodes
+        to the same text as a single predict() call.
+        
+        Args:
+            lines: Line images
+            
+        Returns:
+            Recognized text per line
+        """
+        predictor = self.predictor
+        if predictor.config['predictor']['beamsearch']:
+            return [predictor.predict(line) for line in lines]
+        
+        import torch
+        from vietocr.tool.translate import process_input, translate
+        
+        dataset = predictor.config['dataset']
+        tensors = []
+        buckets = defaultdict(list)
+        for i, line in enumerate(lines):
+            tensor = process_input(
+                line, dataset['image_height'], dataset['image_min_width'], dataset['image_max_width']
+            )
+            tensors.append(tensor)
+            buckets[tensor.shape[-1]].append(i)
+        
+        texts = [''] * len(lines)
+        for idxs in buckets.values():
+            for start in range(0, len(idxs), self.max_batch_size):
+                chunk = idxs[start:start + self.max_batch_size]
+                batch = torch.cat([tensors[i] for i in chunk], 0).to(predictor.device)
+                token_ids, _ = translate(batch, predictor.model)
+                for i, ids in zip(chunk, token_ids.tolist()):
+                    texts[i] = predictor.vocab.decode(ids)
+        return texts
+
+    def _predict_each(self, lines: List[Image.Image], owners: List[int]) -> List[Optional[str]]:
+        """
+        Recognize lines with one predict() call each, as before batching.
+        
+        A failing line fails its block: the block's remaining lines are
+        skipped and all of its lines come back as None.
+        """
+        texts = [None] * len(lines)
+        failed = set()
+        for i, (line, owner) in enumerate(zip(lines, owners)):
+            if owner in failed:
+                continue
+            try:
+                texts[i] = self.predictor.predict(line)
+            except Exception as e:
+                logger.warning(f"VietOCR line recognition failed - {e}")
+                failed.add(owner)
+        for i, owner in enumerate(owners):
+            if owner in failed:
+                texts[i] = None
+        return texts
+
     def process_image(self, image: np.ndarray, blk_list: List[TextBlock]) -> List[TextBlock]:
         if self.predictor is None:
             raise RuntimeError("VietOCR not initialized.")
@@ -121,6 +208,10 @@ class VietOCREngine(OCREngine):
         
         logger.info(f"Processing {len(blk_list)} blocks with VietOCR (Multi-line Split)")
         
+        # Lines of every block on the page, recognized together below
+        line_pils = []
+        line_owners = []
+        page_blocks = []
         for idx, blk in enumerate(blk_list):
             try:
                 x1, y1, x2, y2 = map(int, blk.xyxy)
@@ -136,28 +227,37 @@ class VietOCREngine(OCREngine):
                 # 2. TÁCH DÒNG (Bước quan trọng mới thêm)
                 text_lines_imgs = self._split_lines(bubble_img)
                 
-                full_text_parts = []
-                
-                # 3. Đọc từng dòng
+                # Chuyển về PIL để đưa vào VietOCR
                 for line_img in text_lines_imgs:
-                    # Chuyển về PIL để đưa vào VietOCR
-                    line_pil = Image.fromarray(line_img)
-                    
-                    # Resize/Preprocess nếu cần (VietOCR tự handle resize khá tốt)
-                    # Nhưng tốt nhất nên giữ chiều cao khoảng 32px
-                    
-                    # Predict
-                    text = self.predictor.predict(line_pil)
-                    if text.strip():
-                        full_text_parts.append(text.strip())
-                
-                # 4. Gộp kết quả
-                blk.text = " ".join(full_text_parts) # Hoặc "\n".join() nếu muốn giữ xuống dòng
+                    line_pils.append(Image.fromarray(line_img))
+                    line_owners.append(len(page_blocks))
+                page_blocks.append(blk)
                 
             except Exception as e:
                 logger.warning(f"Block {idx}: VietOCR process failed - {e}")
                 blk.text = ""
         
+        if not page_blocks:
+            return blk_list
+        
+        # 3. Đọc tất cả các dòng của trang cùng lúc
+        try:
+            texts = self._predict_lines(line_pils)
+        except Exception as e:
+            logger.warning(f"VietOCR batched recognition failed, reading lines one by one - {e}")
+            texts = self._predict_each(line_pils, line_owners)
+        
+        # 4. Gộp kết quả
+        full_text_parts = [[] for _ in page_blocks]
+        failed = set()
+        for owner, text in zip(line_owners, texts):
+            if text is None:
+                failed.add(owner)
+            elif text.strip():
+                full_text_parts[owner].append(text.strip())
+        for owner, (blk, parts) in enumerate(zip(page_blocks, full_text_parts)):
+            blk.text = "" if owner in failed else " ".join(parts) # Hoặc "\n".join() nếu muốn giữ xuống dòng
+        
         return blk_list
 
     # Giữ nguyên hàm recognize() cũ hoặc update tương tự nếu cần dùng lẻ
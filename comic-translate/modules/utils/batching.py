@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Sequence
+
+
+class MicroBatcher:
+    """Collect single-item calls from concurrent threads and run them as one batch.
+
+    The first pending item opens a collection window of ``max_wait_ms``. Items
+    arriving in that window (up to ``max_batch_size``) are handed to
+    ``batch_fn`` together and each caller receives its own result.
+
+    Args:
+        batch_fn: Callable taking a list of items and returning a list of
+            results in the same order.
+        max_batch_size: Maximum number of items per batch.
+        max_wait_ms: Maximum time the first item waits for companions.
+        name: Name for the dispatcher thread.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[Any]], Sequence[Any]],
+        max_batch_size: int = 4,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        # Guards _closed so no item is queued behind the stop sentinel
+        self._close_lock = threading.Lock()
+        self.batches_run = 0
+        self.items_run = 0
+
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Any:
+        """Queue ``item`` and block until its result is available."""
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((item, future))
+        return future.result()
+
+    def close(self) -> None:
+        """Stop the dispatcher after the already-queued items are processed."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items_run / self.batches_run if self.batches_run else 0.0
+
+    def _loop(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stopping = True
+                    break
+                batch.append(nxt)
+
+            self._run(batch)
+
+    def _run(self, batch: list[tuple[Any, Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = self.batch_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(items)} items"
+                )
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches_run += 1
+        self.items_run += len(items)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
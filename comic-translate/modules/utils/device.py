@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
+import threading
 from typing import Any, Mapping, Optional
 import onnxruntime as ort
 
+logger = logging.getLogger(__name__)
+
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+default_optimized_model_dir = os.path.join(project_root, 'models', 'onnx-optimized')
+
 
 def torch_available() -> bool:
     """Check if torch is available without raising import errors."""
@@ -86,6 +96,16 @@ def _resolve_onnx_device() -> str:
     # Fallback to CPU
     return "cpu"
 
+def int8_models_enabled(settings, device: str) -> bool:
+    """Return True if INT8 model variants were requested and the engine runs on CPU.
+
+    Quantized models only pay off on the CPU provider, so GPU devices always
+    get the FP32 models. Settings without ``is_int8_enabled`` opt out.
+    """
+    if device != "cpu" or not hasattr(settings, 'is_int8_enabled'):
+        return False
+    return bool(settings.is_int8_enabled())
+
 def tensors_to_device(data: Any, device: str) -> Any:
     """Move tensors in nested containers to device; returns the same structure.
     Supports dict, list/tuple, and tensors. Other objects are returned as-is.
@@ -131,3 +151,154 @@ def get_providers(device: Optional[str] = None) -> list[str]:
         return ['CPUExecutionProvider']
 
     return available if available else ['CPUExecutionProvider']
+
+
+# ONNX Runtime session profiles
+#
+# latency:    one session owns the machine; ORT uses every core per run.
+# throughput: several sessions run at once; cores are split between them and
+#             idle threads do not spin, to avoid oversubscription.
+# low-memory: like throughput, but without the memory arena and the
+#             pre-planned memory pattern, trading speed for a smaller footprint.
+SESSION_PROFILES = ('latency', 'throughput', 'low-memory')
+
+_session_config = {
+    'profile': 'latency',
+    'intra_op_threads': 0,      # 0 = derived from the profile
+    'parallel_sessions': 1,     # sessions expected to run at the same time
+    'optimized_model_dir': default_optimized_model_dir,
+    'cache_optimized': True,
+}
+
+
+def configure_sessions(
+    profile: Optional[str] = None,
+    intra_op_threads: Optional[int] = None,
+    parallel_sessions: Optional[int] = None,
+    optimized_model_dir: Optional[str] = None,
+    cache_optimized: Optional[bool] = None,
+) -> None:
+    """Set process-wide defaults for sessions built by ``create_session``.
+
+    Args:
+        profile: One of SESSION_PROFILES.
+        intra_op_threads: Threads per session run; 0 derives it from the profile.
+        parallel_sessions: How many sessions may run concurrently on this
+            machine (throughput/low-memory split the cores between them).
+        optimized_model_dir: Where optimized graphs are cached.
+        cache_optimized: Save optimized graphs and reload them on later starts.
+    """
+    if profile is not None and profile not in SESSION_PROFILES:
+        raise ValueError(f"Unknown ONNX session profile {profile!r}, expected one of {SESSION_PROFILES}")
+    updates = {
+        'profile': profile,
+        'intra_op_threads': intra_op_threads,
+        'parallel_sessions': parallel_sessions,
+        'optimized_model_dir': optimized_model_dir,
+        'cache_optimized': cache_optimized,
+    }
+    _session_config.update({k: v for k, v in updates.items() if v is not None})
+
+
+def make_session_options(profile: Optional[str] = None, **overrides) -> ort.SessionOptions:
+    """Build SessionOptions for a profile.
+
+    Args:
+        profile: Profile name (defaults to the configured profile).
+        **overrides: SessionOptions attributes to set afterwards,
+            e.g. ``log_severity_level=3``.
+    """
+    profile = profile or _session_config['profile']
+    if profile not in SESSION_PROFILES:
+        raise ValueError(f"Unknown ONNX session profile {profile!r}, expected one of {SESSION_PROFILES}")
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.inter_op_num_threads = 1
+
+    threads = _session_config['intra_op_threads']
+    if profile == 'latency':
+        options.intra_op_num_threads = threads  # 0 lets ORT use all cores
+    else:
+        cores = os.cpu_count() or 1
+        options.intra_op_num_threads = threads or max(1, cores // max(1, _session_config['parallel_sessions']))
+        options.add_session_config_entry('session.intra_op.allow_spinning', '0')
+
+    if profile == 'low-memory':
+        options.enable_cpu_mem_arena = False
+        options.enable_mem_pattern = False
+
+    for name, value in overrides.items():
+        setattr(options, name, value)
+    return options
+
+
+# Saved graphs stop before the layout optimizations, which depend on the CPU
+# the graph was optimized on; those are re-applied cheaply on every load.
+_SAVED_OPTIMIZATION_LEVEL = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+
+
+def _optimized_model_path(model_path: str, providers: list) -> str:
+    """Cache file for a model's optimized graph, unique to its content and runtime."""
+    stat = os.stat(model_path)
+    key = '|'.join(map(str, (
+        os.path.abspath(model_path), stat.st_size, stat.st_mtime_ns,
+        ort.__version__, ','.join(providers), _SAVED_OPTIMIZATION_LEVEL,
+    )))
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(_session_config['optimized_model_dir'], f'{stem}-{digest}.onnx')
+
+
+def create_session(
+    model_path: str,
+    device: Optional[str] = None,
+    profile: Optional[str] = None,
+    providers: Optional[list] = None,
+    **overrides,
+) -> ort.InferenceSession:
+    """Create an InferenceSession using the configured profile.
+
+    On CPU the graph optimized up to ``ORT_ENABLE_EXTENDED`` is saved next to
+    the other cached graphs and loaded on later starts, so only the
+    hardware-specific layout optimizations run again. Such graphs carry no
+    CPU-specific kernels, so a cache shared between machines stays valid.
+    Cached graphs are keyed on the model file and ORT version.
+
+    Args:
+        model_path: Path to the .onnx file.
+        device: Device hint passed to ``get_providers``.
+        profile: Profile name (defaults to the configured profile).
+        providers: Explicit provider list (overrides ``device``).
+        **overrides: SessionOptions attributes, see ``make_session_options``.
+    """
+    providers = providers or get_providers(device)
+    options = make_session_options(profile, **overrides)
+
+    # Optimized graphs may embed provider-specific kernels; only cache CPU ones
+    if not _session_config['cache_optimized'] or providers != ['CPUExecutionProvider']:
+        return ort.InferenceSession(model_path, sess_options=options, providers=providers)
+
+    cached_path = _optimized_model_path(model_path, providers)
+    if os.path.exists(cached_path):
+        try:
+            return ort.InferenceSession(cached_path, sess_options=options, providers=providers)
+        except Exception as e:
+            logger.warning(f"Discarding unusable optimized model {cached_path}: {e}")
+            os.remove(cached_path)
+
+    tmp_path = f'{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        save_options = make_session_options(profile, **overrides)
+        save_options.graph_optimization_level = _SAVED_OPTIMIZATION_LEVEL
+        save_options.optimized_model_filepath = tmp_path
+        ort.InferenceSession(model_path, sess_options=save_options, providers=providers)
+        os.replace(tmp_path, cached_path)
+        model_path = cached_path
+    except Exception as e:
+        logger.warning(f"Could not cache optimized graph for {model_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return ort.InferenceSession(model_path, sess_options=options, providers=providers)
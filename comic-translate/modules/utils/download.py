@@ -1,5 +1,9 @@
 import os, sys, hashlib
+import shutil
+import json
 import logging
+import threading
+import time
 from enum import Enum
 from dataclasses import dataclass
 from typing import Callable, Iterable, Optional, Dict, List, Union
@@ -49,6 +53,179 @@ def calculate_md5_checksum(file_path: str) -> str:
     return md5_hash.hexdigest()
 
 
+def _file_signature(file_path: str) -> tuple:
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+def calculate_checksum(file_path: str, expected_checksum: str) -> Optional[str]:
+    """Hash a file with the algorithm implied by the expected checksum length.
+
+    Returns None for an unknown checksum format (64=sha256, 32=md5).
+    """
+    if len(expected_checksum) == 64:
+        return calculate_sha256_checksum(file_path)
+    if len(expected_checksum) == 32:
+        return calculate_md5_checksum(file_path)
+    return None
+
+
+class VerificationManifest:
+    """Persistent record of model files whose checksum has been verified.
+
+    Each entry stores the file's size, mtime and verified digest. While size
+    and mtime are unchanged the file counts as verified without re-hashing,
+    so repeat checks cost a ``stat`` of the file and of the manifest. The
+    manifest is a JSON file that several processes may share: it is re-read
+    whenever it changes on disk, and each write applies only its own change
+    to the current file, atomically.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Optional[Dict[str, dict]] = None
+        self._file_stamp: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def _stamp(self) -> Optional[tuple]:
+        try:
+            return _file_signature(self.path)
+        except OSError:
+            return None
+
+    def _read_file(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return dict(data.get('files', {}))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable model verification manifest {self.path}: {e}")
+            return {}
+
+    def _load_locked(self) -> Dict[str, dict]:
+        # Stamp before reading, so a write racing with the read triggers another reload
+        stamp = self._stamp()
+        if self._entries is None or stamp != self._file_stamp:
+            self._entries = self._read_file()
+            self._file_stamp = stamp
+        return self._entries
+
+    def _save_locked(self, changes: Dict[str, Optional[dict]]):
+        """Apply ``changes`` (None removes an entry) on top of the file's current entries.
+
+        Entries are never written back from memory, so ones another process
+        removed stay removed.
+        """
+        merged = self._read_file()
+        for file_path, entry in changes.items():
+            if entry is None:
+                merged.pop(file_path, None)
+            else:
+                merged[file_path] = entry
+        self._entries = merged
+
+        tmp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'files': merged}, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._file_stamp = self._stamp()
+        except Exception as e:
+            # Still valid for this process; only persistence is lost
+            logger.warning(f"Could not write model verification manifest {self.path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def is_verified(self, file_path: str, checksum: str, signature: tuple) -> bool:
+        with self._lock:
+            entry = self._load_locked().get(file_path)
+        return (
+            entry is not None
+            and entry.get('checksum') == checksum
+            and (entry.get('size'), entry.get('mtime_ns')) == tuple(signature)
+        )
+
+    def record(self, file_path: str, checksum: str, signature: Optional[tuple] = None):
+        size, mtime_ns = signature or _file_signature(file_path)
+        entry = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'checksum': checksum,
+            'verified_at': time.time(),
+        }
+        with self._lock:
+            self._save_locked({file_path: entry})
+
+    def forget(self, file_path: str):
+        with self._lock:
+            if file_path in self._load_locked():
+                self._save_locked({file_path: None})
+
+    def entries(self) -> Dict[str, dict]:
+        with self._lock:
+            return {path: dict(entry) for path, entry in self._load_locked().items()}
+
+
+verification_manifest = VerificationManifest(os.path.join(models_base_dir, 'verified_checksums.json'))
+
+def verify_checksum(file_path: str, expected_checksum: str) -> Optional[str]:
+    """Return the file's checksum, reusing an earlier result while size and mtime are unchanged.
+
+    Only checksums that matched ``expected_checksum`` are recorded, so a bad
+    file is re-hashed (and reported) every time. Returns None for an unknown
+    checksum format.
+    """
+    signature = _file_signature(file_path)
+    if verification_manifest.is_verified(file_path, expected_checksum, signature):
+        return expected_checksum
+
+    calculated = calculate_checksum(file_path, expected_checksum)
+    if calculated == expected_checksum:
+        verification_manifest.record(file_path, calculated, signature)
+    return calculated
+
+def reverify_checksums() -> List[str]:
+    """Re-hash every recorded file regardless of size and mtime.
+
+    Files that no longer match are dropped from the manifest, so the next
+    ``ModelDownloader.get`` re-downloads them. Returns their paths.
+    """
+    failed = []
+    for file_path, entry in verification_manifest.entries().items():
+        try:
+            ok = calculate_checksum(file_path, entry['checksum']) == entry['checksum']
+        except FileNotFoundError:
+            ok = False
+        except Exception as e:
+            logger.warning(f"Could not re-verify {file_path}: {e}")
+            continue
+        if not ok:
+            logger.error(f"Model file {file_path} no longer matches its recorded checksum")
+            verification_manifest.forget(file_path)
+            failed.append(file_path)
+    return failed
+
+def start_background_reverify(interval: float) -> threading.Event:
+    """Re-verify recorded model checksums every ``interval`` seconds on a daemon thread.
+
+    Returns an Event; set it to stop the thread.
+    """
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            try:
+                failed = reverify_checksums()
+                logger.info(f"Background model re-verification finished ({len(failed)} mismatched)")
+            except Exception as e:
+                logger.error(f"Background model re-verification failed: {e}")
+
+    threading.Thread(target=loop, name='model-reverify', daemon=True).start()
+    return stop
+
+
 class ModelID(Enum):
     MANGA_OCR_BASE = "manga-ocr-base"
     MANGA_OCR_BASE_ONNX = "manga-ocr-base-onnx"
@@ -89,6 +266,16 @@ class ModelID(Enum):
     # PPOCRv4 Classifier
     PPOCR_V4_CLS = "ppocr-v4-cls"
 
+    # INT8 variants, quantized locally from the FP32 ONNX models (CPU only)
+    RTDETRV2_ONNX_INT8 = "rtdetr-v2-onnx-int8"
+    MANGA_OCR_BASE_ONNX_INT8 = "manga-ocr-base-onnx-int8"
+    LAMA_ONNX_INT8 = "lama-manga-dynamic-int8"
+    PPOCR_V5_REC_MOBILE_INT8 = "ppocr-v5-rec-ch-mobile-int8"
+    PPOCR_V5_REC_EN_MOBILE_INT8 = "ppocr-v5-rec-en-mobile-int8"
+    PPOCR_V5_REC_KOREAN_MOBILE_INT8 = "ppocr-v5-rec-korean-mobile-int8"
+    PPOCR_V5_REC_LATIN_MOBILE_INT8 = "ppocr-v5-rec-latin-mobile-int8"
+    PPOCR_V5_REC_ESLAV_MOBILE_INT8 = "ppocr-v5-rec-eslav-mobile-int8"
+
 
 @dataclass(frozen=True)
 class ModelSpec:
@@ -98,6 +285,7 @@ class ModelSpec:
     sha256: List[Optional[str]]
     save_dir: str
     additional_urls: Optional[Dict[str, str]] = None  # dict filename -> url
+    derived_from: Optional[ModelID] = None  # built locally from this model instead of downloaded
 
     def as_legacy_dict(self) -> Dict[str, Union[str, List[str]]]:
         """Return a dict shaped like the old module-level *_data objects."""
@@ -172,15 +360,12 @@ class ModelDownloader:
             if expected_checksum:
                 # verify checksum by detecting algorithm via length
                 try:
-                    if len(expected_checksum) == 64:
-                        calc = calculate_sha256_checksum(file_path)
-                    elif len(expected_checksum) == 32:
-                        calc = calculate_md5_checksum(file_path)
-                    else:
-                        # unknown checksum format, skip verification
-                        continue
+                    calc = verify_checksum(file_path, expected_checksum)
                 except Exception:
                     return False
+                if calc is None:
+                    # unknown checksum format, skip verification
+                    continue
                 if calc != expected_checksum:
                     return False
         return True
@@ -207,6 +392,7 @@ def _download_single_file(file_url: str, file_path: str, expected_checksum: Opti
             return
 
         if calculated_checksum == expected_checksum:
+            verification_manifest.record(file_path, calculated_checksum)
             logger.info(f"Download model success, {algo}: {calculated_checksum}")
         else:
             try:
@@ -225,6 +411,10 @@ def _download_single_file(file_url: str, file_path: str, expected_checksum: Opti
 
 
 def _download_spec(spec: ModelSpec):
+    if spec.derived_from is not None:
+        _build_derived_spec(spec)
+        return
+
     if not os.path.exists(spec.save_dir):
         os.makedirs(spec.save_dir, exist_ok=True)
         print(f"Created directory: {spec.save_dir}")
@@ -245,24 +435,16 @@ def _download_spec(spec: ModelSpec):
                 
             # Detect hash algorithm via length: 64=sha256, 32=md5
             try:
-                if len(expected_checksum) == 64:
-                    calculated = calculate_sha256_checksum(file_path)
-                    algo = 'sha256'
-                elif len(expected_checksum) == 32:
-                    calculated = calculate_md5_checksum(file_path)
-                    algo = 'md5'
-                else:
+                calculated = verify_checksum(file_path, expected_checksum)
+                if calculated is None:
                     # Unknown checksum format: force re-download
                     print(
                         f"Unknown checksum format for {file_name} (len={len(expected_checksum)}). Redownloading..."
                     )
-                    calculated = None
-                    algo = None
             except Exception:
                 # If checksum calculation fails, force re-download
                 print(f"Failed to calculate checksum for {file_name}. Redownloading...")
                 calculated = None
-                algo = None
 
             if calculated and calculated == expected_checksum:
                 continue
@@ -275,6 +457,67 @@ def _download_spec(spec: ModelSpec):
         _download_single_file(file_url, file_path, expected_checksum)
 
 
+_DERIVED_SOURCES_FILE = 'sources.json'
+
+def _source_checksum(source: ModelSpec, file_name: str) -> str:
+    """Checksum of a (downloaded and verified) source file."""
+    expected = source.sha256[source.files.index(file_name)]
+    if expected is not None:
+        # _download_spec has just verified the file against it
+        return expected
+    return calculate_sha256_checksum(os.path.join(source.save_dir, file_name))
+
+def _build_derived_spec(spec: ModelSpec):
+    """Create a quantized variant's files from its (downloaded) source model.
+
+    ONNX files are quantized to INT8; anything else (vocab, dictionaries) is
+    copied unchanged. The checksum of each source file is recorded in
+    ``sources.json`` next to the derived files, and a file is rebuilt when
+    it is missing or its source has changed since it was built.
+    """
+    source = ModelDownloader.registry[spec.derived_from]
+    _download_spec(source)
+
+    record_path = os.path.join(spec.save_dir, _DERIVED_SOURCES_FILE)
+    try:
+        with open(record_path, 'r', encoding='utf-8') as f:
+            recorded = json.load(f)
+    except (OSError, ValueError):
+        recorded = {}
+
+    checksums = {f: _source_checksum(source, f) for f in spec.files}
+    stale = [
+        f for f in spec.files
+        if recorded.get(f) != checksums[f] or not os.path.exists(os.path.join(spec.save_dir, f))
+    ]
+    if not stale:
+        return
+
+    from .quantize import quantize_onnx_int8
+
+    os.makedirs(spec.save_dir, exist_ok=True)
+    for file_name in stale:
+        src_path = os.path.join(source.save_dir, file_name)
+        dst_path = os.path.join(spec.save_dir, file_name)
+        notify_download_event('start', file_name)
+        if file_name.endswith('.onnx'):
+            quantize_onnx_int8(src_path, dst_path)
+        else:
+            shutil.copyfile(src_path, dst_path)
+        notify_download_event('end', file_name)
+        recorded[file_name] = checksums[file_name]
+
+    tmp_path = f'{record_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(recorded, f, indent=2)
+    os.replace(tmp_path, record_path)
+
+
+def quantized_variant(model: ModelID) -> ModelID:
+    """Return the INT8 variant of a model, or the model itself if it has none."""
+    return INT8_VARIANTS.get(model, model)
+
+
 # Registry population
 def _register_defaults():
     ModelDownloader.register(ModelSpec(
@@ -575,6 +818,32 @@ def _register_defaults():
 
 _register_defaults()
 
+# FP32 model -> locally quantized INT8 variant
+INT8_VARIANTS: Dict[ModelID, ModelID] = {
+    ModelID.RTDETRV2_ONNX: ModelID.RTDETRV2_ONNX_INT8,
+    ModelID.MANGA_OCR_BASE_ONNX: ModelID.MANGA_OCR_BASE_ONNX_INT8,
+    ModelID.LAMA_ONNX: ModelID.LAMA_ONNX_INT8,
+    ModelID.PPOCR_V5_REC_MOBILE: ModelID.PPOCR_V5_REC_MOBILE_INT8,
+    ModelID.PPOCR_V5_REC_EN_MOBILE: ModelID.PPOCR_V5_REC_EN_MOBILE_INT8,
+    ModelID.PPOCR_V5_REC_KOREAN_MOBILE: ModelID.PPOCR_V5_REC_KOREAN_MOBILE_INT8,
+    ModelID.PPOCR_V5_REC_LATIN_MOBILE: ModelID.PPOCR_V5_REC_LATIN_MOBILE_INT8,
+    ModelID.PPOCR_V5_REC_ESLAV_MOBILE: ModelID.PPOCR_V5_REC_ESLAV_MOBILE_INT8,
+}
+
+def _register_int8_variants():
+    for source_id, variant_id in INT8_VARIANTS.items():
+        source = ModelDownloader.registry[source_id]
+        ModelDownloader.register(ModelSpec(
+            id=variant_id,
+            url='',
+            files=list(source.files),
+            sha256=[None] * len(source.files),  # generated locally, nothing to verify against
+            save_dir=os.path.join(source.save_dir, 'int8'),
+            derived_from=source_id,
+        ))
+
+_register_int8_variants()
+
 # List of models that should always be ensured at startup (can be ModelID items)
 mandatory_models: List[Union[ModelID, ModelSpec, Dict[str, Union[str, List[str]]]]] = []
 
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_RAISE = object()
+
+
+def pooled_session(
+    pool_size: int = 8,
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    status_forcelist: Sequence[int] = RETRY_STATUSES,
+) -> requests.Session:
+    """Create a keep-alive session that retries rate-limited and failed calls.
+
+    Retries back off exponentially (``backoff_factor * 2 ** attempt`` seconds)
+    and honour ``Retry-After``. POST is retried too, since the OCR APIs are
+    stateless. Only connection errors and ``status_forcelist`` responses are
+    retried: a read timeout means the request was sent and may have been
+    billed, so it is raised instead of sent again. After the last attempt the
+    final response is returned rather than raised, so callers keep handling
+    error statuses themselves.
+
+    Args:
+        pool_size: Connections kept open per host; match the number of
+            requests in flight.
+        retries: Retries per request on top of the first attempt.
+        backoff_factor: Base delay between retries in seconds.
+        status_forcelist: HTTP statuses that trigger a retry.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(status_forcelist),
+        allowed_methods=frozenset({'GET', 'POST'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def map_concurrent(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_in_flight: int = 8,
+    default: Any = _RAISE,
+) -> list:
+    """Apply ``func`` to every item with at most ``max_in_flight`` calls running at once.
+
+    Results are returned in input order. With a limit of 1 (or a single item)
+    the calls run serially in the calling thread. The first exception raised
+    by ``func`` propagates once the other calls have finished, unless
+    ``default`` is given: then a failed item is logged and gets ``default``
+    as its result, so one failure does not discard the others.
+    """
+    items = list(items)
+    call = func
+    if default is not _RAISE:
+        def call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                logger.warning(f"Request failed: {e}")
+                return default
+    if max_in_flight <= 1 or len(items) <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(items)), thread_name_prefix='ocr-request') as pool:
+        return list(pool.map(call, items))
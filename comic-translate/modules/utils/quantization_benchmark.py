@@ -0,0 +1,176 @@
+"""
+Accuracy/speed comparison of the INT8 model variants against FP32.
+
+Runs the detector, an OCR recognizer and LaMa in both precisions over a fixed
+set of pages on CPU and reports:
+
+- detection: mean best-match IoU of every FP32 box among the INT8 boxes
+- OCR: character error rate of the INT8 text against the FP32 text, both read
+  from the FP32 boxes so only the recognizer differs
+- inpainting: PSNR of the INT8 result against the FP32 result inside the mask
+  built from the FP32 boxes
+
+plus the mean time per page of each model.
+
+Run from the project root:
+    python -m modules.utils.quantization_benchmark path/to/pages --ocr manga
+"""
+import argparse
+import copy
+import os
+import time
+
+import numpy as np
+import imkit as imk
+
+from modules.detection.rtdetr_v2_onnx import RTDetrV2ONNXDetection
+from modules.detection.utils.geometry import pairwise_iou
+from modules.inpainting.lama import LaMa
+from modules.inpainting.schema import Config
+from modules.ocr.manga_ocr.onnx_engine import MangaOCREngineONNX
+from modules.ocr.ppocr import PPOCRv5Engine
+from modules.utils.pipeline_utils import generate_mask
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+
+def load_pages(page_dir: str, limit: int = 0) -> list[tuple[str, np.ndarray]]:
+    """Read the page images of a directory in name order."""
+    names = sorted(f for f in os.listdir(page_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+    if limit:
+        names = names[:limit]
+    return [(name, imk.read_image(os.path.join(page_dir, name))) for name in names]
+
+
+def box_iou(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean IoU of each reference box with its best-matching candidate box."""
+    if len(reference) == 0:
+        return 1.0 if len(candidate) == 0 else 0.0
+    if len(candidate) == 0:
+        return 0.0
+    return float(np.mean([pairwise_iou(box, candidate).max() for box in reference]))
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings."""
+    previous = np.arange(len(b) + 1)
+    for i, char in enumerate(a, 1):
+        current = np.empty_like(previous)
+        current[0] = i
+        for j, other in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+        previous = current
+    return int(previous[-1])
+
+
+def psnr(reference: np.ndarray, candidate: np.ndarray, mask: np.ndarray) -> float:
+    """PSNR in dB over the masked pixels (inf if identical)."""
+    region = mask > 0
+    if not region.any():
+        return float('inf')
+    diff = reference[region].astype(np.float64) - candidate[region].astype(np.float64)
+    mse = np.mean(diff ** 2)
+    return float('inf') if mse == 0 else float(10 * np.log10(255.0 ** 2 / mse))
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _blocks_xyxy(blk_list) -> np.ndarray:
+    if not blk_list:
+        return np.zeros((0, 4), dtype=np.float32)
+    return np.array([blk.xyxy for blk in blk_list], dtype=np.float32)
+
+
+def _create_ocr(ocr: str, lang: str, quantized: bool):
+    if ocr == 'manga':
+        engine = MangaOCREngineONNX()
+        engine.initialize(device='cpu', quantized=quantized)
+    else:
+        engine = PPOCRv5Engine()
+        engine.initialize(lang=lang, device='cpu', quantized=quantized)
+    return engine
+
+
+def run(page_dir: str, ocr: str = 'manga', lang: str = 'ch', limit: int = 0) -> dict:
+    pages = load_pages(page_dir, limit)
+    if not pages:
+        raise ValueError(f"No page images found in {page_dir}")
+
+    detectors, ocr_engines, inpainters = {}, {}, {}
+    for precision, quantized in (('fp32', False), ('int8', True)):
+        detectors[precision] = RTDetrV2ONNXDetection()
+        detectors[precision].initialize(device='cpu', quantized=quantized)
+        ocr_engines[precision] = _create_ocr(ocr, lang, quantized)
+        inpainters[precision] = LaMa('cpu', backend='onnx', quantized=quantized)
+
+    times = {stage: {'fp32': 0.0, 'int8': 0.0} for stage in ('detection', 'ocr', 'inpainting')}
+    ious, psnrs = [], []
+    edits = ref_chars = 0
+
+    print(f"{'page':<32}{'boxes':>7}{'box IoU':>9}{'CER':>8}{'PSNR (dB)':>11}")
+    for name, image in pages:
+        blocks = {}
+        for precision, detector in detectors.items():
+            blocks[precision], elapsed = _timed(detector.detect, image)
+            times['detection'][precision] += elapsed
+        iou = box_iou(_blocks_xyxy(blocks['fp32']), _blocks_xyxy(blocks['int8']))
+        ious.append(iou)
+
+        texts = {}
+        for precision, engine in ocr_engines.items():
+            blk_list, elapsed = _timed(engine.process_image, image, copy.deepcopy(blocks['fp32']))
+            times['ocr'][precision] += elapsed
+            texts[precision] = [blk.text or '' for blk in blk_list]
+        page_edits = sum(edit_distance(ref, hyp) for ref, hyp in zip(texts['fp32'], texts['int8']))
+        page_chars = sum(len(ref) for ref in texts['fp32'])
+        edits += page_edits
+        ref_chars += page_chars
+
+        mask = generate_mask(image, blocks['fp32'])
+        outputs = {}
+        for precision, inpainter in inpainters.items():
+            outputs[precision], elapsed = _timed(inpainter, image, mask, Config())
+            times['inpainting'][precision] += elapsed
+        page_psnr = psnr(outputs['fp32'], outputs['int8'], mask)
+        psnrs.append(page_psnr)
+
+        page_cer = page_edits / max(page_chars, 1)
+        print(f"{name[:31]:<32}{len(blocks['fp32']):>7}{iou:>9.3f}{page_cer:>8.3f}{page_psnr:>11.2f}")
+
+    finite_psnrs = [p for p in psnrs if np.isfinite(p)]
+    summary = {
+        'pages': len(pages),
+        'box_iou': float(np.mean(ious)),
+        'ocr_cer': edits / max(ref_chars, 1),
+        'inpainting_psnr': float(np.mean(finite_psnrs)) if finite_psnrs else float('inf'),
+        'ms_per_page': {
+            stage: {precision: total * 1000 / len(pages) for precision, total in by_precision.items()}
+            for stage, by_precision in times.items()
+        },
+    }
+
+    print()
+    print(f"mean box IoU {summary['box_iou']:.4f}   OCR CER {summary['ocr_cer']:.4f}   "
+          f"inpainting PSNR {summary['inpainting_psnr']:.2f} dB")
+    print(f"{'stage':<12}{'fp32 (ms)':>11}{'int8 (ms)':>11}{'speedup':>9}")
+    for stage, ms in summary['ms_per_page'].items():
+        print(f"{stage:<12}{ms['fp32']:>11.1f}{ms['int8']:>11.1f}{ms['fp32'] / max(ms['int8'], 1e-9):>8.2f}x")
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare INT8 model variants against FP32")
+    parser.add_argument("pages", help="Directory with the page images to evaluate")
+    parser.add_argument("--ocr", choices=("manga", "ppocr"), default="manga")
+    parser.add_argument("--lang", default="ch", help="PP-OCR recognizer language (ch, en, ko, latin, ru)")
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N pages")
+    args = parser.parse_args()
+    run(args.pages, args.ocr, args.lang, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def quantize_onnx_int8(
+    src_path: str,
+    dst_path: str,
+    op_types: Optional[Sequence[str]] = None,
+    per_channel: bool = False,
+) -> str:
+    """Write a dynamically quantized (INT8 weights) copy of an ONNX model.
+
+    Weights are stored as int8 and activations are quantized on the fly, so
+    no calibration data is needed. The result only runs efficiently on the
+    CPU execution provider.
+
+    Args:
+        src_path: FP32 model to quantize.
+        dst_path: Where to write the quantized model.
+        op_types: Operator types to quantize (default: every type ONNX
+            Runtime supports for dynamic quantization).
+        per_channel: Quantize weights per output channel instead of per tensor.
+
+    Returns:
+        ``dst_path``.
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise RuntimeError(
+            "INT8 model variants need onnxruntime's quantization tools "
+            f"(pip install onnx onnxruntime): {e}"
+        ) from e
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    # Quantize next to the target and swap in, so a crash never leaves a truncated model
+    tmp_path = f'{dst_path}.{os.getpid()}.{threading.get_ident()}.tmp.onnx'
+    logger.info(f"Quantizing {os.path.basename(src_path)} to INT8")
+    try:
+        quantize_dynamic(
+            src_path,
+            tmp_path,
+            op_types_to_quantize=list(op_types) if op_types else None,
+            per_channel=per_channel,
+            weight_type=QuantType.QInt8,
+        )
+        os.replace(tmp_path, dst_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(
+        f"Quantized {os.path.basename(src_path)}: "
+        f"{os.path.getsize(src_path) / 1024 ** 2:.1f} MB -> {os.path.getsize(dst_path) / 1024 ** 2:.1f} MB"
+    )
+    return dst_path
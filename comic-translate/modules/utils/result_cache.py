@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+default_cache_dir = os.path.join(project_root, 'cache', 'results')
+
+
+class ResultCache:
+    """Bounded on-disk store for pipeline stage results.
+
+    Keys are content hashes (see ``hash_image`` and ``make_key``), values are
+    pickled to one file each. An SQLite index tracks size and last access so
+    the least recently used entries are evicted once ``max_bytes`` is
+    exceeded. Several processes may share one directory.
+
+    Args:
+        cache_dir: Directory holding the index and payload files.
+        max_bytes: Total payload size kept before evicting.
+        ttl: Seconds an entry stays valid; 0 keeps entries until evicted.
+    """
+
+    def __init__(self, cache_dir: str = default_cache_dir, max_bytes: int = 2 * 1024 ** 3, ttl: float = 0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(cache_dir, 'index.sqlite3'),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, size INTEGER NOT NULL, '
+            'created REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_access ON entries(last_access)')
+
+    @staticmethod
+    def hash_image(image: np.ndarray) -> str:
+        """Hash the full pixel content, shape and dtype of an image."""
+        image = np.ascontiguousarray(image)
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f'{image.shape}|{image.dtype.str}'.encode())
+        h.update(memoryview(image).cast('B'))
+        return h.hexdigest()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from JSON-serialisable parts (page hash, model, language, ...)."""
+        payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f'{key}.pkl')
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default``."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT created FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            if self.ttl and now - row[0] > self.ttl:
+                self._delete_locked(key)
+                self.misses += 1
+                return default
+            self._db.execute('UPDATE entries SET last_access = ? WHERE key = ?', (now, key))
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                value = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            with self._lock:
+                self._delete_locked(key)
+                self.misses += 1
+            return default
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` and evict old entries if over budget."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries (key, size, created, last_access) VALUES (?, ?, ?, ?)',
+                (key, size, now, now),
+            )
+            self._evict_locked()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._delete_locked(key)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            keys = [row[0] for row in self._db.execute('SELECT key FROM entries')]
+            for key in keys:
+                self._delete_locked(key)
+        logger.info(f"Result cache cleared ({len(keys)} entries)")
+
+    def _delete_locked(self, key: str) -> None:
+        self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict_locked(self) -> None:
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in self._db.execute(
+            'SELECT key, size FROM entries ORDER BY last_access ASC'
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._delete_locked(key)
+            total -= size
+            evicted += 1
+        logger.debug(f"Result cache evicted {evicted} entries")
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+        return {
+            'entries': count,
+            'size_mb': round(total / 1024 ** 2, 2),
+            'max_mb': round(self.max_bytes / 1024 ** 2, 2),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,9 +1,9 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 import copy
 from PIL import Image, ImageDraw
 from collections import defaultdict, deque
-from ..detection.utils.text_lines import group_items_into_lines
+from ..detection.utils.text_lines import group_items_into_lines, adaptive_band, band_line_ids
 
 class TextBlock(object):
     """
@@ -106,27 +106,140 @@ class TextBlock(object):
         
         return new_block
 
-def sort_blk_list(blk_list: List[TextBlock], right_to_left=True) -> List[TextBlock]:
-    # Sort blk_list from right to left, top to bottom
-    sorted_blk_list = []
-    for blk in sorted(blk_list, key=lambda blk: blk.center[1]):
-        for i, sorted_blk in enumerate(sorted_blk_list):
-            if blk.center[1] > sorted_blk.xyxy[3]:
+def offset_copies(blk_list: List[TextBlock], dx=0, dy=0) -> List[TextBlock]:
+    """
+    Deep copies of blocks with their boxes and bubbles shifted by (dx, dy).
+
+    The shift is one array operation over all blocks; each copy gets its row
+    of the result as its box.
+
+    Args:
+        blk_list: Blocks to copy
+        dx: Horizontal shift, a scalar or one value per block
+        dy: Vertical shift, a scalar or one value per block
+    """
+    copies = [blk.deep_copy() for blk in blk_list]
+    if not copies:
+        return copies
+    dx, dy = np.broadcast_to(dx, len(copies)), np.broadcast_to(dy, len(copies))
+    shift = np.stack([dx, dy, dx, dy], axis=1)
+
+    xyxy = np.array([blk.xyxy for blk in copies]).reshape(-1, 4) + shift
+    has_bubble = [blk.bubble_xyxy is not None for blk in copies]
+    if any(has_bubble):
+        bubbles = np.array([blk.bubble_xyxy for blk in copies if blk.bubble_xyxy is not None]).reshape(-1, 4)
+        bubble_rows = iter(bubbles + shift[has_bubble])
+    for blk, box, has in zip(copies, xyxy, has_bubble):
+        blk.xyxy = box
+        if has:
+            blk.bubble_xyxy = next(bubble_rows)
+    return copies
+
+def reading_order(xyxy: np.ndarray, right_to_left: bool = True, band_ratio: Optional[float] = None) -> np.ndarray:
+    """
+    Reading-order permutation of boxes: rows from top to bottom, and within
+    a row by x centre (right to left for manga, left to right otherwise).
+
+    By default this is the classic insertion scan: boxes are taken in y-centre
+    order and each is placed relative to the first already placed box whose
+    vertical span does not end above its y centre. With ``band_ratio`` rows are
+    instead the adaptive bands of `group_items_into_lines` (neighbouring y
+    centres within ``band_ratio`` times the median box height), ordered with
+    a single lexsort.
+
+    The scan skips boxes that end above the current y centre, so on tall
+    webtoon strips it stays close to linear in the number of boxes.
+
+    Args:
+        xyxy: Array of boxes with shape (N, 4)
+        right_to_left: Order boxes within a row from right to left
+        band_ratio: Use band grouping with this ratio instead of the scan
+
+    Returns:
+        Indices into ``xyxy`` in reading order
+    """
+    xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+    if len(xyxy) == 0:
+        return np.zeros(0, dtype=np.intp)
+    cx = (xyxy[:, 0] + xyxy[:, 2]) / 2
+    cy = (xyxy[:, 1] + xyxy[:, 3]) / 2
+
+    if band_ratio is not None:
+        rows = band_line_ids(cy, adaptive_band(xyxy, 'hor_ltr', band_ratio))
+        # Ties keep the top-most box first, then the input order
+        return np.lexsort((cy, -cx if right_to_left else cx, rows))
+
+    # Plain floats make the scan much cheaper than indexing arrays per step
+    y1, y2 = xyxy[:, 1].tolist(), xyxy[:, 3].tolist()
+    cx, cy_list = cx.tolist(), cy.tolist()
+
+    # The order is a linked list, so placing a box is O(1). The scan only
+    # visits `live`: placed boxes, in order, whose span does not end above
+    # the current y centre. Boxes come in rising y-centre order, so a box
+    # that ends above one y centre is skipped by every later box as well and
+    # can be dropped for good. On tall strips this keeps the scan short.
+    n = len(xyxy)
+    nxt, prv = [-1] * n, [-1] * n
+    head = tail = -1
+    live = []
+    for i in np.argsort(cy, kind='stable').tolist():
+        c = cy_list[i]
+        j, after = -1, False
+        for pos, k in enumerate(live):
+            if c > y2[k]:
                 continue
-            if blk.center[1] < sorted_blk.xyxy[1]:
-                sorted_blk_list.insert(i + 1, blk)
+            if c < y1[k]:
+                j, after = k, True
                 break
 
-            # y center of blk inside sorted_blk so sort by x instead
-            if right_to_left and blk.center[0] > sorted_blk.center[0]:
-                sorted_blk_list.insert(i, blk)
-                break
-            if not right_to_left and blk.center[0] < sorted_blk.center[0]:
-                sorted_blk_list.insert(i, blk)
+            # y centre inside the placed box, so sort by x instead
+            if cx[i] > cx[k] if right_to_left else cx[i] < cx[k]:
+                j = k
                 break
         else:
-            sorted_blk_list.append(blk)
-    return sorted_blk_list
+            pos = len(live)
+
+        if j < 0:
+            prv[i] = tail
+            if tail >= 0:
+                nxt[tail] = i
+            else:
+                head = i
+            tail = i
+        elif after:
+            nxt[i], prv[i] = nxt[j], j
+            if nxt[j] >= 0:
+                prv[nxt[j]] = i
+            else:
+                tail = i
+            nxt[j] = i
+        else:
+            nxt[i], prv[i] = j, prv[j]
+            if prv[j] >= 0:
+                nxt[prv[j]] = i
+            else:
+                head = i
+            prv[j] = i
+
+        insert_at = pos + 1 if after else pos
+        prefix = [k for k in live[:pos] if y2[k] >= c]
+        if len(prefix) == pos:
+            live.insert(insert_at, i)
+        else:
+            live = prefix + live[pos:insert_at] + [i] + live[insert_at:]
+
+    order = []
+    while head >= 0:
+        order.append(head)
+        head = nxt[head]
+    return np.array(order, dtype=np.intp)
+
+def sort_blk_list(blk_list: List[TextBlock], right_to_left=True, band_ratio: Optional[float] = None) -> List[TextBlock]:
+    """Sort blocks into reading order (see `reading_order`)."""
+    if len(blk_list) < 2:
+        return list(blk_list)
+    order = reading_order([blk.xyxy for blk in blk_list], right_to_left, band_ratio)
+    return [blk_list[i] for i in order]
 
 def sort_textblock_rectangles(
     coords_text_list: List[Tuple[Tuple[int, int, int, int], str]],
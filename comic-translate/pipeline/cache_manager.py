@@ -1,33 +1,127 @@
 import hashlib
 import logging
+from collections import OrderedDict
+
+from modules.utils.result_cache import ResultCache
 
 logger = logging.getLogger(__name__)
 
+# Tolerances for fuzzy block matching
+COORD_TOLERANCE = 5.0  # pixels
+ANGLE_TOLERANCE = 1.0  # degrees
+
+
+class _BlockIndex:
+    """Uniform grid over the cached block IDs of one page.
+
+    Block IDs ("x1_y1_x2_y2_angle") are parsed once and bucketed by their
+    top-left corner, so a tolerance lookup only inspects nearby cells instead
+    of every cached block.
+    """
+
+    CELL_SIZE = 16.0
+
+    def __init__(self, block_results):
+        self.source = block_results
+        self.size = 0
+        self._rank = {}
+        self._grid = {}
+        for block_id in block_results:
+            self.add(block_id)
+
+    def add(self, block_id):
+        if block_id in self._rank:
+            return
+        self._rank[block_id] = self.size
+        self.size += 1
+
+        parts = block_id.split('_')
+        if len(parts) < 5:
+            return
+        try:
+            coords = tuple(float(part) for part in parts[:5])
+        except ValueError:
+            return
+        cell = (int(coords[0] // self.CELL_SIZE), int(coords[1] // self.CELL_SIZE))
+        self._grid.setdefault(cell, []).append((coords, block_id))
+
+    def find(self, x1, y1, x2, y2, angle):
+        """Return the earliest cached ID within tolerance of the given box, or None."""
+        best_id, best_rank = None, None
+        cell = self.CELL_SIZE
+        for cx in range(int((x1 - COORD_TOLERANCE) // cell), int((x1 + COORD_TOLERANCE) // cell) + 1):
+            for cy in range(int((y1 - COORD_TOLERANCE) // cell), int((y1 + COORD_TOLERANCE) // cell) + 1):
+                for (cx1, cy1, cx2, cy2, cangle), block_id in self._grid.get((cx, cy), ()):
+                    if (abs(x1 - cx1) <= COORD_TOLERANCE and
+                        abs(y1 - cy1) <= COORD_TOLERANCE and
+                        abs(x2 - cx2) <= COORD_TOLERANCE and
+                        abs(y2 - cy2) <= COORD_TOLERANCE and
+                        abs(angle - cangle) <= ANGLE_TOLERANCE):
+                        rank = self._rank[block_id]
+                        if best_rank is None or rank < best_rank:
+                            best_id, best_rank = block_id, rank
+        return best_id
+
 
 class CacheManager:
-    """Manages OCR and translation caching for the pipeline."""
+    """Manages OCR and translation caching for the pipeline.
+
+    Recently used pages are kept in memory (at most ``max_pages`` per cache);
+    when a ``ResultCache`` is given, results are also persisted to disk and
+    shared with other processes, e.g. the API server.
+    """
     
-    def __init__(self):
-        self.ocr_cache = {}  # OCR results cache: {(image_hash, model_key, source_lang): {block_id: text}}
-        self.translation_cache = {}  # Translation results cache: {(image_hash, translator_key, source_lang, target_lang, extra_context): {block_id: {source_text: str, translation: str}}}
+    def __init__(self, result_cache: ResultCache = None, max_pages: int = 200):
+        self.ocr_cache = OrderedDict()  # OCR results cache: {(image_hash, model_key, source_lang): {block_id: text}}
+        self.translation_cache = OrderedDict()  # Translation results cache: {(image_hash, translator_key, source_lang, target_lang, extra_context): {block_id: {source_text: str, translation: str}}}
+        self.result_cache = result_cache
+        self.max_pages = max_pages
+        self._indexes = {}  # {(kind, cache_key): _BlockIndex}
 
     def clear_ocr_cache(self):
         """Clear the OCR cache. Note: Cache now persists across image and model changes automatically."""
-        self.ocr_cache = {}
+        self.ocr_cache = OrderedDict()
+        self._drop_indexes('ocr')
         logger.info("OCR cache manually cleared")
 
     def clear_translation_cache(self):
         """Clear the translation cache. Note: Cache now persists across image and model changes automatically."""
-        self.translation_cache = {}
+        self.translation_cache = OrderedDict()
+        self._drop_indexes('translation')
         logger.info("Translation cache manually cleared")
 
+    def _drop_indexes(self, kind):
+        self._indexes = {key: index for key, index in self._indexes.items() if key[0] != kind}
+
+    def _lookup(self, store, kind, cache_key):
+        """Return cached block results for ``cache_key``, loading from disk on a memory miss."""
+        if cache_key in store:
+            store.move_to_end(cache_key)
+            return store[cache_key]
+        if self.result_cache is not None:
+            block_results = self.result_cache.get(ResultCache.make_key(kind, *cache_key))
+            if block_results:
+                self._remember(store, kind, cache_key, block_results)
+                return block_results
+        return None
+
+    def _remember(self, store, kind, cache_key, block_results):
+        store[cache_key] = block_results
+        store.move_to_end(cache_key)
+        while len(store) > self.max_pages:
+            evicted_key, _ = store.popitem(last=False)
+            self._indexes.pop((kind, evicted_key), None)
+
+    def _store(self, store, kind, cache_key, block_results):
+        """Keep block results in memory and persist them when a disk cache is configured."""
+        self._remember(store, kind, cache_key, block_results)
+        if self.result_cache is not None:
+            self.result_cache.put(ResultCache.make_key(kind, *cache_key), block_results)
+
     def _generate_image_hash(self, image):
-        """Generate a hash for the image to use as cache key"""
+        """Generate a hash of the full image content to use as cache key"""
         try:
-            # Use a small portion of the image data to generate hash for efficiency
-            # Take every 10th pixel to reduce computation while maintaining uniqueness
-            sample_data = image[::10, ::10].tobytes()
-            return hashlib.md5(sample_data).hexdigest()
+            return ResultCache.hash_image(image)
         except Exception as e:
             # Fallback: use the full image shape and first few bytes if sampling fails
             shape_str = str(image.shape) if hasattr(image, 'shape') else str(type(image))
@@ -50,101 +144,59 @@ class CacheManager:
         except (AttributeError, ValueError, TypeError):
             return str(id(block))
 
-    def _find_matching_block_id(self, cache_key, target_block):
+    def _get_index(self, kind, cache_key, block_results):
+        """Return the spatial index for a page's cached blocks, rebuilding it if stale."""
+        index = self._indexes.get((kind, cache_key))
+        if index is None or index.source is not block_results or index.size != len(block_results):
+            index = _BlockIndex(block_results)
+            self._indexes[(kind, cache_key)] = index
+        return index
+
+    def _find_match(self, store, kind, cache_key, target_block):
         """Find a matching block ID in cache, allowing for small coordinate differences"""
         target_id = self._get_block_id(target_block)
-        cached_results = self.ocr_cache.get(cache_key, {})
+        cached_results = self._lookup(store, kind, cache_key) or {}
         
         # First try exact match
         if target_id in cached_results:
             return target_id, cached_results[target_id]
+        if not cached_results:
+            return None, ""
         
-        # If no exact match, try fuzzy matching for coordinates within tolerance
+        # If no exact match, look for cached coordinates within tolerance
         try:
-            target_x1, target_y1, target_x2, target_y2 = target_block.xyxy
-            target_angle = getattr(target_block, 'angle', 0)
-            
-            # Tolerance for coordinate matching (in pixels)
-            tolerance = 5.0
-            
-            for cached_id in cached_results.keys():
-                try:
-                    # Parse the cached ID to extract coordinates
-                    parts = cached_id.split('_')
-                    if len(parts) >= 5:
-                        cached_x1 = float(parts[0])
-                        cached_y1 = float(parts[1])
-                        cached_x2 = float(parts[2])
-                        cached_y2 = float(parts[3])
-                        cached_angle = float(parts[4])
-                        
-                        # Check if coordinates are within tolerance
-                        if (abs(target_x1 - cached_x1) <= tolerance and
-                            abs(target_y1 - cached_y1) <= tolerance and
-                            abs(target_x2 - cached_x2) <= tolerance and
-                            abs(target_y2 - cached_y2) <= tolerance and
-                            abs(target_angle - cached_angle) <= 1.0):  # 1 degree tolerance for angle
-                            
-                            logger.debug(f"Fuzzy match found for OCR: {target_id[:20]}... -> {cached_id[:20]}...")
-                            return cached_id, cached_results[cached_id]
-                except (ValueError, IndexError):
-                    continue
-                    
+            x1, y1, x2, y2 = (float(v) for v in target_block.xyxy)
+            angle = float(getattr(target_block, 'angle', 0) or 0)
         except (AttributeError, ValueError, TypeError):
-            pass
+            return None, ""
+        
+        cached_id = self._get_index(kind, cache_key, cached_results).find(x1, y1, x2, y2, angle)
+        if cached_id is not None:
+            logger.debug(f"Fuzzy match found for {kind}: {target_id[:20]}... -> {cached_id[:20]}...")
+            return cached_id, cached_results[cached_id]
         
         # No match found
         return None, ""
 
+    def _find_matching_block_id(self, cache_key, target_block):
+        """Find a matching block ID in the OCR cache, allowing for small coordinate differences"""
+        return self._find_match(self.ocr_cache, 'ocr', cache_key, target_block)
+
     def _find_matching_translation_block_id(self, cache_key, target_block):
         """Find a matching block ID in translation cache, allowing for small coordinate differences"""
-        target_id = self._get_block_id(target_block)
-        cached_results = self.translation_cache.get(cache_key, {})
-        
-        # First try exact match
-        if target_id in cached_results:
-            return target_id, cached_results[target_id]
-        
-        # If no exact match, try fuzzy matching for coordinates within tolerance
-        try:
-            target_x1, target_y1, target_x2, target_y2 = target_block.xyxy
-            target_angle = getattr(target_block, 'angle', 0)
-            
-            # Tolerance for coordinate matching (in pixels)
-            tolerance = 5.0
-            
-            for cached_id in cached_results.keys():
-                try:
-                    # Parse the cached ID to extract coordinates
-                    parts = cached_id.split('_')
-                    if len(parts) >= 5:
-                        cached_x1 = float(parts[0])
-                        cached_y1 = float(parts[1])
-                        cached_x2 = float(parts[2])
-                        cached_y2 = float(parts[3])
-                        cached_angle = float(parts[4])
-                        
-                        # Check if coordinates are within tolerance
-                        if (abs(target_x1 - cached_x1) <= tolerance and
-                            abs(target_y1 - cached_y1) <= tolerance and
-                            abs(target_x2 - cached_x2) <= tolerance and
-                            abs(target_y2 - cached_y2) <= tolerance and
-                            abs(target_angle - cached_angle) <= 1.0):  # 1 degree tolerance for angle
-                            
-                            logger.debug(f"Fuzzy match found for translation: {target_id[:20]}... -> {cached_id[:20]}...")
-                            return cached_id, cached_results[cached_id]
-                except (ValueError, IndexError):
-                    continue
-                    
-        except (AttributeError, ValueError, TypeError):
-            pass
-        
-        # No match found
-        return None, ""
+        return self._find_match(self.translation_cache, 'translation', cache_key, target_block)
+
+    def find_matching_block_ids(self, cache_key, block_list, translation=False):
+        """Batch form of the matchers above: one (block_id, result) pair per block."""
+        if translation:
+            store, kind = self.translation_cache, 'translation'
+        else:
+            store, kind = self.ocr_cache, 'ocr'
+        return [self._find_match(store, kind, cache_key, block) for block in block_list]
 
     def _is_ocr_cached(self, cache_key):
         """Check if OCR results are cached for this image/model/language combination"""
-        return cache_key in self.ocr_cache
+        return self._lookup(self.ocr_cache, 'ocr', cache_key) is not None
 
     def _cache_ocr_results(self, cache_key, blk_list, processed_blk_list=None):
         """Cache OCR results for all blocks"""
@@ -169,7 +221,7 @@ class CacheManager:
                         block_results[block_id] = text
             # Do not create a cache entry if there are no blocks with OCR text
             if block_results:
-                self.ocr_cache[cache_key] = block_results
+                self._store(self.ocr_cache, 'ocr', cache_key, block_results)
                 logger.info(f"Cached OCR results for {len(block_results)} blocks")
             else:
                 logger.debug("No OCR text found in blocks; skipping OCR cache creation")
@@ -187,13 +239,20 @@ class CacheManager:
             logger.debug(f"Skipping OCR cache update for empty text for block ID {block_id}")
             return
 
-        if cache_key not in self.ocr_cache:
-            self.ocr_cache[cache_key] = {}
-
-        self.ocr_cache[cache_key][block_id] = text
+        block_results = self._lookup(self.ocr_cache, 'ocr', cache_key)
+        if block_results is None:
+            block_results = {}
+        block_results[block_id] = text
+        self._index_added('ocr', cache_key, block_results, block_id)
+        self._store(self.ocr_cache, 'ocr', cache_key, block_results)
         logger.debug(f"Updated OCR cache for block ID {block_id}")
 
 
+    def _index_added(self, kind, cache_key, block_results, block_id):
+        index = self._indexes.get((kind, cache_key))
+        if index is not None and index.source is block_results:
+            index.add(block_id)
+
     def _get_cached_text_for_block(self, cache_key, block):
         """Retrieve cached text for a specific block"""
         matched_id, result = self._find_matching_block_id(cache_key, block)
@@ -204,9 +263,10 @@ class CacheManager:
             # Block not found in cache at all
             # Debug logging to help identify cache issues (only log when block not found in cache)
             block_id = self._get_block_id(block)
-            cached_results = self.ocr_cache.get(cache_key, {})
+            cached_results = self._lookup(self.ocr_cache, 'ocr', cache_key) or {}
             logger.debug(f"No cached text found for block ID {block_id}")
-            logger.debug(f"Available block IDs in cache: {list(cached_results.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Available block IDs in cache: {list(cached_results.keys())}")
             return None  # Indicate block needs processing
 
     def _get_translation_cache_key(self, image, source_lang, target_lang, translator_key, extra_context):
@@ -218,7 +278,7 @@ class CacheManager:
 
     def _is_translation_cached(self, cache_key):
         """Check if translation results are cached for this image/translator/language combination"""
-        return cache_key in self.translation_cache
+        return self._lookup(self.translation_cache, 'translation', cache_key) is not None
 
     def _cache_translation_results(self, cache_key, blk_list, processed_blk_list=None):
         """Cache translation results for all blocks"""
@@ -252,7 +312,7 @@ class CacheManager:
                         }
             # Do not create a translation cache entry if no translations were present
             if block_results:
-                self.translation_cache[cache_key] = block_results
+                self._store(self.translation_cache, 'translation', cache_key, block_results)
                 logger.info(f"Cached translation results for {len(block_results)} blocks")
             else:
                 logger.debug("No translations found in blocks; skipping translation cache creation")
@@ -270,13 +330,15 @@ class CacheManager:
             logger.debug(f"Skipping translation cache update for empty translation for block ID {block_id}")
             return
 
-        if cache_key not in self.translation_cache:
-            self.translation_cache[cache_key] = {}
-
-        self.translation_cache[cache_key][block_id] = {
+        block_results = self._lookup(self.translation_cache, 'translation', cache_key)
+        if block_results is None:
+            block_results = {}
+        block_results[block_id] = {
             'source_text': source_text,
             'translation': translation
         }
+        self._index_added('translation', cache_key, block_results, block_id)
+        self._store(self.translation_cache, 'translation', cache_key, block_results)
         logger.debug(f"Updated translation cache for block ID {block_id}")
 
 
@@ -302,9 +364,10 @@ class CacheManager:
             # Block not found in cache at all
             # Debug logging to help identify cache issues (only log when not found)
             block_id = self._get_block_id(block)
-            cached_results = self.translation_cache.get(cache_key, {})
+            cached_results = self._lookup(self.translation_cache, 'translation', cache_key) or {}
             logger.debug(f"No cached translation found for block ID {block_id}")
-            logger.debug(f"Available block IDs in cache: {list(cached_results.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Available block IDs in cache: {list(cached_results.keys())}")
             return None  # Indicate block needs processing
 
     def _can_serve_all_blocks_from_ocr_cache(self, cache_key, block_list):
@@ -333,10 +396,9 @@ class CacheManager:
 
     def _apply_cached_ocr_to_blocks(self, cache_key, block_list):
         """Apply cached OCR results to all blocks in the list"""
-        for block in block_list:
-            cached_text = self._get_cached_text_for_block(cache_key, block)
-            if cached_text is not None: 
-                block.text = cached_text  
+        for block, (matched_id, cached_text) in zip(block_list, self.find_matching_block_ids(cache_key, block_list)):
+            if matched_id is not None:
+                block.text = cached_text
 
     def _apply_cached_translations_to_blocks(self, cache_key, block_list):
         """Apply cached translation results to all blocks in the list"""
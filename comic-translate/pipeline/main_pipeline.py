@@ -1,6 +1,7 @@
 import logging
 
 from pipeline.cache_manager import CacheManager
+from modules.utils.result_cache import ResultCache
 from pipeline.block_detection import BlockDetectionHandler
 from pipeline.inpainting import InpaintingHandler
 from pipeline.ocr_handler import OCRHandler
@@ -19,6 +20,7 @@ class ComicTranslatePipeline:
         self.main_page = main_page
         
         # Initialize all components
+        # The disk cache is opt-in; see set_result_cache_enabled
         self.cache_manager = CacheManager()
         self.block_detection = BlockDetectionHandler(main_page)
         self.inpainting = InpaintingHandler(main_page)
@@ -44,6 +46,17 @@ class ComicTranslatePipeline:
             self.ocr_handler
         )
 
+    def set_result_cache_enabled(self, enabled: bool):
+        """Open or close the shared on-disk result cache (the "Cache results on disk" setting)."""
+        if enabled and self.cache_manager.result_cache is None:
+            try:
+                self.cache_manager.result_cache = ResultCache()
+            except Exception as e:
+                logger.warning(f"Result cache unavailable, caching in memory only: {e}")
+        elif not enabled:
+            # Not closed here: a running worker may still hold it; it closes once released
+            self.cache_manager.result_cache = None
+
     # Block detection methods (delegate to block_detection)
     def load_box_coords(self, blk_list):
         """Load bounding box coordinates."""
@@ -69,8 +69,7 @@ class SegmentationHandler:
                 blk.inpaint_bboxes = None
 
         # Restore original block coordinates and clean up
-        processed_blocks = [blk for blk, _ in results]
-        restore_original_block_coordinates(processed_blocks)
+        restore_original_block_coordinates(visible_blocks)
         
         # Return results with converted bboxes from the blocks
         final_results = []
@@ -13,7 +13,7 @@ from PySide6.QtGui import QColor
 
 from modules.detection.processor import TextBlockDetector
 from modules.translation.processor import Translator
-from modules.utils.textblock import sort_blk_list, TextBlock
+from modules.utils.textblock import sort_blk_list, TextBlock, offset_copies
 from modules.utils.pipeline_utils import inpaint_map, get_config, generate_mask, get_language_code, is_directory_empty
 from modules.utils.translator_utils import format_translations
 from modules.utils.archives import make
@@ -396,59 +396,33 @@ class WebtoonBatchProcessor:
         Returns:
             Dictionary mapping virtual_page_id -> list of blocks
         """
-        virtual_page_blocks = defaultdict(list)
-        
-        for blk in blk_list:
-            # Assign block to the single virtual page with the most overlap area
-            target_mapping = None
-            max_overlap_area = -1
-
-            for mapping in mapping_data:
-                vpage = mapping['virtual_page']
-                y_start = mapping['combined_y_start']
-                y_end = mapping['combined_y_end']
-                
-                # Calculate vertical overlap with this virtual page
-                overlap_y_start = max(blk.xyxy[1], y_start)
-                overlap_y_end = min(blk.xyxy[3], y_end)
-                vertical_overlap = max(0, overlap_y_end - overlap_y_start)
-                
-                # Calculate overlap area
-                block_width = blk.xyxy[2] - blk.xyxy[0]
-                overlap_area = block_width * vertical_overlap
-
-                if overlap_area > max_overlap_area:
-                    max_overlap_area = overlap_area
-                    target_mapping = mapping
-
-            # Create a block for the target virtual page only, if one was found
-            if target_mapping:
-                vpage = target_mapping['virtual_page']
-                y_start = target_mapping['combined_y_start']
-                x_offset = target_mapping['x_offset']
-
-                # Create a copy for this virtual page
-                virtual_block = blk.deep_copy()
-
-                # Convert to virtual page coordinates
-                virtual_block.xyxy = [
-                    blk.xyxy[0] - x_offset,
-                    blk.xyxy[1] - y_start,
-                    blk.xyxy[2] - x_offset,
-                    blk.xyxy[3] - y_start
-                ]
-                
-                if virtual_block.bubble_xyxy is not None:
-                    virtual_block.bubble_xyxy = [
-                        blk.bubble_xyxy[0] - x_offset,
-                        blk.bubble_xyxy[1] - y_start,
-                        blk.bubble_xyxy[2] - x_offset,
-                        blk.bubble_xyxy[3] - y_start
-                    ]
-                
-                virtual_page_blocks[vpage.virtual_id].append(virtual_block)
-            else:
+        if not blk_list:
+            return {}
+        if not mapping_data:
+            for blk in blk_list:
                 logger.warning(f"Block {blk.xyxy} could not be assigned to any virtual page")
+            return {}
+
+        xyxy = np.array([blk.xyxy for blk in blk_list], dtype=np.float64).reshape(-1, 4)
+        y_starts = np.array([mapping['combined_y_start'] for mapping in mapping_data])
+        y_ends = np.array([mapping['combined_y_end'] for mapping in mapping_data])
+        x_offsets = np.array([mapping['x_offset'] for mapping in mapping_data])
+
+        # Assign each block to the single virtual page with the most overlap area
+        # (argmax keeps the first page on ties)
+        vertical_overlap = np.clip(
+            np.minimum(xyxy[:, None, 3], y_ends) - np.maximum(xyxy[:, None, 1], y_starts), 0, None
+        )
+        overlap_area = (xyxy[:, 2] - xyxy[:, 0])[:, None] * vertical_overlap
+        targets = np.argmax(overlap_area, axis=1)
+
+        # Copy the blocks in virtual page coordinates
+        virtual_blocks = offset_copies(blk_list, -x_offsets[targets], -y_starts[targets])
+
+        virtual_page_blocks = defaultdict(list)
+        for virtual_block, target in zip(virtual_blocks, targets.tolist()):
+            vpage = mapping_data[target]['virtual_page']
+            virtual_page_blocks[vpage.virtual_id].append(virtual_block)
             
         return dict(virtual_page_blocks)
 
@@ -645,13 +619,8 @@ class WebtoonBatchProcessor:
             # Merge blocks from the chunks that processed this vpage
             merged_virtual_blocks = self._merge_virtual_page_results(vpage.virtual_id)
             
-            # Convert these virtual blocks to physical coordinates
-            for block in merged_virtual_blocks:
-                physical_block = block.deep_copy()
-                physical_block.xyxy = vpage.virtual_to_physical_coords(block.xyxy)
-                if block.bubble_xyxy:
-                    physical_block.bubble_xyxy = vpage.virtual_to_physical_coords(block.bubble_xyxy)
-                all_physical_blocks.append(physical_block)
+            # Convert these virtual blocks to physical coordinates (only y moves, by the crop offset)
+            all_physical_blocks.extend(offset_copies(merged_virtual_blocks, dy=vpage.crop_top))
         
         # Final deduplication at the physical page level
         final_blocks = self._deduplicate_physical_blocks(all_physical_blocks)
@@ -750,13 +719,13 @@ class WebtoonBatchProcessor:
 
             render_blk = blk_virtual.deep_copy()
             render_blk.xyxy = list(physical_coords)
-            if render_blk.bubble_xyxy:
+            if render_blk.bubble_xyxy is not None:
                 render_blk.bubble_xyxy = vpage.virtual_to_physical_coords(render_blk.bubble_xyxy)
             
             # Convert to scene coordinates for correct placement
             render_blk.xyxy[1] += page_y_position_in_scene
             render_blk.xyxy[3] += page_y_position_in_scene
-            if render_blk.bubble_xyxy:
+            if render_blk.bubble_xyxy is not None:
                 render_blk.bubble_xyxy[1] += page_y_position_in_scene
                 render_blk.bubble_xyxy[3] += page_y_position_in_scene
 
@@ -1,6 +1,7 @@
 import logging
 from typing import Optional
 import logging
+import numpy as np
 
 from modules.utils.textblock import TextBlock
 
@@ -135,7 +136,11 @@ def convert_block_to_visible_coordinates(blk: TextBlock, mapping: dict, page_idx
 
 
 def filter_and_convert_visible_blocks(main_page, pipeline, mappings: list[dict], single_block: bool = False) -> list[TextBlock]:
-    """Filter blocks to visible area and convert their coordinates to visible image space."""
+    """Filter blocks to visible area and convert their coordinates to visible image space.
+
+    The returned list holds the original block objects; pass it to
+    `restore_original_block_coordinates` to put their scene coordinates back.
+    """
     visible_blocks = []
     
     # Get the blocks to process
@@ -172,16 +177,9 @@ def filter_and_convert_visible_blocks(main_page, pipeline, mappings: list[dict],
             # Check if block is in any of the visible page portions for this page
             for mapping in page_mappings[blk_page_idx]:
                 if is_block_in_visible_portion(blk, mapping, blk_page_idx, webtoon_manager):
-                    # Store original coordinates and mapping info for later restoration
-                    blk._original_xyxy = blk.xyxy.copy()
-                    blk._original_bubble_xyxy = blk.bubble_xyxy.copy() if blk.bubble_xyxy is not None else None
+                    # Keep the mapping info for later conversions back to scene space
                     blk._mapping = mapping
                     blk._page_index = blk_page_idx
-                    
-                    # Convert coordinates to visible image space
-                    convert_block_to_visible_coordinates(blk, mapping, blk_page_idx, webtoon_manager)
-                    
-                    # Add the original block to the list
                     visible_blocks.append(blk)
                     found_visible_portion = True
                     break
@@ -189,6 +187,42 @@ def filter_and_convert_visible_blocks(main_page, pipeline, mappings: list[dict],
             if found_visible_portion:
                 break
     
+    if not visible_blocks:
+        return visible_blocks
+
+    # Store original coordinates for restoration
+    for blk in visible_blocks:
+        blk._original_xyxy = blk.xyxy.copy()
+        blk._original_bubble_xyxy = blk.bubble_xyxy.copy() if blk.bubble_xyxy is not None else None
+
+    # Convert all blocks to visible image space at once (see convert_block_to_visible_coordinates)
+    page_x_offsets = {}
+    for blk in visible_blocks:
+        page_idx = blk._page_index
+        if page_idx not in page_x_offsets:
+            if page_idx in webtoon_manager.image_data:
+                page_width = webtoon_manager.image_data[page_idx].shape[1]
+            else:
+                page_width = webtoon_manager.webtoon_width
+            page_x_offsets[page_idx] = (webtoon_manager.webtoon_width - page_width) / 2
+
+    dx = np.array([page_x_offsets[blk._page_index] for blk in visible_blocks])
+    dy = np.array([
+        webtoon_manager.image_positions[blk._page_index] + blk._mapping['page_crop_top'] - blk._mapping['combined_y_start']
+        for blk in visible_blocks
+    ])
+    shift = np.stack([dx, dy, dx, dy], axis=1)
+    with_bubble = [blk for blk in visible_blocks if blk.bubble_xyxy is not None]
+    has_bubble = np.array([blk.bubble_xyxy is not None for blk in visible_blocks])
+    for blocks, attr, rows in ((visible_blocks, 'xyxy', slice(None)), (with_bubble, 'bubble_xyxy', has_bubble)):
+        if not blocks:
+            continue
+        converted = np.array([getattr(blk, attr) for blk in blocks], dtype=np.float64).reshape(-1, 4) - shift[rows]
+        converted[:, :2] = np.maximum(converted[:, :2], 0)
+        # Written in place like the per-block conversion, as truncated ints
+        for blk, box in zip(blocks, np.trunc(converted).astype(np.int64).tolist()):
+            getattr(blk, attr)[:] = box
+
     return visible_blocks
 
 
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from modules.utils.textblock import TextBlock, reading_order, sort_blk_list
+
+
+def _reference_sort(blk_list, right_to_left=True):
+    """The original insertion-scan sort_blk_list, kept to check the new one against."""
+    sorted_blk_list = []
+    for blk in sorted(blk_list, key=lambda blk: blk.center[1]):
+        for i, sorted_blk in enumerate(sorted_blk_list):
+            if blk.center[1] > sorted_blk.xyxy[3]:
+                continue
+            if blk.center[1] < sorted_blk.xyxy[1]:
+                sorted_blk_list.insert(i + 1, blk)
+                break
+            if right_to_left and blk.center[0] > sorted_blk.center[0]:
+                sorted_blk_list.insert(i, blk)
+                break
+            if not right_to_left and blk.center[0] < sorted_blk.center[0]:
+                sorted_blk_list.insert(i, blk)
+                break
+        else:
+            sorted_blk_list.append(blk)
+    return sorted_blk_list
+
+
+def _random_page(rng, integer):
+    n = int(rng.integers(1, 25))
+    x1 = rng.uniform(0, 1000, n)
+    y1 = rng.uniform(0, 1500, n)
+    boxes = np.stack([x1, y1, x1 + rng.uniform(10, 250, n), y1 + rng.uniform(10, 350, n)], axis=1)
+    if integer:
+        boxes = boxes.astype(np.int64)
+    return [TextBlock(text_bbox=box) for box in boxes]
+
+
+def test_reading_order_known_case():
+    boxes = np.array([[780, 187, 926, 329], [96, 3, 223, 299], [443, 77, 531, 250]])
+    assert reading_order(boxes).tolist() == [2, 0, 1]
+
+
+@pytest.mark.parametrize("right_to_left", [True, False])
+@pytest.mark.parametrize("integer", [True, False])
+def test_sort_blk_list_matches_reference(right_to_left, integer):
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        blocks = _random_page(rng, integer)
+        expected = _reference_sort(blocks, right_to_left)
+        assert sort_blk_list(blocks, right_to_left) == expected
+
+
+def test_reading_order_tall_strip_matches_reference():
+    rng = np.random.default_rng(1)
+    n = 400
+    y1 = np.sort(rng.uniform(0, n * 80, n))
+    x1 = rng.uniform(0, 700, n)
+    boxes = np.stack([x1, y1, x1 + rng.uniform(40, 200, n), y1 + rng.uniform(30, 200, n)], axis=1)
+    blocks = [TextBlock(text_bbox=box) for box in boxes]
+    expected = [blocks.index(blk) for blk in _reference_sort(blocks)]
+    assert reading_order(boxes).tolist() == expected
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from modules.ocr.vietocr_engine import VietOCREngine
+from modules.utils.textblock import TextBlock
+
+
+class StubPredictor:
+    """Reads a line as the width of its image; raises for widths in ``fail_widths``."""
+
+    def __init__(self, fail_widths=()):
+        self.config = {'predictor': {'beamsearch': False}}
+        self.fail_widths = set(fail_widths)
+        self.calls = 0
+
+    def predict(self, line):
+        self.calls += 1
+        if line.width in self.fail_widths:
+            raise RuntimeError("decoder failed")
+        return f"w{line.width}"
+
+
+def _engine(monkeypatch, predictor):
+    engine = VietOCREngine()
+    engine.predictor = predictor
+
+    def broken_batch(lines):
+        raise RuntimeError("batched decoding unavailable")
+
+    monkeypatch.setattr(engine, '_predict_lines', broken_batch)
+    # One line per block: the whole crop
+    monkeypatch.setattr(engine, '_split_lines', lambda crop: [crop])
+    return engine
+
+
+def _blocks(*widths):
+    blocks, x = [], 0
+    for width in widths:
+        blocks.append(TextBlock(text_bbox=np.array([x, 0, x + width, 20])))
+        x += width
+    return blocks
+
+
+def test_batch_failure_falls_back_to_per_line_predict(monkeypatch):
+    predictor = StubPredictor()
+    engine = _engine(monkeypatch, predictor)
+    blocks = _blocks(30, 40, 50)
+
+    engine.process_image(np.full((20, 120, 3), 255, dtype=np.uint8), blocks)
+
+    assert [blk.text for blk in blocks] == ["w30", "w40", "w50"]
+    assert predictor.calls == 3
+
+
+def test_per_line_failure_only_clears_its_block(monkeypatch):
+    engine = _engine(monkeypatch, StubPredictor(fail_widths={40}))
+    blocks = _blocks(30, 40, 50)
+
+    engine.process_image(np.full((20, 120, 3), 255, dtype=np.uint8), blocks)
+
+    assert [blk.text for blk in blocks] == ["w30", "", "w50"]